@@ -22,6 +22,16 @@ Usage:
         -H 'Content-Type: application/json' \
         -d '{"prompt": "Classify this user request..."}'
 
+    # Constrain output to a JSON schema (requires: pip install outlines-core)
+    curl -s http://localhost:5127/classify \
+        -H 'Content-Type: application/json' \
+        -d '{"prompt": "...", "schema": {"type": "object", "properties": {"route": {"type": "string"}}}}'
+
+    # Stream raw tokens (chunked transfer) instead of a JSON envelope
+    curl -sN http://localhost:5127/classify \
+        -H 'Content-Type: application/json' \
+        -d '{"prompt": "Classify this user request...", "stream": true}'
+
 Available tiny models (sorted by size):
     mlx-community/SmolLM2-135M-Instruct-4bit   ~80MB   (fastest, good enough for classification)
     mlx-community/SmolLM2-360M-Instruct-4bit   ~200MB  (slightly better quality)
@@ -30,10 +40,25 @@ Available tiny models (sorted by size):
 """
 
 import argparse
+import copy
+import functools
+import itertools
 import json
+import os
+import re
 import sys
+import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import orjson
+
+    def dumps(data) -> bytes:
+        return orjson.dumps(data)
+except ImportError:
+    def dumps(data) -> bytes:
+        return json.dumps(data).encode("utf-8")
 
 # ---------------------------------------------------------------------------
 # Model loading
@@ -42,10 +67,77 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 _model = None
 _tokenizer = None
 _model_name = None
+_draft_model = None
+_num_draft_tokens = 4
+_prompt_affixes = None
+_prefix_cache = None
+_vocabulary = None
+_health_body = None
+
+# mlx-lm generation is not reentrant; HTTP parsing and prompt formatting run
+# concurrently on the server threads, only the decode loop is serialised.
+_generate_lock = threading.Lock()
+
+QUANT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "phpbot", "mlx")
+QUANT_BITS = {"auto": 4, "4bit": 4, "8bit": 8}
+QUANT_GROUP_SIZE = 32
 
-def load_model(model_name: str):
-    """Load model once and cache in memory."""
-    global _model, _tokenizer, _model_name
+
+def is_quantized(model_name: str) -> bool:
+    """Best-effort check whether a repo id or local path holds quantized weights."""
+    if re.search(r"-\d+bit\b", model_name, re.IGNORECASE):
+        return True
+
+    config_path = os.path.join(model_name, "config.json")
+    if os.path.isfile(config_path):
+        try:
+            with open(config_path) as f:
+                return "quantization" in json.load(f)
+        except (OSError, ValueError):
+            return False
+
+    return False
+
+
+def resolve_model_path(model_name: str, quantization: str = "auto") -> str:
+    """Return a path to quantized weights, converting and caching them if needed."""
+    bits = QUANT_BITS.get(quantization)
+    if bits is None or is_quantized(model_name):
+        return model_name
+
+    sanitized = re.sub(r"[^A-Za-z0-9._-]+", "--", model_name.strip("/"))
+    mlx_path = os.path.join(QUANT_CACHE_DIR, f"{sanitized}-q{bits}")
+    if os.path.isfile(os.path.join(mlx_path, "config.json")):
+        return mlx_path
+
+    from mlx_lm import convert
+
+    print(f"Quantizing {model_name} to {bits}-bit ({mlx_path}) ...", flush=True)
+    os.makedirs(QUANT_CACHE_DIR, exist_ok=True)
+    convert(
+        hf_path=model_name,
+        mlx_path=mlx_path,
+        quantize=True,
+        q_bits=bits,
+        q_group_size=QUANT_GROUP_SIZE,
+    )
+    return mlx_path
+
+
+def load_model(
+    model_name: str,
+    warmup: bool = True,
+    quantization: str = "auto",
+    draft_model: str = None,
+    num_draft_tokens: int = 4,
+):
+    """Load model once and cache in memory.
+
+    When draft_model names a different model sharing the target's tokenizer,
+    it is loaded too and used for speculative decoding.
+    """
+    global _model, _tokenizer, _model_name, _prompt_affixes, _prefix_cache
+    global _draft_model, _num_draft_tokens, _vocabulary, _health_body
 
     if _model is not None and _model_name == model_name:
         return
@@ -56,41 +148,277 @@ def load_model(model_name: str):
         print("ERROR: mlx-lm not installed. Run: pip install mlx-lm", file=sys.stderr)
         sys.exit(1)
 
+    model_path = resolve_model_path(model_name, quantization)
+
     print(f"Loading model: {model_name} ...", flush=True)
     start = time.time()
-    _model, _tokenizer = load(model_name)
+    _model, _tokenizer = load(model_path)
     _model_name = model_name
+    _draft_model = None
+    _prompt_affixes = None
+    _prefix_cache = None
+    _vocabulary = None
+    _health_body = None
+    cached_response.cache_clear()
+    schema_index.cache_clear()
     elapsed = time.time() - start
     print(f"Model loaded in {elapsed:.1f}s", flush=True)
 
+    if draft_model and draft_model != model_name:
+        print(f"Loading draft model: {draft_model} ...", flush=True)
+        _draft_model, _ = load(resolve_model_path(draft_model, quantization))
+        _num_draft_tokens = num_draft_tokens
 
-def generate_response(prompt: str, max_tokens: int = 256, temperature: float = 0.1) -> str:
-    """Generate a response from the loaded model."""
+    if warmup:
+        warmup_model()
+
+
+# Rough prompt sizes (in words) so shape-specialised Metal kernels are
+# compiled for short, typical and long classify prompts.
+WARMUP_PROMPT_WORDS = (24, 96, 384)
+
+
+def warmup_model():
+    """Run a few tiny generations so Metal kernels compile before serving."""
     from mlx_lm import generate
 
-    # Format as a simple chat prompt
-    messages = [
-        {"role": "system", "content": "You are a task classifier. Respond with only valid JSON."},
-        {"role": "user", "content": prompt},
-    ]
+    print("Warming up model ...", flush=True)
+    start = time.time()
+    for words in WARMUP_PROMPT_WORDS:
+        try:
+            generate(
+                _model,
+                _tokenizer,
+                prompt=" ".join(["warmup"] * words),
+                max_tokens=4,
+                temp=0.0,
+            )
+        except Exception as e:
+            print(f"WARNING: warmup failed: {e}", file=sys.stderr, flush=True)
+            return
+    prefix_cache()
+    elapsed = time.time() - start
+    print(f"Warmup finished in {elapsed:.1f}s", flush=True)
+
+
+SYSTEM_PROMPT = "You are a task classifier. Respond with only valid JSON."
+
+
+USER_PLACEHOLDER = "\x00PHPBOT_USER_PROMPT\x00"
+
+
+def encode_text(text: str) -> list:
+    """Tokenize text, adding special tokens only when BOS is not already present."""
+    bos = getattr(_tokenizer, "bos_token", None)
+    add_special_tokens = bos is None or not text.startswith(bos)
+    return _tokenizer.encode(text, add_special_tokens=add_special_tokens)
+
+
+def prompt_affixes():
+    """Token IDs surrounding the user message, rendered once per loaded model.
 
-    # Apply chat template if available
-    if hasattr(_tokenizer, "apply_chat_template"):
-        formatted = _tokenizer.apply_chat_template(
-            messages, tokenize=False, add_generation_prompt=True
+    The chat template is rendered with a placeholder user message and split
+    around it, so the fixed system prompt is tokenized only once.
+    """
+    global _prompt_affixes
+
+    if _prompt_affixes is None:
+        if hasattr(_tokenizer, "apply_chat_template"):
+            rendered = _tokenizer.apply_chat_template(
+                [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": USER_PLACEHOLDER},
+                ],
+                tokenize=False,
+                add_generation_prompt=True,
+            )
+        else:
+            rendered = f"System: {SYSTEM_PROMPT}\n\nUser: {USER_PLACEHOLDER}\n\nAssistant:"
+
+        prefix, _, suffix = rendered.partition(USER_PLACEHOLDER)
+        _prompt_affixes = (
+            encode_text(prefix),
+            _tokenizer.encode(suffix, add_special_tokens=False),
         )
-    else:
-        formatted = f"System: You are a task classifier. Respond with only valid JSON.\n\nUser: {prompt}\n\nAssistant:"
-
-    response = generate(
-        _model,
-        _tokenizer,
-        prompt=formatted,
-        max_tokens=max_tokens,
-        temp=temperature,
-    )
 
-    return response.strip()
+    return _prompt_affixes
+
+
+def encode_user(prompt: str) -> list:
+    """Token IDs for the user message plus the assistant-start suffix."""
+    _, suffix_ids = prompt_affixes()
+    return _tokenizer.encode(prompt, add_special_tokens=False) + suffix_ids
+
+
+def prefix_cache():
+    """Return a private copy of the KV cache pre-filled with the system prefix.
+
+    The prefix is run through the model once per loaded model; returns None
+    when the installed mlx-lm has no prompt cache support.
+    """
+    global _prefix_cache
+
+    if _prefix_cache is None:
+        try:
+            import mlx.core as mx
+            from mlx_lm.models.cache import make_prompt_cache
+        except ImportError:
+            _prefix_cache = False
+            return None
+
+        prefix_ids, _ = prompt_affixes()
+        prefix = mx.array(prefix_ids)[None]
+        cache = make_prompt_cache(_model)
+        _model(prefix, cache=cache)
+        if _draft_model is not None:
+            # Speculative decoding expects the target caches followed by the draft's
+            draft_cache = make_prompt_cache(_draft_model)
+            _draft_model(prefix, cache=draft_cache)
+            cache += draft_cache
+        mx.eval([c.state for c in cache])
+        _prefix_cache = cache
+
+    if _prefix_cache is False:
+        return None
+
+    return copy.deepcopy(_prefix_cache)
+
+
+class JsonEndDetector:
+    """Track brace depth over streamed text to spot the end of a JSON object."""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Consume a chunk; return True once the first top-level object closes."""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = self.started
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+@functools.lru_cache(maxsize=32)
+def schema_index(schema_json: str):
+    """Compile a JSON schema into an outlines-core token index for the loaded model."""
+    global _vocabulary
+
+    try:
+        from outlines_core import Index, Vocabulary
+        from outlines_core.json_schema import build_regex_from_schema
+    except ImportError:
+        raise RuntimeError("JSON schema decoding needs outlines-core: pip install outlines-core")
+
+    if _vocabulary is None:
+        _vocabulary = Vocabulary.from_pretrained(_model_name)
+
+    return Index(build_regex_from_schema(schema_json), _vocabulary)
+
+
+class JsonSchemaProcessor:
+    """mlx-lm logits processor that masks tokens the schema's FSM would reject."""
+
+    def __init__(self, schema: dict):
+        from outlines_core import Guide
+
+        self.guide = Guide(schema_index(json.dumps(schema, sort_keys=True)))
+        self.seen = None
+
+    def __call__(self, tokens, logits):
+        import mlx.core as mx
+
+        # The first call sees only the prompt; later calls add one sampled token
+        if self.seen is not None and tokens.size > self.seen:
+            self.guide.advance(tokens[-1].item())
+        self.seen = tokens.size
+
+        mask = mx.full((logits.shape[-1],), -mx.inf)
+        mask[mx.array(self.guide.get_tokens())] = 0.0
+        return logits + mask
+
+
+def stream_response(
+    prompt: str,
+    max_tokens: int = 256,
+    temperature: float = 0.1,
+    schema: dict = None,
+):
+    """Yield generated text segments, stopping once a JSON object is complete.
+
+    When a JSON schema is given, decoding is constrained to outputs that
+    match it.
+    """
+    from mlx_lm import stream_generate
+
+    user_ids = encode_user(prompt)
+    detector = JsonEndDetector()
+    processor = JsonSchemaProcessor(schema) if schema else None
+
+    with _generate_lock:
+        cache = prefix_cache()
+        if cache is None:
+            prompt_ids, kwargs = prompt_affixes()[0] + user_ids, {}
+        else:
+            prompt_ids, kwargs = user_ids, {"prompt_cache": cache}
+
+        if processor is not None:
+            # The guide advances one token per call, which speculative steps break
+            kwargs["logits_processors"] = [processor]
+            if cache is not None and _draft_model is not None:
+                kwargs["prompt_cache"] = cache[:len(_model.layers)]
+        elif _draft_model is not None:
+            kwargs["draft_model"] = _draft_model
+            kwargs["num_draft_tokens"] = _num_draft_tokens
+
+        for resp in stream_generate(
+            _model,
+            _tokenizer,
+            prompt=prompt_ids,
+            max_tokens=max_tokens,
+            temp=temperature,
+            **kwargs,
+        ):
+            # Older mlx-lm releases yield plain strings instead of response objects
+            text = getattr(resp, "text", resp)
+            if text:
+                yield text
+            if detector.feed(text):
+                break
+
+
+@functools.lru_cache(maxsize=256)
+def cached_response(prompt: str, max_tokens: int, temperature: float) -> str:
+    """Memoised full response for repeat classifications of the same prompt."""
+    return "".join(stream_response(prompt, max_tokens, temperature)).strip()
+
+
+def generate_response(
+    prompt: str,
+    max_tokens: int = 256,
+    temperature: float = 0.1,
+    schema: dict = None,
+) -> str:
+    """Generate a response from the loaded model."""
+    if schema:
+        return "".join(stream_response(prompt, max_tokens, temperature, schema)).strip()
+    return cached_response(prompt, max_tokens, temperature)
 
 
 # ---------------------------------------------------------------------------
@@ -100,6 +428,9 @@ def generate_response(prompt: str, max_tokens: int = 256, temperature: float = 0
 class ClassifyHandler(BaseHTTPRequestHandler):
     """Handle /classify and /health endpoints."""
 
+    # Chunked transfer encoding for streamed /classify responses needs HTTP/1.1
+    protocol_version = "HTTP/1.1"
+
     def do_POST(self):
         if self.path == "/classify":
             self.handle_classify()
@@ -122,13 +453,18 @@ class ClassifyHandler(BaseHTTPRequestHandler):
 
             prompt = data.get("prompt", "")
             max_tokens = data.get("max_tokens", 256)
+            schema = data.get("schema")
 
             if not prompt:
                 self.send_json(400, {"error": "Missing 'prompt' field"})
                 return
 
+            if data.get("stream", False):
+                self.stream_classify(prompt, max_tokens, schema)
+                return
+
             start = time.time()
-            response = generate_response(prompt, max_tokens)
+            response = generate_response(prompt, max_tokens, schema=schema)
             elapsed = time.time() - start
 
             self.send_json(200, {
@@ -141,16 +477,53 @@ class ClassifyHandler(BaseHTTPRequestHandler):
         except Exception as e:
             self.send_json(500, {"error": str(e), "provider": "mlx"})
 
+    def stream_classify(self, prompt: str, max_tokens: int, schema: dict = None):
+        """Write generated tokens to the client as HTTP chunked transfer."""
+        # Pull the first segment before sending headers so setup errors
+        # (e.g. an invalid schema) still produce a JSON error response
+        chunks = stream_response(prompt, max_tokens, schema=schema)
+        first = next(chunks, "")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("X-Model", str(_model_name))
+        self.end_headers()
+
+        # The status line is out, so errors can no longer become a JSON 500.
+        # Dropping the connection without the terminating chunk tells the
+        # client the response was cut short.
+        try:
+            for text in itertools.chain([first], chunks):
+                if not text:
+                    continue
+                chunk = text.encode("utf-8")
+                self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+                self.wfile.flush()
+        except Exception as e:
+            self.log_error("Streaming failed after headers were sent: %s", e)
+            self.close_connection = True
+            return
+
+        self.wfile.write(b"0\r\n\r\n")
+
     def handle_health(self):
-        self.send_json(200, {
-            "status": "ok",
-            "provider": "mlx",
-            "model": _model_name,
-            "ready": _model is not None,
-        })
+        global _health_body
+
+        # The payload only changes when a model is loaded, so serialise it once
+        if _health_body is None:
+            _health_body = dumps({
+                "status": "ok",
+                "provider": "mlx",
+                "model": _model_name,
+                "ready": _model is not None,
+            })
+        self.send_body(200, _health_body)
 
     def send_json(self, status: int, data: dict):
-        body = json.dumps(data).encode("utf-8")
+        self.send_body(status, dumps(data))
+
+    def send_body(self, status: int, body: bytes):
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
@@ -176,6 +549,9 @@ Examples:
   %(prog)s                                          # Default model + port
   %(prog)s --model mlx-community/Qwen2.5-0.5B-Instruct-4bit
   %(prog)s --port 5128
+  %(prog)s --model HuggingFaceTB/SmolLM2-360M-Instruct --quantization 8bit
+  %(prog)s --model mlx-community/Qwen2.5-1.5B-Instruct-4bit \
+           --draft-model mlx-community/Qwen2.5-0.5B-Instruct-4bit
   %(prog)s --once "Classify: create a new PHP file"  # One-shot mode (no server)
 """,
     )
@@ -196,10 +572,40 @@ Examples:
         default=None,
         help="One-shot mode: classify a single prompt and exit (no server)",
     )
+    parser.add_argument(
+        "--draft-model",
+        default=None,
+        help="Small model for speculative decoding; must share the target's "
+             "tokenizer (e.g. Qwen2.5-0.5B-Instruct-4bit drafting for Qwen2.5-1.5B)",
+    )
+    parser.add_argument(
+        "--num-draft-tokens",
+        type=int,
+        default=4,
+        help="Tokens proposed by the draft model per verify step (default: 4)",
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=["auto", "4bit", "8bit", "none"],
+        default="auto",
+        help="Quantize unquantized models on first load and cache the result "
+             "under ~/.cache/phpbot/mlx (default: auto = 4bit)",
+    )
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Skip the warmup generations run after loading (debugging)",
+    )
     args = parser.parse_args()
 
     # Load the model
-    load_model(args.model)
+    load_model(
+        args.model,
+        warmup=not args.no_warmup,
+        quantization=args.quantization,
+        draft_model=args.draft_model,
+        num_draft_tokens=args.num_draft_tokens,
+    )
 
     # One-shot mode
     if args.once:
@@ -208,9 +614,12 @@ Examples:
         return
 
     # Server mode
-    server = HTTPServer(("127.0.0.1", args.port), ClassifyHandler)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), ClassifyHandler)
+    server.daemon_threads = True
     print(f"MLX classify server running at http://127.0.0.1:{args.port}")
     print(f"Model: {args.model}")
+    if _draft_model is not None:
+        print(f"Draft model: {args.draft_model} ({args.num_draft_tokens} tokens/step)")
     print(f"Endpoints: POST /classify, GET /health")
     print(f"Press Ctrl+C to stop", flush=True)
 
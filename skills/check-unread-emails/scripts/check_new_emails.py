@@ -1,54 +1,51 @@
 #!/usr/bin/env python3
 import subprocess
 import json
-from datetime import datetime
-from email import policy
-from email.parser import BytesParser
+
+# Count and details in one JXA call; property reads are batched across all
+# unread messages so Mail.app is only asked once per field.
+script = '''
+const Mail = Application("Mail");
+const unread = Mail.inbox.messages.whose({readStatus: false});
+const subjects = unread.subject();
+const senders = unread.sender();
+const dates = unread.dateReceived();
+const emails = subjects.map((subject, i) => {
+    let snippet = "";
+    try {
+        snippet = (unread[i].content() || "").substring(0, 200);
+    } catch (e) {}
+    return {subject: subject, sender: senders[i], date: dates[i], snippet: snippet};
+});
+JSON.stringify({count: emails.length, emails: emails});
+'''
+
 
 def get_unread_emails():
-    """Get unread emails using AppleScript"""
-    script = '''
-    tell application "Mail"
-        set unreadMessages to (every message of inbox whose read status is false)
-        set emailList to {}
-        
-        repeat with msg in unreadMessages
-            set emailInfo to {subject:(subject of msg), sender:(sender of msg), dateReceived:(date received of msg), content:(content of msg)}
-            set end of emailList to emailInfo
-        end repeat
-        
-        return emailList
-    end tell
-    '''
-    
+    """Get unread count and emails from Mail.app using JXA"""
     try:
-        result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True, timeout=30)
+        result = subprocess.run(['osascript', '-l', 'JavaScript', '-e', script], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
-            # Parse the AppleScript output
-            output = result.stdout.strip()
-            return output
+            return json.loads(result.stdout)
         else:
+            print(f"Error: {result.stderr.strip()}")
             return None
     except Exception as e:
         print(f"Error: {e}")
         return None
 
-# Get unread count first
-count_script = '''
-tell application "Mail"
-    count (every message of inbox whose read status is false)
-end tell
-'''
-
-result = subprocess.run(['osascript', '-e', count_script], capture_output=True, text=True)
-unread_count = result.stdout.strip()
 
-print(f"Total unread emails: {unread_count}")
+data = get_unread_emails()
+if data is not None:
+    print(f"Total unread emails: {data['count']}")
 
-# Get detailed info
-emails = get_unread_emails()
-if emails:
-    print("\n" + "="*80)
-    print("UNREAD EMAILS:")
-    print("="*80)
-    print(emails)
+    if data['emails']:
+        print("\n" + "="*80)
+        print("UNREAD EMAILS:")
+        print("="*80)
+        for email in data['emails']:
+            print(f"SUBJECT: {email['subject']}")
+            print(f"FROM: {email['sender']}")
+            print(f"DATE: {email['date']}")
+            print(f"PREVIEW: {email['snippet']}")
+            print("---")
@@ -1,48 +1,103 @@
 #!/usr/bin/env python3
+import glob
+import json
+import os
+import re
+import sqlite3
 import subprocess
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 
-# Get the 30 most recent unread emails
-script = '''
-tell application "Mail"
-    set unreadMessages to (every message of inbox whose read status is false)
-    set sortedMessages to reverse of unreadMessages
-    set recentEmails to {}
-    set counter to 0
-    
-    repeat with msg in sortedMessages
-        if counter < 30 then
-            set msgSubject to subject of msg
-            set msgSender to sender of msg
-            set msgDate to date received of msg
-            set msgSnippet to ""
-            
-            try
-                set msgContent to content of msg as text
-                if length of msgContent > 200 then
-                    set msgSnippet to text 1 thru 200 of msgContent
-                else
-                    set msgSnippet to msgContent
-                end if
-            end try
-            
-            set emailInfo to "SUBJECT: " & msgSubject & "
-FROM: " & msgSender & "
-DATE: " & (msgDate as string) & "
-PREVIEW: " & msgSnippet & "
----"
-            
-            set end of recentEmails to emailInfo
-            set counter to counter + 1
-        end if
-    end repeat
-    
-    return recentEmails as text
-end tell
+LIMIT = 30
+
+# Mail.app keeps message metadata in a SQLite database; reading it directly
+# avoids round-tripping every field over Apple Events.
+ENVELOPE_GLOB = "~/Library/Mail/V*/MailData/Envelope Index"
+
+ENVELOPE_QUERY = '''
+SELECT subjects.subject, addresses.address, addresses.comment,
+       messages.date_received, COALESCE(summaries.summary, '')
+FROM messages
+JOIN subjects ON subjects.ROWID = messages.subject
+JOIN addresses ON addresses.ROWID = messages.sender
+JOIN mailboxes ON mailboxes.ROWID = messages.mailbox
+LEFT JOIN summaries ON summaries.ROWID = messages.summary
+WHERE messages.read = 0 AND messages.deleted = 0 AND mailboxes.url LIKE '%/INBOX'
+ORDER BY messages.date_received DESC
+LIMIT ?
 '''
 
-result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True, timeout=60)
-if result.returncode == 0:
-    print(result.stdout)
-else:
-    print(f"Error: {result.stderr}")
+# Fallback: the 30 most recent unread emails in one JXA call. Subjects, senders
+# and dates are fetched in bulk; message content is only read for the messages
+# that are returned, and trimmed to a 200 character preview.
+script = '''
+const Mail = Application("Mail");
+const unread = Mail.inbox.messages.whose({readStatus: false});
+const subjects = unread.subject();
+const senders = unread.sender();
+const dates = unread.dateReceived();
+const order = subjects.map((_, i) => i).sort((a, b) => dates[b] - dates[a]).slice(0, %d);
+const emails = order.map(i => {
+    let snippet = "";
+    try {
+        snippet = (unread[i].content() || "").substring(0, 200);
+    } catch (e) {}
+    return {subject: subjects[i], sender: senders[i], date: dates[i], snippet: snippet};
+});
+JSON.stringify(emails);
+''' % LIMIT
+
+
+def find_envelope_index():
+    """Return the newest Mail data version's Envelope Index path, if any"""
+    paths = glob.glob(os.path.expanduser(ENVELOPE_GLOB))
+    if not paths:
+        return None
+    return max(paths, key=lambda p: int(re.search(r"/V(\d+)/", p).group(1)))
+
+
+def get_emails_sqlite():
+    """Read recent unread emails from the Envelope Index, or None if unavailable"""
+    db = find_envelope_index()
+    if db is None:
+        return None
+
+    try:
+        conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(ENVELOPE_QUERY, (LIMIT,)).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        # Schema changed or no Full Disk Access; use AppleScript instead
+        return None
+
+    return [
+        {
+            "subject": subject,
+            "sender": f"{name} <{address}>" if name else address,
+            "date": datetime.fromtimestamp(received, timezone.utc).isoformat(),
+            "snippet": summary[:200],
+        }
+        for subject, address, name, received, summary in rows
+    ]
+
+
+def get_emails_jxa():
+    """Read recent unread emails through Mail.app using JXA"""
+    result = subprocess.run(['osascript', '-l', 'JavaScript', '-e', script], capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        print(f"Error: {result.stderr}")
+        return None
+    return json.loads(result.stdout)
+
+
+emails = get_emails_sqlite()
+if emails is None:
+    emails = get_emails_jxa()
+
+for email in emails or []:
+    print(f"SUBJECT: {email['subject']}")
+    print(f"FROM: {email['sender']}")
+    print(f"DATE: {email['date']}")
+    print(f"PREVIEW: {email['snippet']}")
+    print("---")
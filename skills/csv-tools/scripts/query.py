@@ -2,13 +2,15 @@
 """
 Query, filter, sort, and transform CSV/JSON data files.
 Uses Python stdlib only (csv, json) -- no external dependencies.
+NumPy is used for numeric statistics when it is installed, and Polars
+(if installed) handles filter/sort/stats/convert on CSV input.
 
 Usage:
     query.py view <file> [--limit N]
-    query.py filter <file> --column <col> --value <val>
-    query.py sort <file> --column <col> [--order asc|desc]
-    query.py stats <file> [--column <col>]
-    query.py convert <file> --output <path>
+    query.py filter <file> --column <col> --value <val> [--engine auto|stdlib|polars]
+    query.py sort <file> --column <col> [--order asc|desc] [--engine ...]
+    query.py stats <file> [--column <col>] [--engine ...]
+    query.py convert <file> --output <path> [--engine ...]
 """
 
 import sys
@@ -16,40 +18,150 @@ import os
 import csv
 import json
 import argparse
-from collections import defaultdict
+import hashlib
+import itertools
+import math
+import mmap
+from urllib.parse import quote
+from collections import Counter
+from operator import eq, ge, gt, le, lt, ne
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _json_rows(file_path):
+    """Yield headers, then each JSON object as a list of values."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        # Single object -> list of one
+        data = [data]
+    elif not (isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict)):
+        print("Error: JSON must be an array of objects or a single object", file=sys.stderr)
+        sys.exit(1)
+
+    headers = list(dict.fromkeys(k for obj in data for k in obj))
+    yield headers
+    for obj in data:
+        yield [obj.get(h, "") for h in headers]
+
+
+# Files larger than this are read through mmap instead of a text wrapper
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+
+def sniff_dialect(f):
+    """Sniff the CSV dialect from the start of an open file and rewind it."""
+    sample = f.read(4096)
+    f.seek(0)
+    if isinstance(sample, bytes):
+        sample = sample.decode("utf-8", errors="ignore")
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        return csv.excel
+
+
+def _records(reader):
+    """Yield headers, then each record padded to the header width."""
+    headers = next(reader, [])
+    width = len(headers)
+    yield headers
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row += [""] * (width - len(row))
+        yield row
+
+
+def _csv_rows(file_path):
+    """Yield headers, then each CSV record as a list padded to the header width."""
+    if os.path.getsize(file_path) > MMAP_THRESHOLD:
+        # Let the OS page the file in on demand and decode line by line
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            dialect = sniff_dialect(mm)
+            lines = (line.decode("utf-8") for line in iter(mm.readline, b""))
+            yield from _records(csv.reader(lines, dialect=dialect))
+        return
+
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        dialect = sniff_dialect(f)
+        yield from _records(csv.reader(f, dialect=dialect))
 
 
 def load_data(file_path):
-    """Load CSV or JSON file and return list of dicts + headers."""
+    """Open a CSV or JSON file lazily.
+
+    Returns (rows, headers) where rows is an iterator of value lists aligned
+    with headers. CSV files are read as they are consumed, so callers that
+    stop early only pay for the rows they use.
+    """
     ext = os.path.splitext(file_path)[1].lower()
+    rows = _json_rows(file_path) if ext == ".json" else _csv_rows(file_path)
+    headers = next(rows)
+    return rows, headers
 
-    if ext == ".json":
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
-            headers = list(data[0].keys())
-            return data, headers
-        elif isinstance(data, dict):
-            # Single object -> list of one
-            return [data], list(data.keys())
-        else:
-            print("Error: JSON must be an array of objects or a single object", file=sys.stderr)
+
+def load_all(file_path):
+    """Load every row into memory; for commands that need the full dataset."""
+    rows, headers = load_data(file_path)
+    return list(rows), headers
+
+
+def column_index(headers, column):
+    """Return the index of column, exiting with an error if it is missing."""
+    if column not in headers:
+        print(f"Error: Column '{column}' not found. Available: {', '.join(headers)}", file=sys.stderr)
+        sys.exit(1)
+    return headers.index(column)
+
+
+def polars_module(engine, file_path):
+    """Return the polars module when the Polars engine should handle file_path.
+
+    "auto" uses Polars for CSV input when it is installed; JSON input always
+    goes through the stdlib loader.
+    """
+    if engine == "stdlib" or os.path.splitext(file_path)[1].lower() == ".json":
+        return None
+
+    try:
+        import polars as pl
+    except ImportError:
+        if engine == "polars":
+            print("Error: polars not installed. Run: pip install polars", file=sys.stderr)
             sys.exit(1)
+        return None
 
-    else:  # CSV (default)
-        with open(file_path, "r", encoding="utf-8", newline="") as f:
-            # Sniff delimiter
-            sample = f.read(4096)
-            f.seek(0)
-            try:
-                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
-            except csv.Error:
-                dialect = csv.excel
+    return pl
+
+
+def read_polars(pl, file_path, fill_empty=True):
+    """Read a CSV into a Polars DataFrame with every column kept as text.
+
+    Empty fields are read as null by Polars; fill_empty turns them back into
+    "" to match csv.reader.
+    """
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        dialect = sniff_dialect(f)
 
-            reader = csv.DictReader(f, dialect=dialect)
-            data = list(reader)
-            headers = reader.fieldnames or []
-            return data, headers
+    df = pl.read_csv(
+        file_path,
+        separator=dialect.delimiter,
+        quote_char=dialect.quotechar,
+        infer_schema_length=0,
+    )
+    return df.with_columns(pl.all().fill_null("")) if fill_empty else df
+
+
+def polars_numeric(pl, expr):
+    """Cast a text expression to Float64, yielding null where it does not parse."""
+    return expr.str.strip_chars().cast(pl.Float64, strict=False)
 
 
 def format_table(data, headers, limit=None):
@@ -57,29 +169,27 @@ def format_table(data, headers, limit=None):
     if limit:
         data = data[:limit]
 
-    # Calculate column widths
-    widths = {h: len(h) for h in headers}
-    for row in data:
-        for h in headers:
-            val = str(row.get(h, ""))
-            widths[h] = max(widths[h], min(len(val), 40))
+    # Calculate column widths (cells are truncated to 40 chars)
+    widths = [
+        max(len(h), max((min(len(str(row[i])), 40) for row in data), default=0))
+        for i, h in enumerate(headers)
+    ]
 
-    # Header
-    header_line = "  ".join(h.ljust(widths[h]) for h in headers)
-    separator = "  ".join("-" * widths[h] for h in headers)
+    # One format string per table: truncate to 40, then left-pad to width
+    fmt = "  ".join(f"{{:<{w}.40}}" for w in widths)
+    header_line = "  ".join(h.ljust(w) for h, w in zip(headers, widths))
+    separator = "  ".join("-" * w for w in widths)
 
-    lines = [header_line, separator]
-    for row in data:
-        line = "  ".join(str(row.get(h, ""))[:40].ljust(widths[h]) for h in headers)
-        lines.append(line)
-
-    return "\n".join(lines)
+    body = (fmt.format(*map(str, row)) for row in data)
+    return "\n".join(itertools.chain((header_line, separator), body))
 
 
 def cmd_view(file_path, limit):
     """Pretty-print data as a table."""
-    data, headers = load_data(file_path)
-    total = len(data)
+    rows, headers = load_data(file_path)
+    data = list(itertools.islice(rows, limit)) if limit else list(rows)
+    # Count the remainder without keeping it in memory
+    total = len(data) + sum(1 for _ in rows)
 
     print(f"File: {file_path} ({total} rows, {len(headers)} columns)")
     print()
@@ -98,79 +208,205 @@ def parse_filter_value(value_str):
     return "=", value_str
 
 
-def matches_filter(cell_value, operator, filter_value):
-    """Check if a cell value matches the filter condition."""
-    # Try numeric comparison
+COMPARATORS = {"=": eq, "!=": ne, ">": gt, "<": lt, ">=": ge, "<=": le}
+
+
+def polars_predicate(pl, column, operator, filter_value):
+    """Build a Polars expression equivalent to build_predicate()."""
+    compare = COMPARATORS[operator]
+    col = pl.col(column)
+    text = compare(col.str.to_lowercase(), filter_value.lower())
+
     try:
-        cell_num = float(cell_value)
         filter_num = float(filter_value)
-        if operator == "=":
-            return cell_num == filter_num
-        elif operator == "!=":
-            return cell_num != filter_num
-        elif operator == ">":
-            return cell_num > filter_num
-        elif operator == "<":
-            return cell_num < filter_num
-        elif operator == ">=":
-            return cell_num >= filter_num
-        elif operator == "<=":
-            return cell_num <= filter_num
-    except (ValueError, TypeError):
-        pass
+    except ValueError:
+        return text
 
-    # String comparison
-    cell_str = str(cell_value).lower()
+    num = polars_numeric(pl, col)
+    return pl.when(num.is_not_null()).then(compare(num, filter_num)).otherwise(text)
+
+
+def build_predicate(operator, filter_value):
+    """Compile a filter condition into a single-argument predicate.
+
+    Operator dispatch and parsing of the filter value happen once here
+    rather than for every cell. Cells are compared numerically when both
+    sides parse as numbers, otherwise as lowercase strings.
+    """
+    compare = COMPARATORS[operator]
     filter_str = str(filter_value).lower()
-    if operator == "=":
-        return cell_str == filter_str
-    elif operator == "!=":
-        return cell_str != filter_str
-    elif operator == ">":
-        return cell_str > filter_str
-    elif operator == "<":
-        return cell_str < filter_str
-    elif operator == ">=":
-        return cell_str >= filter_str
-    elif operator == "<=":
-        return cell_str <= filter_str
-    return False
-
-
-def cmd_filter(file_path, column, value):
-    """Filter rows by column value."""
-    data, headers = load_data(file_path)
 
-    if column not in headers:
-        print(f"Error: Column '{column}' not found. Available: {', '.join(headers)}", file=sys.stderr)
-        sys.exit(1)
+    def text_predicate(cell_value):
+        return compare(str(cell_value).lower(), filter_str)
+
+    try:
+        filter_num = float(filter_value)
+    except (ValueError, TypeError):
+        # A non-numeric filter value can never take the numeric branch
+        return text_predicate
+
+    def numeric_predicate(cell_value):
+        try:
+            return compare(float(cell_value), filter_num)
+        except (ValueError, TypeError):
+            return text_predicate(cell_value)
+
+    return numeric_predicate
+
+
+# Equality filters on CSVs at least this large use a persistent value index
+INDEX_MIN_BYTES = 1024 * 1024
+INDEX_DIR = os.path.join(os.path.expanduser("~"), ".cache", "phpbot", "csvindex")
+
+
+def equality_key(value):
+    """Normalise a value so keys are equal exactly when build_predicate's "=" matches."""
+    try:
+        return f"n:{float(value)!r}"
+    except (ValueError, TypeError):
+        return f"s:{str(value).lower()}"
+
+
+def _index_path(file_path, column):
+    stat = os.stat(file_path)
+    digest = hashlib.sha1(f"{os.path.abspath(file_path)}:{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()
+    return os.path.join(INDEX_DIR, digest, quote(column, safe="") + ".json")
+
+
+def _build_index(file_path, idx):
+    """Scan a CSV once, mapping each equality key to the byte offsets of its rows."""
+    index = {}
+    total = 0
+    with open(file_path, "rb") as f:
+        dialect = sniff_dialect(f)
+        reader = csv.reader((line.decode("utf-8") for line in iter(f.readline, b"")), dialect=dialect)
+        next(reader, None)
+        pos = f.tell()
+        for row in reader:
+            # csv.reader pulls exactly one record's lines, so pos is where this row began
+            if row:
+                total += 1
+                value = row[idx] if idx < len(row) else ""
+                index.setdefault(equality_key(value), []).append(pos)
+            pos = f.tell()
+    return {"total": total, "index": index}
+
+
+def index_eligible(file_path):
+    """Whether "=" filters on file_path go through the on-disk index."""
+    return (os.path.splitext(file_path)[1].lower() != ".json"
+            and os.path.getsize(file_path) >= INDEX_MIN_BYTES)
+
+
+def indexed_equality_filter(file_path, headers, column, filter_value):
+    """Return (rows, total) for an "=" filter via the on-disk index, or None.
+
+    The index is built on first use and keyed by path, mtime and size, so an
+    edited file gets a fresh one.
+    """
+    if not index_eligible(file_path):
+        return None
+    try:
+        if math.isnan(float(filter_value)):
+            # NaN never compares equal, so there is nothing to look up
+            return None
+    except ValueError:
+        pass
 
+    idx = headers.index(column)
+    index_path = _index_path(file_path, column)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = _build_index(file_path, idx)
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError:
+            pass
+
+    rows = []
+    width = len(headers)
+    with open(file_path, "rb") as f:
+        dialect = sniff_dialect(f)
+        reader = csv.reader((line.decode("utf-8") for line in iter(f.readline, b"")), dialect=dialect)
+        for offset in data["index"].get(equality_key(filter_value), []):
+            f.seek(offset)
+            row = next(reader)
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            rows.append(row)
+
+    return rows, data["total"]
+
+
+def cmd_filter(file_path, column, value, engine="auto"):
+    """Filter rows by column value."""
     operator, filter_val = parse_filter_value(value)
-    filtered = [row for row in data if matches_filter(row.get(column, ""), operator, filter_val)]
+    pl = polars_module(engine, file_path)
+
+    indexed = None
+    if operator == "=" and engine != "polars" and index_eligible(file_path):
+        # Only the CSV header is read here
+        rows, headers = load_data(file_path)
+        rows.close()
+        column_index(headers, column)
+        indexed = indexed_equality_filter(file_path, headers, column, filter_val)
+
+    if indexed is not None:
+        filtered, total = indexed
+    elif pl is not None:
+        df = read_polars(pl, file_path)
+        headers = df.columns
+        column_index(headers, column)
+        filtered = df.filter(polars_predicate(pl, column, operator, filter_val)).rows()
+        total = df.height
+    else:
+        rows, headers = load_data(file_path)
+        idx = column_index(headers, column)
+        predicate = build_predicate(operator, filter_val)
+        filtered = []
+        total = 0
+        for total, row in enumerate(rows, 1):
+            if predicate(row[idx]):
+                filtered.append(row)
 
     print(f"Filter: {column} {operator} {filter_val}")
-    print(f"Results: {len(filtered)} of {len(data)} rows")
+    print(f"Results: {len(filtered)} of {total} rows")
     print()
     print(format_table(filtered, headers))
 
 
-def cmd_sort(file_path, column, order):
+def cmd_sort(file_path, column, order, engine="auto"):
     """Sort data by a column."""
-    data, headers = load_data(file_path)
-
-    if column not in headers:
-        print(f"Error: Column '{column}' not found. Available: {', '.join(headers)}", file=sys.stderr)
-        sys.exit(1)
+    reverse = order == "desc"
+    pl = polars_module(engine, file_path)
+
+    if pl is not None:
+        df = read_polars(pl, file_path)
+        headers = df.columns
+        column_index(headers, column)
+        # Numbers before text, numerically then case-insensitively
+        num = polars_numeric(pl, pl.col(column))
+        sorted_data = df.sort(
+            [num.is_null(), num, pl.col(column).str.to_lowercase()],
+            descending=reverse,
+            maintain_order=True,
+        ).rows()
+    else:
+        data, headers = load_all(file_path)
+        idx = column_index(headers, column)
 
-    def sort_key(row):
-        val = row.get(column, "")
-        try:
-            return (0, float(val))
-        except (ValueError, TypeError):
-            return (1, str(val).lower())
+        def sort_key(row):
+            val = row[idx]
+            try:
+                return (0, float(val))
+            except (ValueError, TypeError):
+                return (1, str(val).lower())
 
-    reverse = order == "desc"
-    sorted_data = sorted(data, key=sort_key, reverse=reverse)
+        sorted_data = sorted(data, key=sort_key, reverse=reverse)
 
     print(f"Sorted by: {column} ({order})")
     print(f"Rows: {len(sorted_data)}")
@@ -178,12 +414,91 @@ def cmd_sort(file_path, column, order):
     print(format_table(sorted_data, headers))
 
 
-def cmd_stats(file_path, column=None):
+def _safe_float(value):
+    """float() that maps unparseable values to NaN."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float("nan")
+
+
+def numeric_values(values):
+    """Return the values of a column that parse as numbers.
+
+    Returns a NumPy float array when NumPy is available, otherwise a list.
+    """
+    if np is not None:
+        try:
+            # Fast path: every value parses, so the conversion stays in C
+            return np.array(values, dtype=str).astype(np.float64)
+        except ValueError:
+            num = np.frompyfunc(_safe_float, 1, 1)(np.array(values, dtype=object)).astype(np.float64)
+            return num[~np.isnan(num)]
+
+    numeric = []
+    for v in values:
+        try:
+            numeric.append(float(v))
+        except (ValueError, TypeError):
+            pass
+    return numeric
+
+
+def column_summary(values):
+    """Summarise a list of column values for cmd_stats."""
+    non_empty = [v for v in values if v != "" and v is not None]
+    summary = {"non_empty": len(non_empty), "total": len(values), "unique": len(set(values))}
+
+    # Try numeric stats
+    numeric = numeric_values(non_empty)
+
+    if len(numeric):
+        if np is not None:
+            lo, hi, total = numeric.min(), numeric.max(), numeric.sum()
+        else:
+            lo, hi, total = min(numeric), max(numeric), sum(numeric)
+        summary["numeric"] = (lo, hi, total, len(numeric))
+    else:
+        summary["top"] = Counter(non_empty).most_common(5)
+
+    return summary
+
+
+def polars_column_summary(pl, series):
+    """Polars counterpart of column_summary() for a text Series."""
+    non_empty = series.filter(series != "")
+    summary = {"non_empty": non_empty.len(), "total": series.len(), "unique": series.n_unique()}
+
+    numeric = polars_numeric(pl, non_empty).drop_nulls()
+
+    if numeric.len():
+        summary["numeric"] = (numeric.min(), numeric.max(), numeric.sum(), numeric.len())
+    else:
+        summary["top"] = (
+            non_empty.to_frame()
+            .group_by(series.name, maintain_order=True)
+            .agg(pl.len().alias("__count"))
+            .sort("__count", descending=True, maintain_order=True)
+            .head(5)
+            .rows()
+        )
+
+    return summary
+
+
+def cmd_stats(file_path, column=None, engine="auto"):
     """Show summary statistics."""
-    data, headers = load_data(file_path)
+    pl = polars_module(engine, file_path)
+
+    if pl is not None:
+        df = read_polars(pl, file_path)
+        headers, row_count = df.columns, df.height
+    else:
+        data, headers = load_all(file_path)
+        row_count = len(data)
 
     print(f"File: {file_path}")
-    print(f"Rows: {len(data)}")
+    print(f"Rows: {row_count}")
     print(f"Columns: {len(headers)}")
     print()
 
@@ -194,57 +509,64 @@ def cmd_stats(file_path, column=None):
             print(f"Warning: Column '{col}' not found, skipping", file=sys.stderr)
             continue
 
-        values = [row.get(col, "") for row in data]
-        non_empty = [v for v in values if v != "" and v is not None]
+        if pl is not None:
+            summary = polars_column_summary(pl, df.get_column(col))
+        else:
+            idx = headers.index(col)
+            summary = column_summary([row[idx] for row in data])
 
         print(f"--- {col} ---")
-        print(f"  Non-empty: {len(non_empty)} / {len(values)}")
-        unique = len(set(values))
-        print(f"  Unique values: {unique}")
-
-        # Try numeric stats
-        numeric = []
-        for v in non_empty:
-            try:
-                numeric.append(float(v))
-            except (ValueError, TypeError):
-                pass
-
-        if numeric:
-            print(f"  Min: {min(numeric)}")
-            print(f"  Max: {max(numeric)}")
-            print(f"  Mean: {sum(numeric) / len(numeric):.2f}")
-            print(f"  Sum: {sum(numeric):.2f}")
+        print(f"  Non-empty: {summary['non_empty']} / {summary['total']}")
+        print(f"  Unique values: {summary['unique']}")
+
+        if "numeric" in summary:
+            lo, hi, total, count = summary["numeric"]
+            print(f"  Min: {lo}")
+            print(f"  Max: {hi}")
+            print(f"  Mean: {total / count:.2f}")
+            print(f"  Sum: {total:.2f}")
         else:
             # Show top values for non-numeric
-            counts = defaultdict(int)
-            for v in non_empty:
-                counts[v] += 1
-            top = sorted(counts.items(), key=lambda x: -x[1])[:5]
+            top = summary["top"]
             print(f"  Top values: {', '.join(f'{k} ({v})' for k, v in top)}")
 
         print()
 
 
-def cmd_convert(file_path, output_path):
+def cmd_convert(file_path, output_path, engine="auto"):
     """Convert between CSV and JSON."""
-    data, headers = load_data(file_path)
     out_ext = os.path.splitext(output_path)[1].lower()
+    if out_ext not in (".json", ".csv", ".tsv"):
+        print(f"Error: Unsupported output format '{out_ext}'. Use .json, .csv, or .tsv", file=sys.stderr)
+        sys.exit(1)
 
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    pl = polars_module(engine, file_path)
+
+    if pl is not None:
+        if out_ext == ".json":
+            df = read_polars(pl, file_path)
+            df.write_json(output_path)
+        else:
+            # Keep nulls so empty fields are written unquoted
+            df = read_polars(pl, file_path, fill_empty=False)
+            df.write_csv(output_path, separator="\t" if out_ext == ".tsv" else ",")
+
+        size = os.path.getsize(output_path)
+        print(f"Converted {df.height} rows: {file_path} -> {output_path} ({size:,} bytes)")
+        return
+
+    data, headers = load_all(file_path)
 
     if out_ext == ".json":
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            json.dump([dict(zip(headers, row)) for row in data], f, indent=2, ensure_ascii=False)
     elif out_ext in (".csv", ".tsv"):
         delimiter = "\t" if out_ext == ".tsv" else ","
         with open(output_path, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=headers, delimiter=delimiter)
-            writer.writeheader()
+            writer = csv.writer(f, delimiter=delimiter)
+            writer.writerow(headers)
             writer.writerows(data)
-    else:
-        print(f"Error: Unsupported output format '{out_ext}'. Use .json, .csv, or .tsv", file=sys.stderr)
-        sys.exit(1)
 
     size = os.path.getsize(output_path)
     print(f"Converted {len(data)} rows: {file_path} -> {output_path} ({size:,} bytes)")
@@ -254,30 +576,36 @@ def main():
     parser = argparse.ArgumentParser(description="Query, filter, sort, and transform data files")
     subparsers = parser.add_subparsers(dest="action", required=True)
 
+    engine_p = argparse.ArgumentParser(add_help=False)
+    engine_p.add_argument(
+        "--engine", "-e", default="auto", choices=["auto", "stdlib", "polars"],
+        help="Processing engine for CSV input (default: auto = polars if installed)",
+    )
+
     # view
     view_p = subparsers.add_parser("view", help="Pretty-print data")
     view_p.add_argument("file", help="CSV or JSON file")
     view_p.add_argument("--limit", "-l", type=int, default=50, help="Max rows (default: 50)")
 
     # filter
-    filter_p = subparsers.add_parser("filter", help="Filter rows")
+    filter_p = subparsers.add_parser("filter", help="Filter rows", parents=[engine_p])
     filter_p.add_argument("file", help="CSV or JSON file")
     filter_p.add_argument("--column", "-c", required=True, help="Column to filter on")
     filter_p.add_argument("--value", "-v", required=True, help="Value to match (supports >, <, >=, <=, !=, =)")
 
     # sort
-    sort_p = subparsers.add_parser("sort", help="Sort by column")
+    sort_p = subparsers.add_parser("sort", help="Sort by column", parents=[engine_p])
     sort_p.add_argument("file", help="CSV or JSON file")
     sort_p.add_argument("--column", "-c", required=True, help="Column to sort by")
     sort_p.add_argument("--order", "-o", default="asc", choices=["asc", "desc"], help="Sort order (default: asc)")
 
     # stats
-    stats_p = subparsers.add_parser("stats", help="Summary statistics")
+    stats_p = subparsers.add_parser("stats", help="Summary statistics", parents=[engine_p])
     stats_p.add_argument("file", help="CSV or JSON file")
     stats_p.add_argument("--column", "-c", default=None, help="Specific column (default: all)")
 
     # convert
-    conv_p = subparsers.add_parser("convert", help="Convert between formats")
+    conv_p = subparsers.add_parser("convert", help="Convert between formats", parents=[engine_p])
     conv_p.add_argument("file", help="Input CSV or JSON file")
     conv_p.add_argument("--output", "-o", required=True, help="Output file path (.json, .csv, .tsv)")
 
@@ -291,14 +619,14 @@ def main():
     if args.action == "view":
         cmd_view(file_path, args.limit)
     elif args.action == "filter":
-        cmd_filter(file_path, args.column, args.value)
+        cmd_filter(file_path, args.column, args.value, args.engine)
     elif args.action == "sort":
-        cmd_sort(file_path, args.column, args.order)
+        cmd_sort(file_path, args.column, args.order, args.engine)
     elif args.action == "stats":
-        cmd_stats(file_path, args.column)
+        cmd_stats(file_path, args.column, args.engine)
     elif args.action == "convert":
         output_path = os.path.expanduser(args.output)
-        cmd_convert(file_path, os.path.abspath(output_path))
+        cmd_convert(file_path, os.path.abspath(output_path), args.engine)
 
 
 if __name__ == "__main__":
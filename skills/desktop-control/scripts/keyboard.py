@@ -9,28 +9,70 @@ Usage:
     keyboard.py hotkey --keys "command+c"
 """
 
+import importlib.util
+import os
 import sys
 import subprocess
 import argparse
+import functools
 
+# Touched after pyautogui is known to be importable so later runs skip the probe
+STAMP_PATH = os.path.join(os.path.expanduser("~"), ".cache", "phpbot", "pyautogui_ok")
 
-def ensure_pyautogui():
-    """Install pyautogui if not available."""
+
+def _write_stamp():
     try:
-        import pyautogui  # noqa: F401
-        return True
-    except ImportError:
-        print("Installing pyautogui...", file=sys.stderr)
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "pyautogui", "-q"],
+        os.makedirs(os.path.dirname(STAMP_PATH), exist_ok=True)
+        with open(STAMP_PATH, "a"):
+            pass
+    except OSError:
+        pass
+
+
+# Wheels for auto-installed packages, so installs in fresh environments skip PyPI
+WHEEL_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "phpbot", "wheels")
+
+
+def pip_install(package):
+    """pip install a package, from the local wheel cache when it has it."""
+    def pip(*args):
+        return subprocess.run(
+            [sys.executable, "-m", "pip", *args, "-q"],
             capture_output=True, text=True,
         )
-        if result.returncode != 0:
-            print(f"Failed to install pyautogui: {result.stderr}", file=sys.stderr)
-            return False
-        print("pyautogui installed.", file=sys.stderr)
+
+    offline = ["install", "--no-index", "--find-links", WHEEL_CACHE, package]
+    if os.path.isdir(WHEEL_CACHE):
+        result = pip(*offline)
+        if result.returncode == 0:
+            return result
+    # Build wheels for the package and its dependencies once, then install from them
+    if pip("wheel", "--wheel-dir", WHEEL_CACHE, package).returncode == 0:
+        result = pip(*offline)
+        if result.returncode == 0:
+            return result
+    return pip("install", package)
+
+
+def ensure_pyautogui():
+    """Install pyautogui if not available."""
+    if os.path.exists(STAMP_PATH):
+        return True
+
+    # find_spec only locates the package; importing pyautogui costs ~200ms
+    if importlib.util.find_spec("pyautogui") is not None:
+        _write_stamp()
         return True
 
+    print("Installing pyautogui...", file=sys.stderr)
+    result = pip_install("pyautogui")
+    if result.returncode != 0:
+        print(f"Failed to install pyautogui: {result.stderr}", file=sys.stderr)
+        return False
+    print("pyautogui installed.", file=sys.stderr)
+    _write_stamp()
+    return True
+
 
 # Map common key aliases to pyautogui key names
 KEY_ALIASES = {
@@ -55,6 +97,7 @@ KEY_ALIASES = {
 }
 
 
+@functools.lru_cache(maxsize=128)
 def resolve_key(key_name):
     """Resolve key aliases to pyautogui key names."""
     k = key_name.lower().strip()
@@ -70,23 +113,28 @@ def cmd_type(args):
 
 
 def _type_unicode(text, interval):
-    """Type Unicode text using pyperclip + paste (pyautogui.typewrite only supports ASCII)."""
+    """Type Unicode text using pbcopy + paste (pyautogui.typewrite only supports ASCII).
+
+    The text is split into maximal ASCII / non-ASCII runs: ASCII runs are typed
+    in one typewrite call and each non-ASCII run is pasted in a single go.
+    """
     import pyautogui
+    import itertools
     import time
 
-    for char in text:
-        if char.isascii():
-            pyautogui.typewrite(char, interval=0)
+    for is_ascii, chars in itertools.groupby(text, key=str.isascii):
+        run = "".join(chars)
+        if is_ascii:
+            pyautogui.typewrite(run, interval=interval)
         else:
             # Use clipboard paste for non-ASCII characters
             try:
-                import subprocess
-                subprocess.run(["pbcopy"], input=char.encode("utf-8"), check=True)
+                subprocess.run(["pbcopy"], input=run.encode("utf-8"), check=True)
                 pyautogui.hotkey("command", "v")
             except Exception:
                 # Fallback: skip non-ASCII
                 pass
-        time.sleep(interval)
+            time.sleep(interval)
 
 
 def cmd_press(args):
@@ -127,7 +175,21 @@ def main():
     if not ensure_pyautogui():
         sys.exit(1)
 
-    import pyautogui
+    try:
+        import pyautogui
+    except ImportError:
+        # Stale stamp: pyautogui was removed after the last successful check
+        try:
+            os.remove(STAMP_PATH)
+        except FileNotFoundError:
+            pass
+        if not ensure_pyautogui():
+            sys.exit(1)
+        try:
+            import pyautogui
+        except ImportError as e:
+            print(f"Failed to install pyautogui: {e}", file=sys.stderr)
+            sys.exit(1)
     pyautogui.FAILSAFE = True
     pyautogui.PAUSE = 0.1
 
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Mouse control: move, click, double-click, right-click, drag, scroll.
-Auto-installs pyautogui if not available.
+Posts CoreGraphics (Quartz) events directly; falls back to pyautogui
+(auto-installed) when Quartz is unavailable or PHPBOT_MOUSE_BACKEND=pyautogui.
 
 Usage:
     mouse.py move --x X --y Y
@@ -13,98 +14,249 @@ Usage:
     mouse.py position
 """
 
+import importlib.util
+import os
 import sys
+import time
 import subprocess
 import argparse
 
 
-def ensure_pyautogui():
-    """Install pyautogui if not available."""
-    try:
-        import pyautogui  # noqa: F401
-        return True
-    except ImportError:
-        print("Installing pyautogui...", file=sys.stderr)
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "pyautogui", "-q"],
+# Wheels for auto-installed packages, so installs in fresh environments skip PyPI
+WHEEL_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "phpbot", "wheels")
+
+
+def pip_install(package):
+    """pip install a package, from the local wheel cache when it has it."""
+    def pip(*args):
+        return subprocess.run(
+            [sys.executable, "-m", "pip", *args, "-q"],
             capture_output=True, text=True,
         )
-        if result.returncode != 0:
-            print(f"Failed to install pyautogui: {result.stderr}", file=sys.stderr)
-            return False
-        print("pyautogui installed.", file=sys.stderr)
+
+    offline = ["install", "--no-index", "--find-links", WHEEL_CACHE, package]
+    if os.path.isdir(WHEEL_CACHE):
+        result = pip(*offline)
+        if result.returncode == 0:
+            return result
+    # Build wheels for the package and its dependencies once, then install from them
+    if pip("wheel", "--wheel-dir", WHEEL_CACHE, package).returncode == 0:
+        result = pip(*offline)
+        if result.returncode == 0:
+            return result
+    return pip("install", package)
+
+
+def ensure_pyautogui():
+    """Install pyautogui if not available."""
+    # find_spec only locates the package; importing pyautogui costs ~200ms
+    if importlib.util.find_spec("pyautogui") is not None:
         return True
 
+    print("Installing pyautogui...", file=sys.stderr)
+    result = pip_install("pyautogui")
+    if result.returncode != 0:
+        print(f"Failed to install pyautogui: {result.stderr}", file=sys.stderr)
+        return False
+    print("pyautogui installed.", file=sys.stderr)
+    return True
+
+
+_PA = None
+
+
+def _pa():
+    """Import pyautogui on first use and cache the module."""
+    global _PA
+    if _PA is None:
+        import pyautogui
+        pyautogui.FAILSAFE = True  # Keep failsafe on: move mouse to top-left corner to abort
+        pyautogui.PAUSE = 0.1
+        _PA = pyautogui
+    return _PA
+
+
+class FailSafeException(Exception):
+    """Raised, like pyautogui's, when the pointer is in the top-left corner."""
+
+
+class QuartzMouse:
+    """Mouse backend posting CGEvents straight to the HID event tap.
+
+    Keeps pyautogui's fail-safe: every event is refused once the user has
+    moved the pointer to (0, 0).
+    """
+
+    DRAG_STEPS = 20
+    DRAG_DURATION = 0.5
+
+    def __init__(self, Quartz):
+        self.Q = Quartz
+        self.buttons = {
+            "left": (Quartz.kCGEventLeftMouseDown, Quartz.kCGEventLeftMouseUp,
+                     Quartz.kCGEventLeftMouseDragged, Quartz.kCGMouseButtonLeft),
+            "right": (Quartz.kCGEventRightMouseDown, Quartz.kCGEventRightMouseUp,
+                      Quartz.kCGEventRightMouseDragged, Quartz.kCGMouseButtonRight),
+            "middle": (Quartz.kCGEventOtherMouseDown, Quartz.kCGEventOtherMouseUp,
+                       Quartz.kCGEventOtherMouseDragged, Quartz.kCGMouseButtonCenter),
+        }
+
+    def _fail_safe_check(self):
+        if self.position() == (0, 0):
+            raise FailSafeException(
+                "Fail-safe triggered from mouse moving to the top-left corner of the screen."
+            )
+
+    def _post(self, event_type, x, y, button, click_state=1):
+        self._fail_safe_check()
+        ev = self.Q.CGEventCreateMouseEvent(None, event_type, (x, y), button)
+        if click_state > 1:
+            self.Q.CGEventSetIntegerValueField(ev, self.Q.kCGMouseEventClickState, click_state)
+        self.Q.CGEventPost(self.Q.kCGHIDEventTap, ev)
+
+    def position(self):
+        loc = self.Q.CGEventGetLocation(self.Q.CGEventCreate(None))
+        return int(loc.x), int(loc.y)
+
+    def size(self):
+        display = self.Q.CGMainDisplayID()
+        return self.Q.CGDisplayPixelsWide(display), self.Q.CGDisplayPixelsHigh(display)
+
+    def move(self, x, y):
+        self._post(self.Q.kCGEventMouseMoved, x, y, self.Q.kCGMouseButtonLeft)
+
+    def click(self, x, y, button="left", clicks=1):
+        down, up, _, btn = self.buttons[button]
+        for n in range(1, clicks + 1):
+            self._post(down, x, y, btn, n)
+            self._post(up, x, y, btn, n)
+
+    def drag(self, x, y, to_x, to_y):
+        down, up, dragged, btn = self.buttons["left"]
+        self.move(x, y)
+        self._post(down, x, y, btn)
+        # Intermediate drag events so apps see a real drag gesture
+        for i in range(1, self.DRAG_STEPS + 1):
+            t = i / self.DRAG_STEPS
+            self._post(dragged, x + (to_x - x) * t, y + (to_y - y) * t, btn)
+            time.sleep(self.DRAG_DURATION / self.DRAG_STEPS)
+        self._post(up, to_x, to_y, btn)
+
+    def scroll(self, amount):
+        self._fail_safe_check()
+        ev = self.Q.CGEventCreateScrollWheelEvent(None, self.Q.kCGScrollEventUnitLine, 1, amount)
+        self.Q.CGEventPost(self.Q.kCGHIDEventTap, ev)
+
+
+class PyAutoGUIMouse:
+    """Fallback backend using pyautogui."""
+
+    def __init__(self, pyautogui):
+        self.pa = pyautogui
+
+    def position(self):
+        pos = self.pa.position()
+        return pos.x, pos.y
+
+    def size(self):
+        screen = self.pa.size()
+        return screen.width, screen.height
+
+    def move(self, x, y):
+        self.pa.moveTo(x, y, duration=0.3)
+
+    def click(self, x, y, button="left", clicks=1):
+        self.pa.click(x, y, clicks=clicks, button=button)
+
+    def drag(self, x, y, to_x, to_y):
+        self.pa.moveTo(x, y)
+        self.pa.drag(to_x - x, to_y - y, duration=0.5)
+
+    def scroll(self, amount):
+        self.pa.scroll(amount)
+
+
+def load_backend():
+    """Return the Quartz backend, or the pyautogui one when requested or needed."""
+    if os.environ.get("PHPBOT_MOUSE_BACKEND") != "pyautogui":
+        try:
+            import Quartz
+            return QuartzMouse(Quartz)
+        except ImportError:
+            pass
 
-def cmd_move(args):
+    if not ensure_pyautogui():
+        sys.exit(1)
+
+    return PyAutoGUIMouse(_pa())
+
+
+def _target(mouse, args):
+    """Coordinates from args, or the current position when none were given."""
+    if args.x is not None and args.y is not None:
+        return args.x, args.y, False
+    x, y = mouse.position()
+    return x, y, True
+
+
+def cmd_move(args, mouse):
     """Move mouse to position."""
-    import pyautogui
-    pyautogui.moveTo(args.x, args.y, duration=0.3)
+    mouse.move(args.x, args.y)
     print(f"Mouse moved to ({args.x}, {args.y})")
 
 
-def cmd_click(args):
+def cmd_click(args, mouse):
     """Click at position."""
-    import pyautogui
     button = args.button or "left"
-    if args.x is not None and args.y is not None:
-        pyautogui.click(args.x, args.y, button=button)
-        print(f"Clicked ({button}) at ({args.x}, {args.y})")
+    x, y, current = _target(mouse, args)
+    mouse.click(x, y, button=button)
+    if current:
+        print(f"Clicked ({button}) at current position ({x}, {y})")
     else:
-        pyautogui.click(button=button)
-        pos = pyautogui.position()
-        print(f"Clicked ({button}) at current position ({pos.x}, {pos.y})")
+        print(f"Clicked ({button}) at ({x}, {y})")
 
 
-def cmd_doubleclick(args):
+def cmd_doubleclick(args, mouse):
     """Double-click at position."""
-    import pyautogui
-    if args.x is not None and args.y is not None:
-        pyautogui.doubleClick(args.x, args.y)
-        print(f"Double-clicked at ({args.x}, {args.y})")
+    x, y, current = _target(mouse, args)
+    mouse.click(x, y, clicks=2)
+    if current:
+        print(f"Double-clicked at current position ({x}, {y})")
     else:
-        pyautogui.doubleClick()
-        pos = pyautogui.position()
-        print(f"Double-clicked at current position ({pos.x}, {pos.y})")
+        print(f"Double-clicked at ({x}, {y})")
 
 
-def cmd_rightclick(args):
+def cmd_rightclick(args, mouse):
     """Right-click at position."""
-    import pyautogui
-    if args.x is not None and args.y is not None:
-        pyautogui.rightClick(args.x, args.y)
-        print(f"Right-clicked at ({args.x}, {args.y})")
+    x, y, current = _target(mouse, args)
+    mouse.click(x, y, button="right")
+    if current:
+        print(f"Right-clicked at current position ({x}, {y})")
     else:
-        pyautogui.rightClick()
-        pos = pyautogui.position()
-        print(f"Right-clicked at current position ({pos.x}, {pos.y})")
+        print(f"Right-clicked at ({x}, {y})")
 
 
-def cmd_drag(args):
+def cmd_drag(args, mouse):
     """Drag from one position to another."""
-    import pyautogui
-    pyautogui.moveTo(args.x, args.y)
-    pyautogui.drag(args.to_x - args.x, args.to_y - args.y, duration=0.5)
+    mouse.drag(args.x, args.y, args.to_x, args.to_y)
     print(f"Dragged from ({args.x}, {args.y}) to ({args.to_x}, {args.to_y})")
 
 
-def cmd_scroll(args):
+def cmd_scroll(args, mouse):
     """Scroll at position."""
-    import pyautogui
     if args.x is not None and args.y is not None:
-        pyautogui.moveTo(args.x, args.y)
-    pyautogui.scroll(args.amount)
+        mouse.move(args.x, args.y)
+    mouse.scroll(args.amount)
     direction = "up" if args.amount > 0 else "down"
     print(f"Scrolled {direction} by {abs(args.amount)} clicks")
 
 
-def cmd_position(args):
+def cmd_position(args, mouse):
     """Get current mouse position."""
-    import pyautogui
-    pos = pyautogui.position()
-    screen = pyautogui.size()
-    print(f"Mouse position: ({pos.x}, {pos.y})")
-    print(f"Screen size: {screen.width}x{screen.height}")
+    x, y = mouse.position()
+    width, height = mouse.size()
+    print(f"Mouse position: ({x}, {y})")
+    print(f"Screen size: {width}x{height}")
 
 
 def main():
@@ -150,13 +302,7 @@ def main():
 
     args = parser.parse_args()
 
-    if not ensure_pyautogui():
-        sys.exit(1)
-
-    # Disable pyautogui fail-safe for automated use (move mouse to corner to abort)
-    import pyautogui
-    pyautogui.FAILSAFE = True  # Keep failsafe on: move mouse to top-left corner to abort
-    pyautogui.PAUSE = 0.1
+    mouse = load_backend()
 
     actions = {
         "move": cmd_move,
@@ -169,7 +315,7 @@ def main():
     }
 
     try:
-        actions[args.action](args)
+        actions[args.action](args, mouse)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
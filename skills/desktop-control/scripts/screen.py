@@ -1,42 +1,130 @@
 #!/usr/bin/env python3
 """
 Screen reading: get info, capture screenshots, read accessibility tree.
-Uses pyautogui for screen info/capture and AppleScript for accessibility.
+Uses pyautogui for screen info/capture and the Accessibility API (PyObjC)
+for the UI tree, falling back to AppleScript when PyObjC is unavailable.
 
 Usage:
-    screen.py info
+    screen.py info [--no-cache]
     screen.py capture [--output path] [--x X --y Y --width W --height H]
-    screen.py read-ui [--depth N]
+    screen.py read-ui [--depth N] [--full]
 """
 
+import importlib.util
 import sys
 import os
 import subprocess
 import argparse
 import json
+import time
 
 
-def ensure_pyautogui():
-    """Install pyautogui if not available."""
-    try:
-        import pyautogui  # noqa: F401
-        return True
-    except ImportError:
-        print("Installing pyautogui...", file=sys.stderr)
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "pyautogui", "-q"],
+# Wheels for auto-installed packages, so installs in fresh environments skip PyPI
+WHEEL_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "phpbot", "wheels")
+
+
+def pip_install(package):
+    """pip install a package, from the local wheel cache when it has it."""
+    def pip(*args):
+        return subprocess.run(
+            [sys.executable, "-m", "pip", *args, "-q"],
             capture_output=True, text=True,
         )
-        if result.returncode != 0:
-            print(f"Failed to install pyautogui: {result.stderr}", file=sys.stderr)
-            return False
-        print("pyautogui installed.", file=sys.stderr)
+
+    offline = ["install", "--no-index", "--find-links", WHEEL_CACHE, package]
+    if os.path.isdir(WHEEL_CACHE):
+        result = pip(*offline)
+        if result.returncode == 0:
+            return result
+    # Build wheels for the package and its dependencies once, then install from them
+    if pip("wheel", "--wheel-dir", WHEEL_CACHE, package).returncode == 0:
+        result = pip(*offline)
+        if result.returncode == 0:
+            return result
+    return pip("install", package)
+
+
+def ensure_pyautogui():
+    """Install pyautogui if not available."""
+    # find_spec only locates the package; importing pyautogui costs ~200ms
+    if importlib.util.find_spec("pyautogui") is not None:
         return True
 
+    print("Installing pyautogui...", file=sys.stderr)
+    result = pip_install("pyautogui")
+    if result.returncode != 0:
+        print(f"Failed to install pyautogui: {result.stderr}", file=sys.stderr)
+        return False
+    print("pyautogui installed.", file=sys.stderr)
+    return True
+
+
+_PA = None
+
+
+def _pa():
+    """Import pyautogui on first use and cache the module."""
+    global _PA
+    if _PA is None:
+        import pyautogui
+        _PA = pyautogui
+    return _PA
+
+
+FRONTAPP_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "phpbot", "frontapp.json")
+FRONTAPP_TTL = 0.5  # seconds
+
+
+def _query_frontapp():
+    """Ask System Events for the frontmost app and window; returns (app, window) or None."""
+    script = '''
+    tell application "System Events"
+        set frontApp to first application process whose frontmost is true
+        set appName to name of frontApp
+        try
+            set winName to name of front window of frontApp
+        on error
+            set winName to "N/A"
+        end try
+        return appName & "|" & winName
+    end tell
+    '''
+    result = subprocess.run(
+        ["osascript", "-e", script],
+        capture_output=True, text=True, timeout=5,
+    )
+    if result.returncode != 0:
+        return None
+    parts = result.stdout.strip().split("|", 1)
+    return parts[0], parts[1] if len(parts) > 1 else None
+
+
+def _cached_frontapp(use_cache=True):
+    """Frontmost (app, window), reusing a result younger than FRONTAPP_TTL."""
+    if use_cache:
+        try:
+            if time.time() - os.path.getmtime(FRONTAPP_CACHE) < FRONTAPP_TTL:
+                with open(FRONTAPP_CACHE, "r", encoding="utf-8") as f:
+                    return tuple(json.load(f))
+        except (OSError, ValueError, TypeError):
+            pass
+
+    value = _query_frontapp()
+    if value is not None:
+        try:
+            os.makedirs(os.path.dirname(FRONTAPP_CACHE), exist_ok=True)
+            tmp = f"{FRONTAPP_CACHE}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp, FRONTAPP_CACHE)
+        except OSError:
+            pass
+    return value
+
 
 def cmd_info(args):
     """Get screen size and mouse position."""
-    import pyautogui
+    pyautogui = _pa()
     screen = pyautogui.size()
     pos = pyautogui.position()
     print(f"Screen size: {screen.width}x{screen.height}")
@@ -44,128 +132,493 @@ def cmd_info(args):
 
     # Get frontmost app info via AppleScript
     try:
-        script = '''
-        tell application "System Events"
-            set frontApp to first application process whose frontmost is true
-            set appName to name of frontApp
-            try
-                set winName to name of front window of frontApp
-            on error
-                set winName to "N/A"
-            end try
-            return appName & "|" & winName
-        end tell
-        '''
+        front = _cached_frontapp(not args.no_cache)
+        if front is not None:
+            app_name, win_name = front
+            print(f"Frontmost app: {app_name}")
+            if win_name is not None:
+                print(f"Window title: {win_name}")
+    except Exception:
+        pass
+
+
+SCREENCAPTURE = "/usr/sbin/screencapture"
+# screencapture(1) -t formats, keyed by output file extension
+CAPTURE_TYPES = {
+    ".png": "png", ".jpg": "jpg", ".jpeg": "jpg", ".tif": "tiff",
+    ".tiff": "tiff", ".gif": "gif", ".bmp": "bmp", ".pdf": "pdf",
+}
+
+
+def _image_size(path):
+    """Pixel (width, height) of an image file via sips, or None."""
+    try:
         result = subprocess.run(
-            ["osascript", "-e", script],
+            ["sips", "-g", "pixelWidth", "-g", "pixelHeight", path],
             capture_output=True, text=True, timeout=5,
         )
-        if result.returncode == 0:
-            parts = result.stdout.strip().split("|", 1)
-            print(f"Frontmost app: {parts[0]}")
-            if len(parts) > 1:
-                print(f"Window title: {parts[1]}")
-    except Exception:
-        pass
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    dims = {}
+    for line in result.stdout.splitlines():
+        key, _, value = line.strip().partition(": ")
+        if key in ("pixelWidth", "pixelHeight") and value.isdigit():
+            dims[key] = int(value)
+    if len(dims) != 2:
+        return None
+    return dims["pixelWidth"], dims["pixelHeight"]
 
 
-def cmd_capture(args):
-    """Capture a screenshot."""
-    import pyautogui
+def _drop_alpha(img):
+    """Screen captures are opaque; encoding an RGBA frame wastes a quarter of the bytes."""
+    return img.convert("RGB") if img.mode == "RGBA" else img
+
+
+def _use_screencapture(output):
+    return os.path.exists(SCREENCAPTURE) and os.path.splitext(output)[1].lower() in CAPTURE_TYPES
+
 
+def _capture_output_path(args):
     output = args.output
     if not output:
         from datetime import datetime
         ts = datetime.now().strftime("%Y%m%d-%H%M%S")
         output = os.path.expanduser(f"~/Desktop/screenshot-{ts}.png")
+    return os.path.abspath(os.path.expanduser(output))
 
-    output = os.path.abspath(os.path.expanduser(output))
+
+def cmd_capture(args):
+    """Capture a screenshot."""
+    output = _capture_output_path(args)
     os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
 
+    region = None
     if args.x is not None and args.y is not None and args.width and args.height:
-        # Region capture
-        img = pyautogui.screenshot(region=(args.x, args.y, args.width, args.height))
+        region = (args.x, args.y, args.width, args.height)
+
+    if _use_screencapture(output):
+        # screencapture writes the file itself, skipping a PIL decode and re-encode
+        capture_type = CAPTURE_TYPES[os.path.splitext(output)[1].lower()]
+        cmd = [SCREENCAPTURE, "-x", "-t", capture_type]
+        if region:
+            cmd += ["-R", ",".join(str(v) for v in region)]
+        result = subprocess.run(cmd + [output], capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            raise RuntimeError(f"screencapture failed: {result.stderr.strip()}")
+        dims = _image_size(output)
     else:
-        img = pyautogui.screenshot()
+        pyautogui = _pa()
+        if region:
+            # Region capture
+            img = pyautogui.screenshot(region=region)
+        else:
+            img = pyautogui.screenshot()
+        img = _drop_alpha(img)
+        img.save(output)
+        dims = (img.width, img.height)
 
-    img.save(output)
     size = os.path.getsize(output)
-    print(f"Screenshot saved: {output} ({img.width}x{img.height}, {size:,} bytes)")
+    if dims:
+        print(f"Screenshot saved: {output} ({dims[0]}x{dims[1]}, {size:,} bytes)")
+    else:
+        print(f"Screenshot saved: {output} ({size:,} bytes)")
+
+
+def _quartz_frames(region):
+    """Yield BGRA frames as (width, height, bytes_per_row, data) from CoreGraphics.
+
+    Returns None when PyObjC's Quartz bindings are unavailable.
+    """
+    try:
+        import Quartz
+    except ImportError:
+        return None
+
+    display = Quartz.CGMainDisplayID()
+    rect = Quartz.CGRectMake(*region) if region else None
+
+    def frames():
+        while True:
+            if rect is not None:
+                image = Quartz.CGDisplayCreateImageForRect(display, rect)
+            else:
+                image = Quartz.CGDisplayCreateImage(display)
+            if image is None:
+                raise RuntimeError("could not capture the display (check Screen Recording permission)")
+            data = Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(image))
+            yield (Quartz.CGImageGetWidth(image), Quartz.CGImageGetHeight(image),
+                   Quartz.CGImageGetBytesPerRow(image), data)
+
+    return frames()
+
+
+def cmd_capture_stream(args):
+    """Capture a sequence of screenshots at a fixed rate."""
+    from PIL import Image
+
+    output_dir = args.output_dir
+    if not output_dir:
+        from datetime import datetime
+        ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output_dir = f"~/Desktop/screenshots-{ts}"
+    output_dir = os.path.abspath(os.path.expanduser(output_dir))
+    os.makedirs(output_dir, exist_ok=True)
+
+    region = None
+    if args.x is not None and args.y is not None and args.width and args.height:
+        region = (args.x, args.y, args.width, args.height)
+
+    frames = _quartz_frames(region)
+    img = None
+    interval = 1.0 / args.fps if args.fps > 0 else 0.0
+    deadline = time.monotonic()
+
+    for n in range(1, args.loop + 1):
+        if frames is not None:
+            width, height, stride, data = next(frames)
+            if img is None or img.size != (width, height):
+                img = Image.new("RGB", (width, height))
+            # Decode in place: the frame buffer is allocated once, and the
+            # unused alpha byte is dropped while unpacking
+            img.frombytes(data, "raw", "BGRX", stride)
+        else:
+            pyautogui = _pa()
+            img = pyautogui.screenshot(region=region) if region else pyautogui.screenshot()
+            img = _drop_alpha(img)
+
+        output = os.path.join(output_dir, f"frame-{n:04d}.{args.format}")
+        img.save(output)
+        print(f"Frame {n}: {output} ({img.width}x{img.height})")
+
+        deadline += interval
+        delay = deadline - time.monotonic()
+        if delay > 0 and n < args.loop:
+            time.sleep(delay)
+
+
+ACCESSIBILITY_ERROR = (
+    "Error: Accessibility permission required.\n"
+    "Go to System Settings > Privacy & Security > Accessibility\n"
+    "and enable your terminal application."
+)
+
+AX_ATTRIBUTES = ["AXRole", "AXTitle", "AXDescription", "AXValue", "AXPosition", "AXSize"]
+# Children are copied out of large AXChildren arrays this many at a time
+CHILD_BATCH = 64
+
+# Pruning (default for the Accessibility API path): only these roles are
+# printed, only containers are descended into, and near-invisible
+# elements are skipped along with their subtrees.
+INTERACTIVE_ROLES = frozenset({
+    "AXButton", "AXPopUpButton", "AXMenuButton", "AXTextField", "AXTextArea",
+    "AXComboBox", "AXCheckBox", "AXRadioButton", "AXSlider", "AXMenuItem",
+    "AXLink", "AXCell", "AXRow",
+})
+TEXT_ROLES = frozenset({"AXStaticText", "AXHeading"})
+CONTAINER_ROLES = frozenset({
+    "AXWindow", "AXSheet", "AXGroup", "AXScrollArea", "AXSplitGroup",
+    "AXToolbar", "AXTabGroup", "AXList", "AXOutline", "AXTable", "AXRow",
+    "AXCell", "AXWebArea", "AXLayoutArea", "AXRadioGroup", "AXMenuBar",
+    "AXMenu", "AXPopover", "AXBrowser", "AXGrid", "AXDrawer",
+})
+MIN_ELEMENT_SIZE = 2  # px; elements this thin or thinner are skipped
+TEXT_OVERLAP_IOU = 0.5
+
+# Elements visited per read-ui before the walk stops; bounds the time spent
+# on windows with thousands of cells
+MAX_NODES = 2000
+
+
+def _ax_value(AS, value):
+    """Drop AXError placeholders returned for attributes an element lacks."""
+    if value is None:
+        return None
+    if type(value).__name__ == "AXValueRef" and AS.AXValueGetType(value) == AS.kAXValueAXErrorType:
+        return None
+    return value
+
+
+def _ax_text(value):
+    """Render a scalar attribute value the way AppleScript's "as text" would."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    return ""
+
+
+def _ax_rect(AS, position, size):
+    """(x, y, w, h) from AXPosition/AXSize values, or None if unavailable."""
+    if position is None or size is None:
+        return None
+    ok_pos, point = AS.AXValueGetValue(position, AS.kAXValueCGPointType, None)
+    ok_size, extent = AS.AXValueGetValue(size, AS.kAXValueCGSizeType, None)
+    if not (ok_pos and ok_size):
+        return None
+    return point.x, point.y, extent.width, extent.height
+
+
+def _iou(a, b):
+    """Intersection-over-union of two (x, y, w, h) rectangles."""
+    ix = max(0.0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _ax_fetch(AS, element):
+    """All AX_ATTRIBUTES of an element in one IPC round-trip, or None."""
+    err, values = AS.AXUIElementCopyMultipleAttributeValues(element, AX_ATTRIBUTES, 0, None)
+    if err != 0 or values is None:
+        return None
+    return [_ax_value(AS, v) for v in values]
+
+
+def _ax_children(AS, element):
+    """Yield an element's children, copying CHILD_BATCH of them per call."""
+    err, count = AS.AXUIElementGetAttributeValueCount(element, "AXChildren", None)
+    if err != 0 or not count:
+        return
+    for start in range(0, count, CHILD_BATCH):
+        err, batch = AS.AXUIElementCopyAttributeValues(
+            element, "AXChildren", start, min(CHILD_BATCH, count - start), None
+        )
+        if err != 0 or batch is None:
+            return
+        yield from batch
+
+
+def _ax_lines(AS, element, current_depth, max_depth, indent, lines, prune=True, sibling_texts=None, budget=None):
+    """Append one line per element, depth-first, mirroring getUIElements.
+
+    budget is a one-item list counting down the elements left to visit; it
+    goes negative once the walk has been cut short.
+    """
+    if current_depth > max_depth:
+        return
+    if budget is not None:
+        budget[0] -= 1
+        if budget[0] < 0:
+            return
+
+    values = _ax_fetch(AS, element)
+    if values is None:
+        return
+    role, title, desc, value, position, size = values
+    children = None
+
+    role = role or "unknown"
+    label = title or desc or ""
+    value_text = _ax_text(value) if value is not None else ""
+
+    if prune:
+        rect = _ax_rect(AS, position, size)
+        if rect is not None and (rect[2] <= MIN_ELEMENT_SIZE or rect[3] <= MIN_ELEMENT_SIZE):
+            return
+        if role in TEXT_ROLES and rect is not None and sibling_texts is not None:
+            # Overlapping static-text siblings usually repeat the same text
+            if any(_iou(rect, other) > TEXT_OVERLAP_IOU for other in sibling_texts):
+                return
+            sibling_texts.append(rect)
+        if role in INTERACTIVE_ROLES and not label:
+            # Collapse static-text children into the control's label
+            children = list(_ax_children(AS, element))
+            texts = []
+            for child in children:
+                child_values = _ax_fetch(AS, child)
+                if child_values and child_values[0] in TEXT_ROLES:
+                    texts.append(_ax_text(child_values[3]) or child_values[1] or "")
+            if texts and len(texts) == len(children):
+                label = " ".join(t for t in texts if t)
+                children = []
+
+    val_str = f' = "{value_text}"' if value_text else ""
+
+    if prune:
+        show = role in INTERACTIVE_ROLES or role in TEXT_ROLES or (role in CONTAINER_ROLES and label)
+        show = show and bool(label or val_str or role in INTERACTIVE_ROLES)
+    else:
+        # Only output elements with meaningful info
+        show = bool(label or val_str or role != "unknown")
+
+    if show:
+        lines.append(f"{indent}[{role}] {label}{val_str}" if label or val_str else f"{indent}[{role}]")
+
+    if prune and role not in CONTAINER_ROLES:
+        return
+
+    # Hidden containers don't add a level of indentation when pruning
+    child_indent = indent + "  " if show or not prune else indent
+    child_texts = []
+    if children is None:
+        children = _ax_children(AS, element)
+    for child in children:
+        _ax_lines(AS, child, current_depth + 1, max_depth, child_indent, lines, prune, child_texts, budget)
+
+
+def _truncation_note(max_nodes):
+    return f"...(truncated after {max_nodes} elements; raise --max-nodes or lower --depth)"
+
+
+def _read_ui_ax(depth, prune=True, max_nodes=MAX_NODES):
+    """Read the frontmost app's UI tree via the Accessibility API (PyObjC).
+
+    Returns None when PyObjC's ApplicationServices bindings are unavailable.
+    """
+    try:
+        import ApplicationServices as AS
+    except ImportError:
+        return None
+
+    if not AS.AXIsProcessTrusted():
+        print(ACCESSIBILITY_ERROR, file=sys.stderr)
+        sys.exit(1)
+
+    system = AS.AXUIElementCreateSystemWide()
+    err, app = AS.AXUIElementCopyAttributeValue(system, "AXFocusedApplication", None)
+    if err != 0 or app is None:
+        return None
+
+    _, app_name = AS.AXUIElementCopyAttributeValue(app, "AXTitle", None)
+    lines = [f"Application: {app_name or ''}"]
+
+    budget = [max_nodes]
+    _, windows = AS.AXUIElementCopyAttributeValue(app, "AXWindows", None)
+    for win in windows or []:
+        _, win_name = AS.AXUIElementCopyAttributeValue(win, "AXTitle", None)
+        lines.append("")
+        lines.append(f"Window: {win_name or 'Untitled'}")
+        _ax_lines(AS, win, 1, depth, "  ", lines, prune, budget=budget)
+
+    if budget[0] < 0:
+        lines.append("")
+        lines.append(_truncation_note(max_nodes))
+    return "\n".join(lines)
 
 
 def cmd_read_ui(args):
-    """Read the accessibility tree of the frontmost application using AppleScript."""
+    """Read the accessibility tree of the frontmost application."""
     depth = args.depth or 5
 
-    # AppleScript to read UI hierarchy
-    script = f'''
-    on getUIElements(element, currentDepth, maxDepth, indentStr)
-        if currentDepth > maxDepth then return ""
-
-        set output to ""
+    output = _read_ui_ax(depth, prune=not args.full, max_nodes=args.max_nodes)
+    if output is None:
+        output = _read_ui_applescript(depth, args.max_nodes)
 
-        try
-            set elemRole to role of element
-        on error
-            set elemRole to "unknown"
-        end try
+    if output:
+        print(output)
+    else:
+        print("No UI elements found (window may be minimized or empty)")
 
-        try
-            set elemTitle to title of element
-        on error
-            set elemTitle to ""
-        end try
 
-        try
-            set elemName to name of element
-        on error
-            set elemName to ""
-        end try
+def _read_ui_applescript(depth, max_nodes=MAX_NODES):
+    """Read the accessibility tree using AppleScript (fallback without PyObjC)."""
+    # AppleScript to read UI hierarchy
+    script = f'''
+    property nodeBudget : {max_nodes}
+    property truncated : false
 
-        try
-            set elemValue to value of element
-        on error
-            set elemValue to ""
-        end try
+    -- One value per child of parentElement; a single bulk query when every
+    -- child has the attribute, per-child lookups only when it fails
+    on attrValues(parentElement, attrName, childElements)
+        tell application "System Events"
+            try
+                set vals to value of attribute attrName of every UI element of parentElement
+                if (count of vals) = (count of childElements) then return vals
+            end try
+            set vals to {{}}
+            repeat with child in childElements
+                try
+                    set end of vals to value of attribute attrName of child
+                on error
+                    set end of vals to missing value
+                end try
+            end repeat
+            return vals
+        end tell
+    end attrValues
 
-        try
-            set elemDesc to description of element
-        on error
-            set elemDesc to ""
-        end try
+    on formatElement(elemRole, elemTitle, elemDesc, elemValue, indentStr)
+        if elemRole is missing value or elemRole is "" then set elemRole to "unknown"
 
         -- Build label from available attributes
         set label to ""
-        if elemName is not "" and elemName is not missing value then
-            set label to elemName
-        else if elemTitle is not "" and elemTitle is not missing value then
+        if elemTitle is not missing value and elemTitle is not "" then
             set label to elemTitle
-        else if elemDesc is not "" and elemDesc is not missing value then
+        else if elemDesc is not missing value and elemDesc is not "" then
             set label to elemDesc
         end if
 
         set valStr to ""
-        if elemValue is not "" and elemValue is not missing value then
-            set valStr to " = \\"" & (elemValue as text) & "\\""
+        if elemValue is not missing value and elemValue is not "" then
+            try
+                set valStr to " = \\"" & (elemValue as text) & "\\""
+            end try
         end if
 
         -- Only output elements with meaningful info
         if label is not "" or valStr is not "" then
-            set output to output & indentStr & "[" & elemRole & "] " & label & valStr & "\\n"
+            return indentStr & "[" & elemRole & "] " & label & valStr & "\\n"
         else if elemRole is not "unknown" then
-            set output to output & indentStr & "[" & elemRole & "]\\n"
+            return indentStr & "[" & elemRole & "]\\n"
         end if
+        return ""
+    end formatElement
 
-        -- Recurse into children
-        try
-            set childElements to UI elements of element
-            repeat with child in childElements
-                set output to output & getUIElements(child, currentDepth + 1, maxDepth, indentStr & "  ")
+    on describeElement(element, indentStr)
+        tell application "System Events"
+            set attrs to {{missing value, missing value, missing value, missing value}}
+            set attrNames to {{"AXRole", "AXTitle", "AXDescription", "AXValue"}}
+            repeat with i from 1 to 4
+                try
+                    set item i of attrs to value of attribute (item i of attrNames) of element
+                end try
             end repeat
-        end try
+        end tell
+        return my formatElement(item 1 of attrs, item 2 of attrs, item 3 of attrs, item 4 of attrs, indentStr)
+    end describeElement
+
+    -- Children of parentElement at currentDepth: one bulk query per
+    -- attribute per level instead of one per attribute per child
+    on getChildElements(parentElement, currentDepth, maxDepth, indentStr)
+        if currentDepth > maxDepth then return ""
+
+        tell application "System Events"
+            try
+                set childElements to UI elements of parentElement
+            on error
+                return ""
+            end try
+        end tell
+        set childCount to count of childElements
+        if childCount = 0 then return ""
+        if my nodeBudget < 1 then
+            set my truncated to true
+            return ""
+        end if
+
+        set roles to my attrValues(parentElement, "AXRole", childElements)
+        set titles to my attrValues(parentElement, "AXTitle", childElements)
+        set descs to my attrValues(parentElement, "AXDescription", childElements)
+        set vals to my attrValues(parentElement, "AXValue", childElements)
+
+        set output to ""
+        repeat with i from 1 to childCount
+            if my nodeBudget < 1 then
+                set my truncated to true
+                exit repeat
+            end if
+            set my nodeBudget to (my nodeBudget) - 1
+            set elemRole to item i of roles
+            set output to output & my formatElement(elemRole, item i of titles, item i of descs, item i of vals, indentStr)
+            -- Text and images are leaves; don't ask them for children
+            if elemRole is not in {{"AXStaticText", "AXImage"}} then
+                set output to output & my getChildElements(item i of childElements, currentDepth + 1, maxDepth, indentStr & "  ")
+            end if
+        end repeat
 
         return output
-    end getUIElements
+    end getChildElements
 
     tell application "System Events"
         set frontApp to first application process whose frontmost is true
@@ -182,10 +635,14 @@ def cmd_read_ui(args):
                     set winName to "Untitled"
                 end try
                 set output to output & "\\nWindow: " & winName & "\\n"
-                set output to output & getUIElements(win, 1, {depth}, "  ")
+                if {depth} >= 1 then
+                    set output to output & my describeElement(win, "  ")
+                    set output to output & my getChildElements(win, 2, {depth}, "    ")
+                end if
             end repeat
         end try
 
+        if my truncated then set output to output & "\\n{_truncation_note(max_nodes)}\\n"
         return output
     end tell
     '''
@@ -199,21 +656,12 @@ def cmd_read_ui(args):
         if result.returncode != 0:
             # Check if it's a permissions issue
             if "not allowed" in result.stderr.lower() or "accessibility" in result.stderr.lower():
-                print(
-                    "Error: Accessibility permission required.\n"
-                    "Go to System Settings > Privacy & Security > Accessibility\n"
-                    "and enable your terminal application.",
-                    file=sys.stderr,
-                )
+                print(ACCESSIBILITY_ERROR, file=sys.stderr)
             else:
                 print(f"Error reading UI: {result.stderr}", file=sys.stderr)
             sys.exit(1)
 
-        output = result.stdout.strip()
-        if output:
-            print(output)
-        else:
-            print("No UI elements found (window may be minimized or empty)")
+        return result.stdout.strip()
 
     except subprocess.TimeoutExpired:
         print("Error: Timed out reading accessibility tree (try a smaller --depth)", file=sys.stderr)
@@ -228,7 +676,8 @@ def main():
     subparsers = parser.add_subparsers(dest="action", required=True)
 
     # info
-    subparsers.add_parser("info", help="Screen size and mouse position")
+    p = subparsers.add_parser("info", help="Screen size and mouse position")
+    p.add_argument("--no-cache", action="store_true", help="Always re-query the frontmost app")
 
     # capture
     p = subparsers.add_parser("capture", help="Screenshot")
@@ -238,19 +687,39 @@ def main():
     p.add_argument("--width", type=int, help="Region width")
     p.add_argument("--height", type=int, help="Region height")
 
+    # capture-stream
+    p = subparsers.add_parser("capture-stream", help="Repeated screenshots at a fixed rate")
+    p.add_argument("--output-dir", "-o", help="Directory for frame-NNNN files")
+    p.add_argument("--loop", type=int, default=10, help="Number of frames (default: 10)")
+    p.add_argument("--fps", type=float, default=2.0, help="Frames per second (default: 2)")
+    p.add_argument("--format", choices=["png", "jpg"], default="png", help="Frame format (default: png)")
+    p.add_argument("--x", type=int, help="Region X")
+    p.add_argument("--y", type=int, help="Region Y")
+    p.add_argument("--width", type=int, help="Region width")
+    p.add_argument("--height", type=int, help="Region height")
+
     # read-ui
     p = subparsers.add_parser("read-ui", help="Read accessibility tree")
     p.add_argument("--depth", "-d", type=int, default=5, help="Max tree depth (default: 5)")
+    p.add_argument("--full", action="store_true",
+                   help="Include every element instead of pruning to interactive controls and text")
+    p.add_argument("--max-nodes", type=int, default=MAX_NODES,
+                   help=f"Stop after visiting this many elements (default: {MAX_NODES})")
 
     args = parser.parse_args()
 
-    if args.action != "read-ui":
+    # capture-stream needs Pillow, which comes with pyautogui
+    needs_pyautogui = args.action in ("info", "capture-stream") or (
+        args.action == "capture" and not _use_screencapture(_capture_output_path(args))
+    )
+    if needs_pyautogui:
         if not ensure_pyautogui():
             sys.exit(1)
 
     actions = {
         "info": cmd_info,
         "capture": cmd_capture,
+        "capture-stream": cmd_capture_stream,
         "read-ui": cmd_read_ui,
     }
 
@@ -1,22 +1,150 @@
 #!/usr/bin/env python3
 """
 Create, extract, and list ZIP and tar.gz archives.
-Uses Python stdlib only -- no external dependencies.
+Uses Python stdlib only; tar.gz compression goes through pigz (or
+python-isal's igzip) when available.
 
 Usage:
-    archive.py create <archive_path> [--format zip|tar.gz] <files...>
+    archive.py create <archive_path> [--format zip|tar.gz] [--level 0-9] <files...>
     archive.py extract <archive_path> [--target dir]
     archive.py list <archive_path>
 """
 
 import sys
 import os
+import shutil
+import subprocess
 import argparse
+import collections
+import contextlib
 import zipfile
 import tarfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    # ISA-L deflate: same output format, several times faster than zlib
+    from isal import igzip
+except ImportError:
+    igzip = None
 
-def create_archive(archive_path, files, fmt):
+# Deflate level: 1 is ~3x faster than zlib's default 6 for a few % larger output
+DEFAULT_LEVEL = 1
+ISAL_MAX_LEVEL = 3
+
+# zlib releases the GIL, so zip entries are deflated on a thread pool;
+# files above this size stream through ZipFile.write instead of memory
+WORKERS = os.cpu_count() or 1
+PARALLEL_MAX_BYTES = 64 * 1024 * 1024
+# Input bytes submitted to the pool but not yet written to the archive
+PARALLEL_WINDOW_BYTES = 256 * 1024 * 1024
+
+# Formats that are already compressed; deflating them again burns CPU for
+# next to no saving, so they are stored as-is.
+PRECOMPRESSED = frozenset({
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".avif",
+    ".mp3", ".m4a", ".aac", ".ogg", ".flac", ".opus",
+    ".mp4", ".m4v", ".mov", ".mkv", ".webm", ".avi",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".br", ".zst",
+    ".docx", ".xlsx", ".pptx", ".jar", ".apk", ".pdf",
+})
+
+
+def is_precompressed(path):
+    return os.path.splitext(path)[1].lower() in PRECOMPRESSED
+
+
+def compress_type(path):
+    """ZIP_STORED for already-compressed files, ZIP_DEFLATED otherwise."""
+    return zipfile.ZIP_STORED if is_precompressed(path) else zipfile.ZIP_DEFLATED
+
+
+def _zip_entries(files):
+    """(filepath, arcname) for every file to archive, in walk order."""
+    for path in files:
+        if os.path.isdir(path):
+            for root, dirs, filenames in os.walk(path):
+                for filename in filenames:
+                    filepath = os.path.join(root, filename)
+                    yield filepath, os.path.relpath(filepath, os.path.dirname(path))
+        else:
+            yield path, os.path.basename(path)
+
+
+def _deflate(filepath, level):
+    """Raw deflate stream, CRC-32 and size of a file's contents."""
+    with open(filepath, "rb") as f:
+        data = f.read()
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    payload = compressor.compress(data) + compressor.flush()
+    return payload, zlib.crc32(data), len(data)
+
+
+def _write_deflated(zf, zinfo, payload):
+    """Append an entry whose deflate stream was produced off the writer thread.
+
+    Does what ZipFile.open(zinfo, "w") does, minus the compression.
+    """
+    zf.fp.seek(zf.start_dir)
+    zinfo.header_offset = zf.fp.tell()
+    zf._writecheck(zinfo)
+    zf._didModify = True
+    zf.fp.write(zinfo.FileHeader())
+    zf.fp.write(payload)
+    zf.start_dir = zf.fp.tell()
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def _write_zip_entry(zf, filepath, arcname, job):
+    if job is None:
+        zf.write(filepath, arcname, compress_type(filepath))
+        return
+    payload, crc, size = job.result()
+    zinfo = zipfile.ZipInfo.from_file(filepath, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = crc
+    zinfo.file_size = size
+    zinfo.compress_size = len(payload)
+    _write_deflated(zf, zinfo, payload)
+
+
+@contextlib.contextmanager
+def open_tar_gz(archive_path, level):
+    """Open a tar.gz for writing, compressing with pigz or ISA-L when available."""
+    pigz = shutil.which("pigz")
+    if pigz:
+        # tarfile builds the stream; pigz deflates it on every core
+        with open(archive_path, "wb") as out:
+            proc = subprocess.Popen(
+                [pigz, "-p", str(WORKERS), f"-{level}", "-c"],
+                stdin=subprocess.PIPE, stdout=out,
+            )
+            try:
+                with tarfile.open(fileobj=proc.stdin, mode="w|") as tf:
+                    yield tf
+            except BrokenPipeError:
+                pass  # pigz went away; reported from its exit status below
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+                returncode = proc.wait()
+        if returncode != 0:
+            print(f"Error: pigz exited with status {returncode}", file=sys.stderr)
+            sys.exit(1)
+        return
+    if igzip is None:
+        with tarfile.open(archive_path, "w:gz", compresslevel=level) as tf:
+            yield tf
+        return
+    with igzip.open(archive_path, "wb", compresslevel=min(level, ISAL_MAX_LEVEL)) as gz:
+        with tarfile.open(fileobj=gz, mode="w") as tf:
+            yield tf
+
+
+def create_archive(archive_path, files, fmt, level=DEFAULT_LEVEL):
     """Create a ZIP or tar.gz archive from the given files/directories."""
     if not files:
         print("Error: No files specified to archive", file=sys.stderr)
@@ -31,28 +159,52 @@ def create_archive(archive_path, files, fmt):
     total_files = 0
 
     if fmt == "zip":
-        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for path in files:
-                if os.path.isdir(path):
-                    for root, dirs, filenames in os.walk(path):
-                        for filename in filenames:
-                            filepath = os.path.join(root, filename)
-                            arcname = os.path.relpath(filepath, os.path.dirname(path))
-                            zf.write(filepath, arcname)
-                            total_files += 1
-                else:
-                    zf.write(path, os.path.basename(path))
-                    total_files += 1
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED, compresslevel=level) as zf, \
+                ThreadPoolExecutor(WORKERS) as pool:
+            # Entries are written in order; a window bounded by entry count
+            # and by queued bytes keeps the pool busy without holding every
+            # compressed file in memory
+            pending = collections.deque()
+            queued_bytes = 0
+
+            def write_oldest():
+                nonlocal queued_bytes
+                filepath, arcname, job, size = pending.popleft()
+                _write_zip_entry(zf, filepath, arcname, job)
+                queued_bytes -= size
+
+            for filepath, arcname in _zip_entries(files):
+                job = None
+                size = 0
+                if compress_type(filepath) == zipfile.ZIP_DEFLATED \
+                        and os.path.getsize(filepath) <= PARALLEL_MAX_BYTES:
+                    size = os.path.getsize(filepath)
+                    while pending and queued_bytes + size > PARALLEL_WINDOW_BYTES:
+                        write_oldest()
+                    job = pool.submit(_deflate, filepath, level)
+                    queued_bytes += size
+                pending.append((filepath, arcname, job, size))
+                if len(pending) > WORKERS * 2:
+                    write_oldest()
+                total_files += 1
+            while pending:
+                write_oldest()
     elif fmt == "tar.gz":
-        with tarfile.open(archive_path, "w:gz") as tf:
+        # gzip level 0 still produces a valid .tar.gz, without the deflate
+        # work, when every input is a single already-compressed file
+        if all(os.path.isfile(f) and is_precompressed(f) for f in files):
+            level = 0
+
+        def count_files(tarinfo):
+            # tf.add already walks directories; count as it goes
+            nonlocal total_files
+            if not tarinfo.isdir():
+                total_files += 1
+            return tarinfo
+
+        with open_tar_gz(archive_path, level) as tf:
             for path in files:
-                if os.path.isdir(path):
-                    tf.add(path, arcname=os.path.basename(path))
-                    for root, dirs, filenames in os.walk(path):
-                        total_files += len(filenames)
-                else:
-                    tf.add(path, arcname=os.path.basename(path))
-                    total_files += 1
+                tf.add(path, arcname=os.path.basename(path), filter=count_files)
     else:
         print(f"Error: Unknown format '{fmt}'. Use 'zip' or 'tar.gz'.", file=sys.stderr)
         sys.exit(1)
@@ -70,15 +222,21 @@ def extract_archive(archive_path, target_dir):
     os.makedirs(target_dir, exist_ok=True)
 
     if zipfile.is_zipfile(archive_path):
+        count = 0
         with zipfile.ZipFile(archive_path, "r") as zf:
-            zf.extractall(target_dir)
-            count = len(zf.namelist())
+            for info in zf.infolist():
+                zf.extract(info, target_dir)
+                count += 1
         print(f"Extracted {count} items from {archive_path} to {target_dir}")
 
     elif tarfile.is_tarfile(archive_path):
+        count = 0
         with tarfile.open(archive_path, "r:*") as tf:
-            tf.extractall(target_dir, filter="data")
-            count = len(tf.getmembers())
+            # Iterating reads members as it goes instead of indexing the
+            # whole archive before extracting anything
+            for member in tf:
+                tf.extract(member, target_dir, filter="data")
+                count += 1
         print(f"Extracted {count} items from {archive_path} to {target_dir}")
 
     else:
@@ -138,6 +296,10 @@ def main():
         choices=["zip", "tar.gz"],
         help="Archive format (auto-detected from extension if omitted)"
     )
+    create_parser.add_argument(
+        "--level", "-l", type=int, default=DEFAULT_LEVEL, choices=range(10), metavar="0-9",
+        help=f"Compression level, 0 (none) to 9 (smallest) (default: {DEFAULT_LEVEL})"
+    )
 
     # extract
     extract_parser = subparsers.add_parser("extract", help="Extract an archive")
@@ -161,7 +323,7 @@ def main():
                 fmt = "tar.gz"
             else:
                 fmt = "zip"
-        create_archive(args.archive_path, args.files, fmt)
+        create_archive(args.archive_path, args.files, fmt, args.level)
 
     elif args.action == "extract":
         extract_archive(args.archive_path, args.target)
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Image processing: resize, compress, convert, crop, info, and rotate.
-Uses Pillow (auto-installed if missing).
+Uses Pillow (auto-installed if missing; set PHPBOT_PILLOW_SIMD=1 to try
+Pillow-SIMD first).
 
 Usage:
     process.py resize <input> --width W [--height H] --output <path>
@@ -10,12 +11,41 @@ Usage:
     process.py crop <input> --box left,top,right,bottom --output <path>
     process.py info <input>
     process.py rotate <input> --angle degrees --output <path>
+    process.py batch [--workers N] < jobs.jsonl
+    process.py --simd-check
 """
 
 import sys
 import os
 import subprocess
 import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Wheels for auto-installed packages, so installs in fresh environments skip PyPI
+WHEEL_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "phpbot", "wheels")
+
+
+def pip_install(package):
+    """pip install a package, from the local wheel cache when it has it."""
+    def pip(*args):
+        return subprocess.run(
+            [sys.executable, "-m", "pip", *args, "-q"],
+            capture_output=True, text=True,
+        )
+
+    offline = ["install", "--no-index", "--find-links", WHEEL_CACHE, package]
+    if os.path.isdir(WHEEL_CACHE):
+        result = pip(*offline)
+        if result.returncode == 0:
+            return result
+    # Build wheels for the package and its dependencies once, then install from them
+    if pip("wheel", "--wheel-dir", WHEEL_CACHE, package).returncode == 0:
+        result = pip(*offline)
+        if result.returncode == 0:
+            return result
+    return pip("install", package)
 
 
 def ensure_pillow():
@@ -24,19 +54,60 @@ def ensure_pillow():
         from PIL import Image  # noqa: F401
         return True
     except ImportError:
-        print("Installing Pillow...", file=sys.stderr)
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "Pillow", "-q"],
-            capture_output=True, text=True,
-        )
-        if result.returncode != 0:
-            print(f"Failed to install Pillow: {result.stderr}", file=sys.stderr)
-            return False
-        print("Pillow installed.", file=sys.stderr)
-        return True
+        pass
+
+    # Pillow-SIMD (SSE4/AVX2 resampling) builds from source, so it is opt-in
+    packages = ["Pillow"]
+    if os.environ.get("PHPBOT_PILLOW_SIMD"):
+        packages.insert(0, "pillow-simd")
 
+    for package in packages:
+        print(f"Installing {package}...", file=sys.stderr)
+        result = pip_install(package)
+        if result.returncode == 0:
+            print(f"{package} installed.", file=sys.stderr)
+            return True
+        print(f"Failed to install {package}: {result.stderr}", file=sys.stderr)
+    return False
 
-def save_image(img, output_path, quality=85):
+
+class SimdCheckAction(argparse.Action):
+    """--simd-check: report which Pillow build and codecs are loaded, then exit."""
+
+    def __init__(self, option_strings, dest, **kwargs):
+        super().__init__(option_strings, dest, nargs=0, default=argparse.SUPPRESS, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if not ensure_pillow():
+            sys.exit(1)
+        import PIL
+        from PIL import features
+
+        # Pillow-SIMD releases carry a .postN suffix
+        flavour = "Pillow-SIMD" if ".post" in PIL.__version__ else "Pillow"
+        print(f"{flavour} {PIL.__version__}")
+        print(f"libjpeg-turbo: {'yes' if features.check_feature('libjpeg_turbo') else 'no'}")
+        print()
+        features.pilinfo(supported_formats=False)
+        parser.exit()
+
+
+# libwebp's method trades encode speed for size: 0 is fastest, 6 smallest
+WEBP_METHOD = 4
+WEBP_BEST_METHOD = 6
+# AVIF encoder speed: 0 is slowest/smallest, 10 fastest
+AVIF_SPEED = 8
+AVIF_BEST_SPEED = 4
+
+
+def encoder_options(args):
+    """save_image keyword arguments for the --webp-method/--best flags."""
+    if args.best:
+        return {"webp_method": WEBP_BEST_METHOD, "avif_speed": AVIF_BEST_SPEED}
+    return {"webp_method": args.webp_method, "avif_speed": AVIF_SPEED}
+
+
+def save_image(img, output_path, quality=85, webp_method=WEBP_METHOD, avif_speed=AVIF_SPEED):
     """Save image with appropriate settings for the format."""
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
     ext = os.path.splitext(output_path)[1].lower()
@@ -49,6 +120,15 @@ def save_image(img, output_path, quality=85):
         save_kwargs["optimize"] = True
     elif ext == ".webp":
         save_kwargs["quality"] = quality
+        save_kwargs["method"] = webp_method
+    elif ext == ".avif":
+        try:
+            # Pillow < 11.2 needs the plugin to write AVIF
+            import pillow_avif  # noqa: F401
+        except ImportError:
+            pass
+        save_kwargs["quality"] = quality
+        save_kwargs["speed"] = avif_speed
     elif ext == ".png":
         save_kwargs["optimize"] = True
 
@@ -77,9 +157,14 @@ def cmd_resize(args):
         print("Error: Provide --width and/or --height", file=sys.stderr)
         sys.exit(1)
 
-    resized = img.resize((width, height), Image.LANCZOS)
+    if img.format == "JPEG" and width < orig_w and height < orig_h:
+        # Let libjpeg scale by 1/2, 1/4 or 1/8 while decoding (never below
+        # the target size), so LANCZOS only has to finish the last step
+        img.draft(img.mode, (width, height))
+
+    resized = img.resize((width, height), Image.Resampling.LANCZOS)
     output = args.output or f"resized_{os.path.basename(args.input)}"
-    save_image(resized, output)
+    save_image(resized, output, **encoder_options(args))
     print(f"Resized: {orig_w}x{orig_h} -> {width}x{height}")
 
 
@@ -92,7 +177,7 @@ def cmd_compress(args):
     quality = args.quality or 80
     output = args.output or f"compressed_{os.path.basename(args.input)}"
 
-    save_image(img, output, quality=quality)
+    save_image(img, output, quality=quality, **encoder_options(args))
     new_size = os.path.getsize(output)
     reduction = ((orig_size - new_size) / orig_size) * 100 if orig_size > 0 else 0
     print(f"Compressed: {orig_size:,} -> {new_size:,} bytes ({reduction:.1f}% reduction, quality={quality})")
@@ -111,11 +196,11 @@ def cmd_convert(args):
     else:
         base = os.path.splitext(args.input)[0]
         ext_map = {"jpeg": ".jpg", "jpg": ".jpg", "png": ".png", "webp": ".webp",
-                    "gif": ".gif", "bmp": ".bmp", "tiff": ".tiff"}
+                    "avif": ".avif", "gif": ".gif", "bmp": ".bmp", "tiff": ".tiff"}
         ext = ext_map.get(fmt, f".{fmt}")
         output = f"{base}{ext}"
 
-    save_image(img, output)
+    save_image(img, output, **encoder_options(args))
     print(f"Converted: {args.input} -> {output} (format: {fmt})")
 
 
@@ -139,16 +224,28 @@ def cmd_crop(args):
 
     cropped = img.crop((left, top, right, bottom))
     output = args.output or f"cropped_{os.path.basename(args.input)}"
-    save_image(cropped, output)
+    save_image(cropped, output, **encoder_options(args))
     print(f"Cropped: ({left},{top}) to ({right},{bottom}) = {cropped.width}x{cropped.height}")
 
 
+# Pillow format names by extension, so info can skip probing every plugin
+FORMAT_BY_EXT = {
+    ".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG", ".webp": "WEBP", ".gif": "GIF",
+    ".bmp": "BMP", ".tif": "TIFF", ".tiff": "TIFF", ".avif": "AVIF",
+}
+
+
 def cmd_info(args):
     """Show image information."""
-    from PIL import Image
-    from PIL.ExifTags import TAGS
+    from PIL import Image, UnidentifiedImageError
+    from PIL.ExifTags import IFD, TAGS
 
-    img = Image.open(args.input)
+    # Image.open only parses the header; nothing below touches pixel data
+    guess = FORMAT_BY_EXT.get(os.path.splitext(args.input)[1].lower())
+    try:
+        img = Image.open(args.input, formats=[guess] if guess else None)
+    except UnidentifiedImageError:
+        img = Image.open(args.input)
     file_size = os.path.getsize(args.input)
 
     print(f"File: {args.input}")
@@ -162,17 +259,21 @@ def cmd_info(args):
 
     # EXIF data
     try:
-        exif = img._getexif()
-        if exif:
+        exif = img.getexif()
+        tags = dict(exif)
+        tags.update(exif.get_ifd(IFD.Exif))
+        if IFD.GPSInfo in tags:
+            tags[IFD.GPSInfo] = exif.get_ifd(IFD.GPSInfo)
+        if tags:
             print("\nEXIF data:")
-            for tag_id, value in exif.items():
+            for tag_id, value in tags.items():
                 tag = TAGS.get(tag_id, tag_id)
                 if isinstance(value, bytes):
                     value = f"<{len(value)} bytes>"
                 elif isinstance(value, str) and len(value) > 100:
                     value = value[:100] + "..."
                 print(f"  {tag}: {value}")
-    except (AttributeError, Exception):
+    except Exception:
         pass
 
 
@@ -183,37 +284,134 @@ def cmd_rotate(args):
     img = Image.open(args.input)
     angle = args.angle or 90
 
-    rotated = img.rotate(angle, expand=True)
+    quarter_turns = {
+        90: Image.Transpose.ROTATE_90,
+        180: Image.Transpose.ROTATE_180,
+        270: Image.Transpose.ROTATE_270,
+    }
+    if angle % 360 == 0:
+        rotated = img
+    elif angle % 360 in quarter_turns:
+        # Lossless pixel shuffle, no resampling
+        rotated = img.transpose(quarter_turns[angle % 360])
+    else:
+        rotated = img.rotate(angle, expand=True, resample=Image.Resampling.BICUBIC)
     output = args.output or f"rotated_{os.path.basename(args.input)}"
-    save_image(rotated, output)
+    save_image(rotated, output, **encoder_options(args))
     print(f"Rotated: {angle} degrees")
 
 
+def resolve_input(args):
+    """Expand and absolutize args.input; False if the file doesn't exist."""
+    args.input = os.path.abspath(os.path.expanduser(args.input))
+    if not os.path.exists(args.input):
+        print(f"Error: File not found: {args.input}", file=sys.stderr)
+        return False
+    return True
+
+
+def job_argv(job):
+    """Command-line arguments for one batch job: {"op": ..., "input": ..., "width": 800}."""
+    argv = [str(job.get("input", ""))]
+    for key, value in job.items():
+        if key in ("op", "input") or value is None or value is False:
+            continue
+        flag = "--" + key.replace("_", "-")
+        argv += [flag] if value is True else [flag, str(value)]
+    return argv
+
+
+def run_job(op_parsers, line_no, job):
+    """Run one batch job; returns an error message or None."""
+    op = job.get("op")
+    if op not in ACTIONS:
+        return f"line {line_no}: unknown op {op!r}"
+    try:
+        # Parse through the op's own subparser for its defaults and validation
+        job_args = op_parsers[op].parse_args(job_argv(job))
+        if not resolve_input(job_args):
+            return f"line {line_no}: input not found"
+        ACTIONS[op](job_args)
+    except SystemExit:
+        return f"line {line_no}: {op} failed"
+    except Exception as e:
+        return f"line {line_no}: {e}"
+    return None
+
+
+def cmd_batch(args):
+    """Run JSONL jobs from stdin on a thread pool (Pillow releases the GIL while coding)."""
+    jobs = []
+    errors = []
+    for line_no, line in enumerate(sys.stdin, 1):
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            errors.append(f"line {line_no}: invalid JSON ({e})")
+            continue
+        if not isinstance(job, dict):
+            errors.append(f"line {line_no}: expected a JSON object")
+            continue
+        jobs.append((line_no, job))
+    total = len(jobs) + len(errors)
+
+    with ThreadPoolExecutor(args.workers) as pool:
+        results = pool.map(lambda item: run_job(args.op_parsers, *item), jobs)
+        errors += [error for error in results if error]
+
+    for error in errors:
+        print(f"Error: {error}", file=sys.stderr)
+    print(f"Batch: {total - len(errors)} succeeded, {len(errors)} failed")
+    if errors:
+        sys.exit(1)
+
+
+ACTIONS = {
+    "resize": cmd_resize,
+    "compress": cmd_compress,
+    "convert": cmd_convert,
+    "crop": cmd_crop,
+    "info": cmd_info,
+    "rotate": cmd_rotate,
+}
+
+
 def main():
     parser = argparse.ArgumentParser(description="Image processing tools")
+    parser.add_argument("--simd-check", action=SimdCheckAction,
+                        help="Show the Pillow build and whether libjpeg-turbo is in use")
     subparsers = parser.add_subparsers(dest="action", required=True)
 
+    # Encoder settings shared by every command that writes an image
+    encode_p = argparse.ArgumentParser(add_help=False)
+    encode_p.add_argument("--webp-method", type=int, choices=range(7), default=WEBP_METHOD, metavar="0-6",
+                          help=f"WebP encoder effort, 0 fastest to 6 smallest (default: {WEBP_METHOD})")
+    encode_p.add_argument("--best", action="store_true",
+                          help="Smallest WebP/AVIF output at the cost of encode time")
+
     # resize
-    p = subparsers.add_parser("resize", help="Resize an image")
+    p = subparsers.add_parser("resize", help="Resize an image", parents=[encode_p])
     p.add_argument("input", help="Input image path")
     p.add_argument("--width", "-W", type=int, help="Target width")
     p.add_argument("--height", "-H", type=int, help="Target height")
     p.add_argument("--output", "-o", help="Output path")
 
     # compress
-    p = subparsers.add_parser("compress", help="Compress an image")
+    p = subparsers.add_parser("compress", help="Compress an image", parents=[encode_p])
     p.add_argument("input", help="Input image path")
     p.add_argument("--quality", "-q", type=int, default=80, help="Quality 1-100 (default: 80)")
     p.add_argument("--output", "-o", help="Output path")
 
     # convert
-    p = subparsers.add_parser("convert", help="Convert image format")
+    p = subparsers.add_parser("convert", help="Convert image format", parents=[encode_p])
     p.add_argument("input", help="Input image path")
-    p.add_argument("--format", "-f", required=True, help="Target format (jpg, png, webp, gif, bmp, tiff)")
+    p.add_argument("--format", "-f", required=True, help="Target format (jpg, png, webp, avif, gif, bmp, tiff)")
     p.add_argument("--output", "-o", help="Output path")
 
     # crop
-    p = subparsers.add_parser("crop", help="Crop an image")
+    p = subparsers.add_parser("crop", help="Crop an image", parents=[encode_p])
     p.add_argument("input", help="Input image path")
     p.add_argument("--box", "-b", required=True, help="Crop box: left,top,right,bottom")
     p.add_argument("--output", "-o", help="Output path")
@@ -223,32 +421,31 @@ def main():
     p.add_argument("input", help="Input image path")
 
     # rotate
-    p = subparsers.add_parser("rotate", help="Rotate an image")
+    p = subparsers.add_parser("rotate", help="Rotate an image", parents=[encode_p])
     p.add_argument("input", help="Input image path")
     p.add_argument("--angle", "-a", type=float, default=90, help="Rotation angle in degrees (default: 90)")
     p.add_argument("--output", "-o", help="Output path")
 
+    # batch
+    p = subparsers.add_parser("batch", help="Run JSONL jobs from stdin, e.g. "
+                              '{"op": "resize", "input": "a.jpg", "width": 800, "output": "b.jpg"}')
+    p.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 1,
+                   help="Parallel jobs (default: CPU count)")
+    p.set_defaults(op_parsers=dict(subparsers.choices))
+
     args = parser.parse_args()
 
     # Validate input file exists (except for info which gives a better error)
-    input_path = os.path.expanduser(args.input)
-    args.input = os.path.abspath(input_path)
-    if not os.path.exists(args.input):
-        print(f"Error: File not found: {args.input}", file=sys.stderr)
+    if args.action != "batch" and not resolve_input(args):
         sys.exit(1)
 
     if not ensure_pillow():
         sys.exit(1)
 
-    actions = {
-        "resize": cmd_resize,
-        "compress": cmd_compress,
-        "convert": cmd_convert,
-        "crop": cmd_crop,
-        "info": cmd_info,
-        "rotate": cmd_rotate,
-    }
-    actions[args.action](args)
+    if args.action == "batch":
+        cmd_batch(args)
+    else:
+        ACTIONS[args.action](args)
 
 
 if __name__ == "__main__":
@@ -6,43 +6,63 @@ https://github.com/microsoft/markitdown
 Supports: PDF, DOCX, PPTX, XLSX, HTML, Images, Audio, CSV, JSON, XML, ZIP, EPub, and more.
 
 Usage:
-    python3 convert.py <file_path> [-o output_path] [-v]
+    python3 convert.py <file_path> [-o output_path] [-v] [--no-content]
+    python3 convert.py --batch <dir> [--recursive] [--types pdf,docx] [--output-dir dir] [--workers N]
 """
 
+import importlib.util
 import sys
 import os
 import subprocess
 import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+
+def is_installed(module):
+    """Whether module can be imported, without importing it."""
+    return importlib.util.find_spec(module) is not None
 
 
 def ensure_markitdown():
     """Install markitdown if not already available."""
-    try:
-        import markitdown  # noqa: F401
-        return True
-    except ImportError:
-        print("Installing markitdown[all]...", file=sys.stderr)
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "markitdown[all]", "-q"],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            print(f"Failed to install markitdown: {result.stderr}", file=sys.stderr)
-            return False
-        print("markitdown installed successfully.", file=sys.stderr)
+    if is_installed("markitdown"):
         return True
+    print("Installing markitdown[all]...", file=sys.stderr)
+    result = subprocess.run(
+        [sys.executable, "-m", "pip", "install", "markitdown[all]", "-q"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(f"Failed to install markitdown: {result.stderr}", file=sys.stderr)
+        return False
+    print("markitdown installed successfully.", file=sys.stderr)
+    return True
+
 
+_MD = None
 
-def convert_file(file_path: str, verbose: bool = False) -> str:
-    """Convert a file to Markdown and return the text content."""
-    from markitdown import MarkItDown
 
+def get_markitdown():
+    """The process-wide MarkItDown instance, created on first use."""
+    global _MD
+    if _MD is None:
+        from markitdown import MarkItDown
+        _MD = MarkItDown(enable_plugins=False)
+    return _MD
+
+
+def convert_file(file_path: str, verbose: bool = False, output_file=None):
+    """Convert a file to Markdown and return the text content.
+
+    When output_file (a text handle) is given, the Markdown is written to it
+    piece by piece instead and None is returned.
+    """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    md = MarkItDown(enable_plugins=False)
-    result = md.convert(file_path)
+    result = get_markitdown().convert(file_path)
 
     output_parts = []
 
@@ -51,16 +71,103 @@ def convert_file(file_path: str, verbose: bool = False) -> str:
         output_parts.append(f"<!-- Size: {os.path.getsize(file_path)} bytes -->")
         output_parts.append("")
 
+    if output_file is not None:
+        for part in output_parts:
+            output_file.write(part + "\n")
+        output_file.write(result.text_content)
+        return None
+
     output_parts.append(result.text_content)
 
     return "\n".join(output_parts)
 
 
+# Large buffer for Markdown written straight to disk
+WRITE_BUFFER = 1 << 20
+
+
+def remove_partial(output_path: str):
+    """Drop a half-written output file after a failed conversion."""
+    try:
+        os.remove(output_path)
+    except OSError:
+        pass
+
+
+def find_batch_files(root: str, recursive: bool = False, types=None, exclude=None):
+    """Files under root to convert, optionally limited to some extensions."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if not d.startswith(".") and os.path.join(dirpath, d) != exclude
+        )
+        for filename in sorted(filenames):
+            if filename.startswith("."):
+                continue
+            ext = os.path.splitext(filename)[1].lower().lstrip(".")
+            if types and ext not in types:
+                continue
+            yield os.path.join(dirpath, filename)
+        if not recursive:
+            break
+
+
+def convert_to_file(task) -> str:
+    """Convert one (file_path, output_path, verbose) task; returns an error message or None.
+
+    Runs in batch workers, so the Markdown is written there rather than
+    being shipped back to the parent process.
+    """
+    file_path, output_path, verbose = task
+    try:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            convert_file(file_path, verbose=verbose, output_file=f)
+    except Exception as e:
+        remove_partial(output_path)
+        return str(e)
+    return None
+
+
+def convert_batch(root: str, output_dir: str, recursive: bool = False, types=None,
+                  verbose: bool = False, workers: int = 1) -> int:
+    """Convert every matching file under root into output_dir; returns the failure count."""
+    tasks = [
+        # Keep the source extension so report.pdf and report.docx don't collide
+        (file_path, os.path.join(output_dir, os.path.relpath(file_path, root) + ".md"), verbose)
+        for file_path in find_batch_files(root, recursive, types, exclude=output_dir)
+    ]
+
+    if workers > 1 and len(tasks) > 1:
+        # Each worker builds its MarkItDown once and keeps the parsers warm
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=get_markitdown)
+        chunksize = 4 if len(tasks) >= workers * 8 else 1
+        results = pool.map(convert_to_file, tasks, chunksize=chunksize)
+    else:
+        pool = None
+        results = map(convert_to_file, tasks)
+
+    failed = 0
+    try:
+        for (file_path, output_path, _), error in zip(tasks, results):
+            if error:
+                print(f"Error converting {file_path}: {error}", file=sys.stderr)
+                failed += 1
+            else:
+                print(f"Converted: {file_path} -> {output_path}", file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    print(f"Batch: {len(tasks) - failed} converted, {failed} failed", file=sys.stderr)
+    return failed
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convert any document to Markdown using MarkItDown"
     )
-    parser.add_argument("file_path", help="Path to the file to convert")
+    parser.add_argument("file_path", nargs="?", help="Path to the file to convert")
     parser.add_argument(
         "-o", "--output", help="Output file path (default: stdout)", default=None
     )
@@ -68,8 +175,45 @@ def main():
         "-v", "--verbose", action="store_true", help="Include metadata in output"
     )
 
+    parser.add_argument(
+        "--no-content", action="store_true",
+        help="Write to -o (default: <file_path>.md) and print only a JSON status line"
+    )
+    parser.add_argument(
+        "--batch", metavar="DIR", help="Convert every file in a directory, reusing one converter"
+    )
+    parser.add_argument(
+        "--recursive", "-r", action="store_true", help="With --batch, include subdirectories"
+    )
+    parser.add_argument(
+        "--types", help="With --batch, only these extensions (comma-separated, e.g. pdf,docx)"
+    )
+    parser.add_argument(
+        "--output-dir", help="With --batch, where to write .md files (default: <DIR>-markdown)"
+    )
+
+    parser.add_argument(
+        "--workers", "-j", type=int, default=os.cpu_count() or 1,
+        help="With --batch, parallel conversion processes (default: CPU count)"
+    )
+
     args = parser.parse_args()
 
+    if args.batch:
+        root = os.path.abspath(os.path.expanduser(args.batch))
+        if not os.path.isdir(root):
+            print(f"Error: Directory not found: {root}", file=sys.stderr)
+            sys.exit(1)
+        output_dir = os.path.abspath(os.path.expanduser(args.output_dir or root.rstrip(os.sep) + "-markdown"))
+        types = {t.strip().lower().lstrip(".") for t in args.types.split(",") if t.strip()} if args.types else None
+        if not ensure_markitdown():
+            sys.exit(1)
+        failed = convert_batch(root, output_dir, args.recursive, types, args.verbose, args.workers)
+        sys.exit(1 if failed else 0)
+
+    if not args.file_path:
+        parser.error("file_path is required unless --batch is given")
+
     # Resolve file path
     file_path = os.path.expanduser(args.file_path)
     file_path = os.path.abspath(file_path)
@@ -82,22 +226,35 @@ def main():
     if not ensure_markitdown():
         sys.exit(1)
 
+    if args.output or args.no_content:
+        output_path = os.path.expanduser(args.output) if args.output else file_path + ".md"
+        output_path = os.path.abspath(output_path)
+        try:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            # Stream straight to disk; the document is never joined into one string
+            with open(output_path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+                convert_file(file_path, verbose=args.verbose, output_file=f)
+        except Exception as e:
+            remove_partial(output_path)
+            if args.no_content:
+                print(json.dumps({"path": output_path, "status": "error", "error": str(e)}))
+            else:
+                print(f"Error converting file: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        if args.no_content:
+            print(json.dumps({"path": output_path, "size": os.path.getsize(output_path), "status": "ok"}))
+        else:
+            print(f"Markdown written to: {output_path}", file=sys.stderr)
+        return
+
     try:
         markdown_content = convert_file(file_path, verbose=args.verbose)
     except Exception as e:
         print(f"Error converting file: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Output
-    if args.output:
-        output_path = os.path.expanduser(args.output)
-        output_path = os.path.abspath(output_path)
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
-        print(f"Markdown written to: {output_path}", file=sys.stderr)
-    else:
-        print(markdown_content)
+    print(markdown_content)
 
 
 if __name__ == "__main__":
@@ -4,25 +4,27 @@ Generate QR codes as PNG images.
 
 Usage:
     generate.py <content> [--output path] [--size pixels] [--color color] [--bg color]
+    generate.py --batch codes.tsv [--workers N] [--size pixels] [--color color] [--bg color]
 """
 
+import importlib.util
 import sys
 import os
 import subprocess
 import argparse
+import struct
+import zlib
+
+
+def is_installed(module):
+    """Whether module can be imported, without importing it."""
+    return importlib.util.find_spec(module) is not None
 
 
 def ensure_dependencies():
     """Install qrcode and Pillow if not available."""
-    missing = []
-    try:
-        import qrcode  # noqa: F401
-    except ImportError:
-        missing.append("qrcode")
-    try:
-        from PIL import Image  # noqa: F401
-    except ImportError:
-        missing.append("Pillow")
+    packages = {"qrcode": "qrcode", "Pillow": "PIL"}
+    missing = [pkg for pkg, module in packages.items() if not is_installed(module)]
 
     if missing:
         print(f"Installing {', '.join(missing)}...", file=sys.stderr)
@@ -37,43 +39,187 @@ def ensure_dependencies():
     return True
 
 
-def generate_qr(content, output_path, box_size=10, fill_color="black", back_color="white"):
-    """Generate a QR code and save as PNG."""
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _write_monochrome_png(matrix, path, module_size):
+    """Write a black-on-white QR matrix as a 1-bit greyscale PNG without Pillow."""
+    n = len(matrix)
+    width = n * module_size
+    pad = -width % 8
+    white = "1" * module_size
+    black = "0" * module_size
+
+    scanlines = []
+    for row in matrix:
+        bits = "".join(black if cell else white for cell in row) + "0" * pad
+        # Filter type 0 (None), then the packed pixels; each row repeats module_size times
+        scanline = b"\x00" + int(bits, 2).to_bytes((width + pad) // 8, "big")
+        scanlines.append(scanline * module_size)
+
+    ihdr = struct.pack(">IIBBBBB", width, width, 1, 0, 0, 0, 0)
+    with open(path, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        f.write(_png_chunk(b"IHDR", ihdr))
+        f.write(_png_chunk(b"IDAT", zlib.compress(b"".join(scanlines), 9)))
+        f.write(_png_chunk(b"IEND", b""))
+    return width, width
+
+
+def is_monochrome(fill_color, back_color):
+    return (isinstance(fill_color, str) and fill_color.lower() == "black"
+            and isinstance(back_color, str) and back_color.lower() == "white")
+
+
+def render_matrix(matrix, box_size, fill_color="black", back_color="white"):
+    """Render a QR module matrix (border included) to a two-colour image.
+
+    Builds the image at one pixel per module and scales it up with a
+    nearest-neighbour resize, instead of drawing each module separately.
+    """
+    from PIL import Image, ImageColor
+
+    n = len(matrix)
+    dark = fill_color.lower() if isinstance(fill_color, str) else fill_color
+    light = back_color.lower() if isinstance(back_color, str) else back_color
+
+    if is_monochrome(dark, light):
+        data = bytes(0 if cell else 255 for row in matrix for cell in row)
+        img = Image.frombytes("L", (n, n), data).convert("1", dither=Image.Dither.NONE)
+    else:
+        # Palette index 0 is the background, 1 the modules
+        data = bytes(1 if cell else 0 for row in matrix for cell in row)
+        img = Image.frombytes("P", (n, n), data)
+        back_rgb = (0, 0, 0) if light == "transparent" else ImageColor.getrgb(light)[:3]
+        img.putpalette(back_rgb + ImageColor.getrgb(dark)[:3])
+        if light == "transparent":
+            img.info["transparency"] = 0
+
+    return img.resize((n * box_size, n * box_size), Image.Resampling.NEAREST)
+
+
+# Per-process QRCode, reset between codes in batch mode
+_QR = None
+
+
+def new_qr(box_size=10):
     import qrcode
 
-    qr = qrcode.QRCode(
+    return qrcode.QRCode(
         version=None,  # Auto-determine
         error_correction=qrcode.constants.ERROR_CORRECT_H,
         box_size=box_size,
         border=4,
     )
+
+
+def save_qr(qr, content, output_path, box_size, fill_color, back_color):
+    """Encode content with qr and write the PNG; returns (width, height)."""
     qr.add_data(content)
     qr.make(fit=True)
 
-    img = qr.make_image(fill_color=fill_color, back_color=back_color)
-
+    matrix = qr.get_matrix()
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-    img.save(output_path)
+
+    if is_monochrome(fill_color, back_color):
+        return _write_monochrome_png(matrix, output_path, box_size)
+    img = render_matrix(matrix, box_size, fill_color, back_color)
+    img.save(output_path, optimize=True, bits=1)
+    return img.size
+
+
+def generate_qr(content, output_path, box_size=10, fill_color="black", back_color="white"):
+    """Generate a QR code and save as PNG."""
+    width, height = save_qr(new_qr(box_size), content, output_path, box_size, fill_color, back_color)
 
     size = os.path.getsize(output_path)
-    width, height = img.size
     print(f"QR code saved: {output_path} ({width}x{height}px, {size:,} bytes)")
     print(f"Content: {content[:100]}{'...' if len(content) > 100 else ''}")
 
 
+def _make_one(job):
+    """Batch worker: returns an error message or None."""
+    global _QR
+    line_no, content, output_path, box_size, fill_color, back_color = job
+    if _QR is None:
+        _QR = new_qr(box_size)
+    # clear() keeps the fitted version, which would stop smaller codes shrinking
+    _QR.clear()
+    _QR.version = None
+    try:
+        save_qr(_QR, content, output_path, box_size, fill_color, back_color)
+    except Exception as e:
+        return f"line {line_no}: {e}"
+    return None
+
+
+def read_batch(path):
+    """Read (line_no, content, output_path) from a content<TAB>path file."""
+    jobs, errors = [], []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            content, sep, output_path = line.rpartition("\t")
+            if not sep or not content or not output_path.strip():
+                errors.append(f"line {line_no}: expected content<TAB>output path")
+                continue
+            output_path = os.path.abspath(os.path.expanduser(output_path.strip()))
+            jobs.append((line_no, content, output_path))
+    return jobs, errors
+
+
+def generate_batch(path, box_size, fill_color, back_color, workers=None):
+    """Generate every code listed in a TSV file across a process pool."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs, errors = read_batch(path)
+    total = len(jobs) + len(errors)
+    jobs = [job + (box_size, fill_color, back_color) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        errors += [error for error in pool.map(_make_one, jobs, chunksize=32) if error]
+
+    for error in errors:
+        print(f"Error: {error}", file=sys.stderr)
+    print(f"Batch: {total - len(errors)} succeeded, {len(errors)} failed")
+    return not errors
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate QR codes as PNG images")
-    parser.add_argument("content", help="Text, URL, or data to encode")
+    parser.add_argument("content", nargs="?", help="Text, URL, or data to encode")
     parser.add_argument("--output", "-o", default="./qrcode.png", help="Output PNG path (default: ./qrcode.png)")
     parser.add_argument("--size", "-s", type=int, default=10, help="Box size in pixels (default: 10)")
     parser.add_argument("--color", "-c", default="black", help="QR code color (default: black)")
     parser.add_argument("--bg", default="white", help="Background color (default: white)")
+    parser.add_argument("--batch", "-b", metavar="FILE",
+                        help="Generate one code per line of a content<TAB>output path file")
+    parser.add_argument("--workers", "-j", type=int, default=None,
+                        help="Worker processes for --batch (default: CPU count)")
 
     args = parser.parse_args()
 
+    if args.batch is None and args.content is None:
+        parser.error("content is required unless --batch is given")
+
     if not ensure_dependencies():
         sys.exit(1)
 
+    if args.batch:
+        batch_path = os.path.abspath(os.path.expanduser(args.batch))
+        if not os.path.exists(batch_path):
+            print(f"Error: File not found: {batch_path}", file=sys.stderr)
+            sys.exit(1)
+        if not generate_batch(batch_path, args.size, args.color, args.bg, args.workers):
+            sys.exit(1)
+        return
+
     output_path = os.path.expanduser(args.output)
     output_path = os.path.abspath(output_path)
 
@@ -8,6 +8,7 @@ Credentials via environment variables:
 
 Usage:
     send.py --to <addr> --subject <subj> --body <body> [--attachment path] [--html] [--cc addr]
+    send.py --batch messages.jsonl [--concurrency N]
 """
 
 import sys
@@ -15,10 +16,14 @@ import os
 import argparse
 import smtplib
 import mimetypes
+import json
+import io
+import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
 
 
 def get_env(key, required=True, default=None):
@@ -34,9 +39,103 @@ def get_env(key, required=True, default=None):
     return value
 
 
-def send_email(smtp_host, smtp_port, smtp_user, smtp_pass, email_from,
-               to_addrs, cc_addrs, subject, body, is_html=False, attachment_path=None):
-    """Send an email via SMTP."""
+# Reconnect after this many messages; providers cap messages per connection
+MAX_MESSAGES_PER_CONNECTION = 5000
+# Check an idle connection with NOOP before reusing it
+NOOP_AFTER_SECONDS = 60
+
+
+class SMTPSession:
+    """One authenticated SMTP connection, reused for many messages.
+
+    Connects (TLS + login) lazily, reconnects if the server drops the
+    connection, and starts a fresh one every MAX_MESSAGES_PER_CONNECTION.
+    """
+
+    def __init__(self, smtp_host, smtp_port, smtp_user, smtp_pass, timeout=30):
+        self.host = smtp_host
+        self.port = int(smtp_port)
+        self.user = smtp_user
+        self.password = smtp_pass
+        self.timeout = timeout
+        self.server = None
+        self.sent = 0
+        self.last_used = 0.0
+
+    def connect(self):
+        self.close()
+        if self.port == 465:
+            # SSL
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            # STARTTLS (port 587 or other)
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+        server.login(self.user, self.password)
+        self.server = server
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self.server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _usable(self):
+        if self.server is None or self.sent >= MAX_MESSAGES_PER_CONNECTION:
+            return False
+        if time.monotonic() - self.last_used < NOOP_AFTER_SECONDS:
+            return True
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send(self, email_from, recipients, msg):
+        if not self._usable():
+            self.connect()
+        # send_message flattens straight to bytes; sendmail(msg.as_string())
+        # would build a str copy first and then encode it again
+        try:
+            self.server.send_message(msg, from_addr=email_from, to_addrs=recipients)
+        except smtplib.SMTPServerDisconnected:
+            self.connect()
+            self.server.send_message(msg, from_addr=email_from, to_addrs=recipients)
+        self.sent += 1
+        self.last_used = time.monotonic()
+
+
+# 57 input bytes make one 76-character base64 line
+BASE64_CHUNK = 57 * 1024
+
+
+def encode_file_base64(path):
+    """Base64 (MIME line-wrapped) of a file, encoded a chunk at a time.
+
+    Only the encoded text is held in memory, never the raw file as well.
+    """
+    out = io.StringIO()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(BASE64_CHUNK), b""):
+            out.write(base64.encodebytes(chunk).decode("ascii"))
+    return out.getvalue()
+
+
+def build_message(email_from, to_addrs, cc_addrs, subject, body, is_html=False, attachment_path=None):
+    """Build the MIME message; returns (message, all recipients)."""
 
     # Build the message
     msg = MIMEMultipart()
@@ -53,58 +152,127 @@ def send_email(smtp_host, smtp_port, smtp_user, smtp_pass, email_from,
     # Attachment
     if attachment_path:
         if not os.path.exists(attachment_path):
-            print(f"Error: Attachment not found: {attachment_path}", file=sys.stderr)
-            sys.exit(1)
+            raise FileNotFoundError(f"Attachment not found: {attachment_path}")
 
         mime_type, _ = mimetypes.guess_type(attachment_path)
         if mime_type is None:
             mime_type = "application/octet-stream"
         main_type, sub_type = mime_type.split("/", 1)
 
-        with open(attachment_path, "rb") as f:
-            attachment = MIMEBase(main_type, sub_type)
-            attachment.set_payload(f.read())
-            encoders.encode_base64(attachment)
-            attachment.add_header(
-                "Content-Disposition",
-                "attachment",
-                filename=os.path.basename(attachment_path),
-            )
-            msg.attach(attachment)
+        attachment = MIMEBase(main_type, sub_type)
+        attachment.set_payload(encode_file_base64(attachment_path))
+        attachment["Content-Transfer-Encoding"] = "base64"
+        attachment.add_header(
+            "Content-Disposition",
+            "attachment",
+            filename=os.path.basename(attachment_path),
+        )
+        msg.attach(attachment)
 
     # All recipients
     all_recipients = to_addrs + (cc_addrs or [])
+    return msg, all_recipients
 
-    # Send
-    port = int(smtp_port)
-    if port == 465:
-        # SSL
-        with smtplib.SMTP_SSL(smtp_host, port, timeout=30) as server:
-            server.login(smtp_user, smtp_pass)
-            server.sendmail(email_from, all_recipients, msg.as_string())
-    else:
-        # STARTTLS (port 587 or other)
-        with smtplib.SMTP(smtp_host, port, timeout=30) as server:
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-            server.login(smtp_user, smtp_pass)
-            server.sendmail(email_from, all_recipients, msg.as_string())
 
+def send_email(smtp_host, smtp_port, smtp_user, smtp_pass, email_from,
+               to_addrs, cc_addrs, subject, body, is_html=False, attachment_path=None):
+    """Send an email via SMTP."""
+    msg, all_recipients = build_message(
+        email_from, to_addrs, cc_addrs, subject, body, is_html, attachment_path,
+    )
+    with SMTPSession(smtp_host, smtp_port, smtp_user, smtp_pass) as session:
+        session.send(email_from, all_recipients, msg)
     return True
 
 
+def split_addrs(value):
+    """Recipients from a comma-separated string or a list."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [addr.strip() for addr in value if addr.strip()]
+
+
+def send_many(session, email_from, messages):
+    """Send (index, message dict) pairs over one session; yields (index, error or None).
+
+    Message dicts use the CLI's names: to, cc, subject, body, html, attachment.
+    Authentication failures are raised rather than reported per message.
+    """
+    for index, message in messages:
+        try:
+            to_addrs = split_addrs(message.get("to"))
+            if not to_addrs:
+                raise ValueError("no recipients")
+            attachment = message.get("attachment")
+            msg, recipients = build_message(
+                email_from, to_addrs, split_addrs(message.get("cc")),
+                message.get("subject", ""), message.get("body", ""),
+                is_html=bool(message.get("html")),
+                attachment_path=os.path.abspath(os.path.expanduser(attachment)) if attachment else None,
+            )
+            session.send(email_from, recipients, msg)
+        except smtplib.SMTPAuthenticationError:
+            raise
+        except Exception as e:
+            yield index, str(e)
+        else:
+            yield index, None
+
+
+def send_batch(credentials, email_from, messages, concurrency=1):
+    """Send messages over `concurrency` parallel sessions; returns {index: error or None}."""
+    # Round-robin so each connection gets an even share
+    shares = [messages[i::concurrency] for i in range(concurrency)]
+
+    def run(share):
+        with SMTPSession(*credentials) as session:
+            return list(send_many(session, email_from, share))
+
+    results = {}
+    with ThreadPoolExecutor(concurrency) as pool:
+        for outcome in pool.map(run, [share for share in shares if share]):
+            results.update(outcome)
+    return results
+
+
+def load_batch(path):
+    """(line number, message dict) pairs from a JSONL file ("-" for stdin)."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        messages = []
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    raise ValueError(f"line {line_no}: expected a JSON object")
+                messages.append((line_no, message))
+        return messages
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Send email via SMTP")
-    parser.add_argument("--to", required=True, help="Recipient email(s), comma-separated")
-    parser.add_argument("--subject", "-s", required=True, help="Email subject")
-    parser.add_argument("--body", "-b", required=True, help="Email body")
+    parser.add_argument("--to", help="Recipient email(s), comma-separated")
+    parser.add_argument("--subject", "-s", help="Email subject")
+    parser.add_argument("--body", "-b", help="Email body")
     parser.add_argument("--attachment", "-a", help="File path to attach")
     parser.add_argument("--html", action="store_true", help="Send body as HTML")
     parser.add_argument("--cc", help="CC recipients, comma-separated")
+    parser.add_argument("--batch", metavar="JSONL",
+                        help='Send one message per line ({"to", "subject", "body", ...}; "-" for stdin) '
+                             "over a reused connection")
+    parser.add_argument("--concurrency", "-j", type=int, default=1,
+                        help="With --batch, parallel SMTP connections (default: 1)")
 
     args = parser.parse_args()
 
+    if not args.batch and not (args.to and args.subject and args.body):
+        parser.error("--to, --subject and --body are required unless --batch is given")
+
     # Get credentials from environment
     smtp_host = get_env("SMTP_HOST")
     smtp_port = get_env("SMTP_PORT", default="587")
@@ -112,9 +280,32 @@ def main():
     smtp_pass = get_env("SMTP_PASS")
     email_from = get_env("EMAIL_FROM", required=False, default=smtp_user)
 
+    if args.batch:
+        credentials = (smtp_host, smtp_port, smtp_user, smtp_pass)
+        try:
+            messages = load_batch(args.batch)
+            results = send_batch(credentials, email_from, messages, max(1, args.concurrency))
+        except smtplib.SMTPAuthenticationError:
+            print("Error: SMTP authentication failed. Check SMTP_USER and SMTP_PASS.", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        failed = 0
+        for line_no, message in messages:
+            error = results.get(line_no)
+            if error:
+                failed += 1
+                print(f"Error: line {line_no}: {error}", file=sys.stderr)
+            else:
+                print(f"Email sent successfully to: {', '.join(split_addrs(message.get('to')))}")
+        print(f"Batch: {len(messages) - failed} sent, {failed} failed")
+        sys.exit(1 if failed else 0)
+
     # Parse recipients
-    to_addrs = [addr.strip() for addr in args.to.split(",") if addr.strip()]
-    cc_addrs = [addr.strip() for addr in args.cc.split(",") if addr.strip()] if args.cc else []
+    to_addrs = split_addrs(args.to)
+    cc_addrs = split_addrs(args.cc)
 
     # Resolve attachment path
     attachment_path = None
@@ -5,33 +5,41 @@ Supports 100+ languages with no API key required.
 
 Usage:
     translate.py <text> --to <language> [--from <language>]
+    translate.py --batch lines.txt --to <language> [--from <language>]
 """
 
+import importlib.util
 import sys
+import os
 import subprocess
 import argparse
+import functools
+from types import MappingProxyType
+
+
+def is_installed(module):
+    """Whether module can be imported, without importing it."""
+    return importlib.util.find_spec(module) is not None
 
 
 def ensure_dependencies():
     """Install deep-translator if not available."""
-    try:
-        import deep_translator  # noqa: F401
-        return True
-    except ImportError:
-        print("Installing deep-translator...", file=sys.stderr)
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "deep-translator", "-q"],
-            capture_output=True, text=True,
-        )
-        if result.returncode != 0:
-            print(f"Failed to install deep-translator: {result.stderr}", file=sys.stderr)
-            return False
-        print("deep-translator installed.", file=sys.stderr)
+    if is_installed("deep_translator"):
         return True
+    print("Installing deep-translator...", file=sys.stderr)
+    result = subprocess.run(
+        [sys.executable, "-m", "pip", "install", "deep-translator", "-q"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"Failed to install deep-translator: {result.stderr}", file=sys.stderr)
+        return False
+    print("deep-translator installed.", file=sys.stderr)
+    return True
 
 
 # Common language name to code mapping
-LANGUAGE_ALIASES = {
+LANGUAGE_ALIASES = MappingProxyType({
     "chinese": "zh-CN", "mandarin": "zh-CN", "cantonese": "zh-TW",
     "japanese": "ja", "korean": "ko", "spanish": "es",
     "french": "fr", "german": "de", "italian": "it",
@@ -43,7 +51,10 @@ LANGUAGE_ALIASES = {
     "hebrew": "iw", "greek": "el", "czech": "cs",
     "romanian": "ro", "hungarian": "hu", "ukrainian": "uk",
     "english": "en",
-}
+})
+
+# GoogleTranslator rejects longer inputs
+MAX_CHARS = 5000
 
 
 def resolve_language(lang):
@@ -54,23 +65,75 @@ def resolve_language(lang):
     return LANGUAGE_ALIASES.get(lang_lower, lang_lower)
 
 
-def translate_text(text, source, target):
-    """Translate text and return the result."""
+@functools.lru_cache(maxsize=64)
+def _get_translator(source, target):
     from deep_translator import GoogleTranslator
 
-    translator = GoogleTranslator(source=source, target=target)
-    result = translator.translate(text)
-    return result
+    return GoogleTranslator(source=source, target=target)
+
+
+def translate_text(text, source, target):
+    """Translate text and return the result."""
+    return _get_translator(source, target).translate(text)
+
+
+def _chunks(texts, indices):
+    """Group texts[indices] into runs whose newline-joined length fits MAX_CHARS."""
+    chunk, length = [], 0
+    for i in indices:
+        size = len(texts[i]) + 1
+        if chunk and length + size > MAX_CHARS:
+            yield chunk
+            chunk, length = [], 0
+        chunk.append(i)
+        length += size
+    if chunk:
+        yield chunk
+
+
+def translate_batch(texts, source, target):
+    """Translate a list of texts, sending several per request where possible.
+
+    Single-line texts are joined with newlines so one request carries as many
+    as fit. A chunk whose line count does not survive translation is retried
+    one text at a time; multi-line texts are always sent alone.
+    """
+    results = list(texts)
+    packable = []
+    for i, text in enumerate(texts):
+        if not text.strip():
+            continue
+        if "\n" in text:
+            results[i] = translate_text(text, source, target)
+        else:
+            packable.append(i)
+
+    for chunk in _chunks(texts, packable):
+        if len(chunk) > 1:
+            joined = translate_text("\n".join(texts[i] for i in chunk), source, target)
+            lines = (joined or "").split("\n")
+            if len(lines) == len(chunk):
+                for i, line in zip(chunk, lines):
+                    results[i] = line
+                continue
+        for i in chunk:
+            results[i] = translate_text(texts[i], source, target)
+    return results
 
 
 def main():
     parser = argparse.ArgumentParser(description="Translate text between languages")
-    parser.add_argument("text", help="Text to translate")
+    parser.add_argument("text", nargs="?", help="Text to translate")
     parser.add_argument("--to", required=True, dest="target", help="Target language code or name")
     parser.add_argument("--from", dest="source", default=None, help="Source language (auto-detected if omitted)")
+    parser.add_argument("--batch", "-b", metavar="FILE",
+                        help="Translate each line of FILE ('-' for stdin), one result per line")
 
     args = parser.parse_args()
 
+    if args.batch is None and args.text is None:
+        parser.error("text is required unless --batch is given")
+
     if not ensure_dependencies():
         sys.exit(1)
 
@@ -78,6 +141,15 @@ def main():
     target = resolve_language(args.target)
 
     try:
+        if args.batch:
+            if args.batch == "-":
+                lines = sys.stdin.read().splitlines()
+            else:
+                with open(os.path.expanduser(args.batch), encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            print(f"Translation ({source} -> {target}):")
+            print("\n".join(translate_batch(lines, source, target)))
+            return
         result = translate_text(args.text, source, target)
         print(f"Translation ({source} -> {target}):")
         print(result)
@@ -1,29 +1,51 @@
 #!/usr/bin/env python3
 """
 Fetch a URL and extract clean readable content.
-Uses trafilatura for article extraction with requests as HTTP client.
+Uses trafilatura for article extraction with httpx as HTTP client.
 
 Usage:
     scrape.py <url> [--format markdown|text|html] [--output path] [--metadata]
+    scrape.py --batch urls.txt --output-dir DIR [--concurrency N] [--format ...] [--metadata]
 """
 
+import importlib.util
 import sys
 import os
+import re
 import subprocess
 import argparse
+import asyncio
 
 
-def ensure_dependencies():
-    """Install trafilatura and requests if not available."""
-    missing = []
-    try:
-        import trafilatura  # noqa: F401
-    except ImportError:
-        missing.append("trafilatura")
+def is_installed(module):
+    """Whether module can be imported, without importing it."""
+    return importlib.util.find_spec(module) is not None
+
+
+# extract_content uses the Extractor options and Document results of trafilatura 2
+TRAFILATURA_MIN_MAJOR = 2
+
+
+def trafilatura_current():
+    """Whether the installed trafilatura is new enough for extract_content."""
+    from importlib.metadata import PackageNotFoundError, version
+
     try:
-        import requests  # noqa: F401
-    except ImportError:
-        missing.append("requests")
+        major = version("trafilatura").split(".")[0]
+    except PackageNotFoundError:
+        return False
+    return major.isdigit() and int(major) >= TRAFILATURA_MIN_MAJOR
+
+
+def ensure_dependencies():
+    """Install trafilatura and httpx (with HTTP/2 support) if not available.
+
+    An installed trafilatura older than TRAFILATURA_MIN_MAJOR is upgraded.
+    """
+    packages = {"httpx": "httpx", "h2": "h2"}
+    missing = [pkg for pkg, module in packages.items() if not is_installed(module)]
+    if not trafilatura_current():
+        missing.insert(0, f"trafilatura>={TRAFILATURA_MIN_MAJOR}")
 
     if missing:
         print(f"Installing {', '.join(missing)}...", file=sys.stderr)
@@ -38,66 +60,242 @@ def ensure_dependencies():
     return True
 
 
-def fetch_url(url):
-    """Fetch URL content using requests."""
-    import requests
+# Pages larger than this are refused rather than read into memory
+MAX_BYTES = 10 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-    }
+USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/120.0.0.0 Safari/537.36")
 
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    return response.text
+# Simultaneous requests in --batch mode
+BATCH_CONCURRENCY = 10
 
+# Shared so connections are reused across fetches and when imported as a library
+_CLIENT = None
 
-def extract_content(html, url, output_format="markdown", include_metadata=False):
-    """Extract clean content from HTML using trafilatura."""
-    import trafilatura
-
-    # Configure extraction options
-    kwargs = {
-        "include_links": True,
-        "include_images": False,
-        "include_tables": True,
-        "no_fallback": False,
-        "url": url,
+
+def _client_options():
+    # httpx advertises br/zstd itself when brotli/zstandard are installed
+    return {
+        "http2": importlib.util.find_spec("h2") is not None,
+        "timeout": 30,
+        "follow_redirects": True,
+        "headers": {"User-Agent": USER_AGENT},
     }
 
-    if output_format == "markdown":
-        kwargs["output_format"] = "markdown"
-    elif output_format == "html":
-        kwargs["output_format"] = "xml"
-    else:
-        kwargs["output_format"] = "txt"
 
-    content = trafilatura.extract(html, **kwargs)
+def get_client():
+    global _CLIENT
+    if _CLIENT is None:
+        import httpx
+        _CLIENT = httpx.Client(**_client_options())
+    return _CLIENT
 
-    if not content:
-        # Fallback: try with different settings
-        content = trafilatura.extract(html, no_fallback=False, url=url)
 
-    if not content:
+def _check_length(response, max_bytes):
+    length = response.headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        raise ValueError(f"page is larger than {max_bytes:,} bytes")
+
+
+def _add_chunk(body, chunk, max_bytes):
+    body += chunk
+    if len(body) > max_bytes:
+        raise ValueError(f"page is larger than {max_bytes:,} bytes")
+
+
+def _decode(response, body):
+    """Text when the response declares a charset, else the raw bytes.
+
+    trafilatura detects the encoding of bytes itself, including charsets
+    declared only in a <meta> tag.
+    """
+    if response.charset_encoding:
+        return body.decode(response.charset_encoding, errors="replace")
+    return bytes(body)
+
+
+def fetch_url(url, max_bytes=MAX_BYTES):
+    """Fetch URL content using httpx, streaming up to max_bytes."""
+    with get_client().stream("GET", url) as response:
+        response.raise_for_status()
+        _check_length(response, max_bytes)
+        body = bytearray()
+        for chunk in response.iter_bytes(CHUNK_SIZE):
+            _add_chunk(body, chunk, max_bytes)
+        return _decode(response, body)
+
+
+async def _fetch_async(client, semaphore, url, max_bytes):
+    async with semaphore:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            _check_length(response, max_bytes)
+            body = bytearray()
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                _add_chunk(body, chunk, max_bytes)
+            return _decode(response, body)
+
+
+async def fetch_many(urls, concurrency=BATCH_CONCURRENCY, max_bytes=MAX_BYTES):
+    """Fetch URLs over one async client, yielding (index, page) as each completes.
+
+    Failures are yielded as exceptions in place of the page.
+    """
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(**_client_options()) as client:
+        async def fetch(i, url):
+            try:
+                return i, await _fetch_async(client, semaphore, url, max_bytes)
+            except Exception as e:
+                return i, e
+
+        for done in asyncio.as_completed([fetch(i, url) for i, url in enumerate(urls)]):
+            yield await done
+
+
+# trafilatura output format for each --format choice
+OUTPUT_FORMATS = {"markdown": "markdown", "html": "xml", "text": "txt"}
+
+METADATA_FIELDS = ("title", "author", "date", "sitename", "hostname", "description", "url")
+
+
+def get_config():
+    """trafilatura's settings, parsed once when trafilatura is imported."""
+    from trafilatura.settings import DEFAULT_CONFIG
+    return DEFAULT_CONFIG
+
+
+def extract_content(html, url, output_format="markdown", include_metadata=False):
+    """Extract clean content from HTML using trafilatura.
+
+    html may be a string, undecoded bytes or an already parsed lxml tree. The page is parsed
+    and extracted once; content and metadata both come from the same document.
+    """
+    from trafilatura import bare_extraction
+    from trafilatura.core import determine_returnstring
+    from trafilatura.settings import Extractor
+
+    options = Extractor(
+        config=get_config(),
+        output_format=OUTPUT_FORMATS.get(output_format, "txt"),
+        links=True,
+        images=False,
+        tables=True,
+        url=url,
+        with_metadata=include_metadata,
+    )
+    document = bare_extraction(html, options=options)
+    if document is None:
         return None, None
 
     metadata = None
     if include_metadata:
-        meta = trafilatura.extract(html, url=url, output_format="json", no_fallback=False)
-        if meta:
-            import json
-            try:
-                metadata = json.loads(meta)
-            except (json.JSONDecodeError, TypeError):
-                pass
+        metadata = {field: getattr(document, field, None) for field in METADATA_FIELDS}
+        # Metadata is printed as a header by main, not embedded in the content
+        options.with_metadata = False
+
+    content = determine_returnstring(document, options)
+    if not content:
+        return None, None
 
     return content, metadata
 
 
+# File extension for each --format choice in --batch mode
+EXTENSIONS = {"markdown": ".md", "text": ".txt", "html": ".html"}
+
+
+def format_output(content, metadata):
+    """Prefix content with a title and metadata header when metadata is given."""
+    output_parts = []
+
+    if metadata:
+        if metadata.get("title"):
+            output_parts.append(f"# {metadata['title']}")
+        meta_fields = []
+        if metadata.get("author"):
+            meta_fields.append(f"Author: {metadata['author']}")
+        if metadata.get("date"):
+            meta_fields.append(f"Date: {metadata['date']}")
+        if metadata.get("sitename"):
+            meta_fields.append(f"Source: {metadata['sitename']}")
+        if meta_fields:
+            output_parts.append("\n".join(meta_fields))
+        output_parts.append("---")
+
+    output_parts.append(content)
+    return "\n\n".join(output_parts)
+
+
+def output_name(url, used, extension):
+    """File name derived from the URL, unique within used."""
+    slug = re.sub(r"^[a-z]+://", "", url, flags=re.I)
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", slug).strip("-.")[:100] or "page"
+    name = slug + extension
+    n = 2
+    while name in used:
+        name = f"{slug}-{n}{extension}"
+        n += 1
+    used.add(name)
+    return name
+
+
+def read_urls(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def save_page(url, html, output_path, output_format, include_metadata):
+    """Extract one fetched page into output_path; returns whether it succeeded."""
+    if isinstance(html, Exception):
+        print(f"Error fetching {url}: {html}", file=sys.stderr)
+        return False
+    try:
+        content, metadata = extract_content(html, url, output_format, include_metadata)
+    except Exception as e:
+        print(f"Error extracting {url}: {e}", file=sys.stderr)
+        return False
+    if not content:
+        print(f"Error: Could not extract content from {url}", file=sys.stderr)
+        return False
+
+    full_output = format_output(content, metadata)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(full_output)
+    print(f"{url} -> {output_path} ({len(full_output):,} chars)")
+    return True
+
+
+def scrape_batch(urls, output_dir, output_format, include_metadata, concurrency):
+    """Fetch URLs concurrently, extracting each into output_dir as it arrives.
+
+    Returns the failure count.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Named up front, in input order, so names do not depend on which fetch finishes first
+    used = set()
+    paths = [os.path.join(output_dir, output_name(url, used, EXTENSIONS[output_format]))
+             for url in urls]
+
+    async def run():
+        failed = 0
+        async for i, html in fetch_many(urls, concurrency):
+            if not save_page(urls[i], html, paths[i], output_format, include_metadata):
+                failed += 1
+        return failed
+
+    failed = asyncio.run(run())
+    print(f"Batch: {len(urls) - failed} succeeded, {failed} failed")
+    return failed
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fetch URL and extract clean content")
-    parser.add_argument("url", help="URL to scrape")
+    parser.add_argument("url", nargs="?", help="URL to scrape")
     parser.add_argument(
         "--format", "-f", default="markdown",
         choices=["markdown", "text", "html"],
@@ -105,12 +303,34 @@ def main():
     )
     parser.add_argument("--output", "-o", help="Save output to file")
     parser.add_argument("--metadata", "-m", action="store_true", help="Include metadata (title, author, date)")
+    parser.add_argument("--batch", "-b", metavar="FILE", help="Scrape every URL listed in FILE (one per line)")
+    parser.add_argument("--output-dir", "-d", help="Directory for --batch results")
+    parser.add_argument(
+        "--concurrency", "-j", type=int, default=BATCH_CONCURRENCY,
+        help=f"Simultaneous requests in --batch mode (default: {BATCH_CONCURRENCY})"
+    )
 
     args = parser.parse_args()
 
+    if args.batch is None and args.url is None:
+        parser.error("url is required unless --batch is given")
+    if args.batch and not args.output_dir:
+        parser.error("--batch requires --output-dir")
+
     if not ensure_dependencies():
         sys.exit(1)
 
+    if args.batch:
+        batch_path = os.path.abspath(os.path.expanduser(args.batch))
+        if not os.path.exists(batch_path):
+            print(f"Error: File not found: {batch_path}", file=sys.stderr)
+            sys.exit(1)
+        output_dir = os.path.abspath(os.path.expanduser(args.output_dir))
+        if scrape_batch(read_urls(batch_path), output_dir, args.format,
+                        args.metadata, max(1, args.concurrency)):
+            sys.exit(1)
+        return
+
     # Fetch the page
     try:
         print(f"Fetching: {args.url}", file=sys.stderr)
@@ -130,25 +350,7 @@ def main():
         print("Error: Could not extract content from the page", file=sys.stderr)
         sys.exit(1)
 
-    # Build output
-    output_parts = []
-
-    if metadata and args.metadata:
-        if metadata.get("title"):
-            output_parts.append(f"# {metadata['title']}")
-        meta_fields = []
-        if metadata.get("author"):
-            meta_fields.append(f"Author: {metadata['author']}")
-        if metadata.get("date"):
-            meta_fields.append(f"Date: {metadata['date']}")
-        if metadata.get("sitename"):
-            meta_fields.append(f"Source: {metadata['sitename']}")
-        if meta_fields:
-            output_parts.append("\n".join(meta_fields))
-        output_parts.append("---")
-
-    output_parts.append(content)
-    full_output = "\n\n".join(output_parts)
+    full_output = format_output(content, metadata)
 
     # Save or print
     if args.output:
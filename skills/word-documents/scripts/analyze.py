@@ -9,29 +9,84 @@ Usage:
     python3 analyze.py document.docx [--mode full|text|metadata|comments|changes|structure|styles] [-o output.json]
 """
 
+import importlib.util
 import sys
 import os
 import subprocess
 import argparse
 import json
-from datetime import datetime
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def is_installed(module):
+    """Whether module can be imported, without importing it."""
+    return importlib.util.find_spec(module) is not None
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W_ID = f'{{{W_NS}}}id'
+W_AUTHOR = f'{{{W_NS}}}author'
+W_DATE = f'{{{W_NS}}}date'
+W_INITIALS = f'{{{W_NS}}}initials'
+W_T = f'{{{W_NS}}}t'
+W_DEL_TEXT = f'{{{W_NS}}}delText'
+W_INS = f'{{{W_NS}}}ins'
+W_DEL = f'{{{W_NS}}}del'
+W_RPR_CHANGE = f'{{{W_NS}}}rPrChange'
+W_COMMENT = f'{{{W_NS}}}comment'
+W_BODY = f'{{{W_NS}}}body'
+W_P = f'{{{W_NS}}}p'
+W_R = f'{{{W_NS}}}r'
+W_HYPERLINK = f'{{{W_NS}}}hyperlink'
+W_PPR = f'{{{W_NS}}}pPr'
+W_PSTYLE = f'{{{W_NS}}}pStyle'
+W_VAL = f'{{{W_NS}}}val'
+W_TYPE = f'{{{W_NS}}}type'
+W_STYLE = f'{{{W_NS}}}style'
+W_STYLE_ID = f'{{{W_NS}}}styleId'
+W_NAME = f'{{{W_NS}}}name'
+W_DEFAULT = f'{{{W_NS}}}default'
+
+# Text equivalents of run children, matching python-docx's Run.text
+RUN_TEXT = {
+    f'{{{W_NS}}}tab': "\t",
+    f'{{{W_NS}}}ptab': "\t",
+    f'{{{W_NS}}}cr': "\n",
+    f'{{{W_NS}}}noBreakHyphen': "-",
+}
+W_BR = f'{{{W_NS}}}br'
+
+REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+REL_RELATIONSHIP = f'{{{REL_NS}}}Relationship'
+OFFICE_DOCUMENT_REL = ('http://schemas.openxmlformats.org/officeDocument/2006/'
+                       'relationships/officeDocument')
+STYLES_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles'
+
+# Modes that read the package XML directly instead of loading python-docx
+STREAMING_MODES = ("text", "structure", "metadata")
 
 
 def ensure_dependencies():
     """Install python-docx and lxml if not available."""
-    try:
-        import docx  # noqa: F401
-        return True
-    except ImportError:
-        print("Installing python-docx...", file=sys.stderr)
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "python-docx", "lxml", "-q"],
-            capture_output=True, text=True,
-        )
-        if result.returncode != 0:
-            print(f"Failed to install python-docx: {result.stderr}", file=sys.stderr)
-            return False
+    if is_installed("docx"):
         return True
+    print("Installing python-docx...", file=sys.stderr)
+    result = subprocess.run(
+        [sys.executable, "-m", "pip", "install", "python-docx", "lxml", "-q"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"Failed to install python-docx: {result.stderr}", file=sys.stderr)
+        return False
+    return True
 
 
 def extract_metadata(doc):
@@ -51,41 +106,65 @@ def extract_metadata(doc):
     return meta
 
 
-def extract_text(doc):
-    """Extract full text from document."""
-    paragraphs = []
-    for para in doc.paragraphs:
-        paragraphs.append(para.text)
-    return "\n".join(paragraphs)
+def _heading_level(style_name):
+    try:
+        return int(style_name.replace('Heading ', '').replace('Heading', '').strip())
+    except ValueError:
+        return 0
 
 
-def extract_structure(doc):
-    """Extract heading hierarchy."""
+def _scan_paragraphs(doc):
+    """Collect text, headings and styles in one walk over doc.paragraphs."""
+    texts = []
     headings = []
-    for para in doc.paragraphs:
-        if para.style and para.style.name and para.style.name.startswith('Heading'):
-            try:
-                level = int(para.style.name.replace('Heading ', '').replace('Heading', '').strip())
-            except ValueError:
-                level = 0
-            headings.append({
-                "level": level,
-                "text": para.text.strip(),
-            })
-    return headings
-
-
-def extract_styles(doc):
-    """Extract all styles in use."""
     paragraph_styles = set()
     character_styles = set()
     for para in doc.paragraphs:
-        if para.style:
-            paragraph_styles.add(para.style.name)
+        text = para.text
+        texts.append(text)
+        style = para.style
+        if style:
+            name = style.name
+            paragraph_styles.add(name)
+            if name and name.startswith('Heading'):
+                headings.append({
+                    "level": _heading_level(name),
+                    "text": text.strip(),
+                })
         for run in para.runs:
             if run.style and run.style.name != 'Default Paragraph Font':
                 character_styles.add(run.style.name)
 
+    full_text = "\n".join(texts)
+    return {
+        "text": full_text,
+        "paragraph_count": len(texts),
+        "word_count": len(full_text.split()),
+        "char_count": len(full_text),
+        "headings": headings,
+        "paragraph_styles": paragraph_styles,
+        "character_styles": character_styles,
+    }
+
+
+def extract_text(doc, scan=None):
+    """Extract full text from document."""
+    if scan is not None:
+        return scan["text"]
+    return "\n".join(para.text for para in doc.paragraphs)
+
+
+def extract_structure(doc, scan=None):
+    """Extract heading hierarchy."""
+    return (scan or _scan_paragraphs(doc))["headings"]
+
+
+def extract_styles(doc, scan=None):
+    """Extract all styles in use."""
+    scan = scan or _scan_paragraphs(doc)
+    paragraph_styles = scan["paragraph_styles"]
+    character_styles = scan["character_styles"]
+
     all_styles = []
     for style in doc.styles:
         all_styles.append({
@@ -107,38 +186,28 @@ def extract_comments(doc):
     from lxml import etree
 
     comments = []
-    nsmap = {
-        'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-        'w15': 'http://schemas.microsoft.com/office/word/2012/wordml',
-        'w16cid': 'http://schemas.microsoft.com/office/word/2016/wordml/cid',
-    }
 
     # Access the comments part from the package
     try:
         from docx.opc.constants import RELATIONSHIP_TYPE as RT
-        comments_part = None
-        for rel in doc.part.rels.values():
-            if 'comments' in rel.reltype and 'Extended' not in rel.reltype:
-                comments_part = rel.target_part
-                break
+        # Exact match: commentsIds/commentsExtensible parts hold no comment text
+        comments_part = next(
+            (rel.target_part for rel in doc.part.rels.values()
+             if rel.reltype == RT.COMMENTS and not rel.is_external),
+            None,
+        )
 
         if comments_part is None:
             return comments
 
         root = etree.fromstring(comments_part.blob)
-        for comment_elem in root.findall('.//w:comment', nsmap):
-            comment_id = comment_elem.get(f'{{{nsmap["w"]}}}id')
-            author = comment_elem.get(f'{{{nsmap["w"]}}}author', 'Unknown')
-            date = comment_elem.get(f'{{{nsmap["w"]}}}date', '')
-            initials = comment_elem.get(f'{{{nsmap["w"]}}}initials', '')
-
-            # Extract comment text from paragraphs
-            text_parts = []
-            for p in comment_elem.findall('.//w:p', nsmap):
-                for r in p.findall('.//w:r', nsmap):
-                    for t in r.findall('.//w:t', nsmap):
-                        if t.text:
-                            text_parts.append(t.text)
+        for comment_elem in root.iter(W_COMMENT):
+            comment_id = comment_elem.get(W_ID)
+            author = comment_elem.get(W_AUTHOR, 'Unknown')
+            date = comment_elem.get(W_DATE, '')
+            initials = comment_elem.get(W_INITIALS, '')
+
+            text_parts = [t.text for t in comment_elem.iter(W_T) if t.text]
 
             comments.append({
                 "id": comment_id,
@@ -154,87 +223,39 @@ def extract_comments(doc):
 
 
 def extract_tracked_changes(doc):
-    """Extract tracked changes using lxml to parse the underlying XML."""
-    from lxml import etree
-
-    changes = []
-    nsmap = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-
-    body = doc.element.body
-
-    # Find insertions
-    for ins in body.iter(f'{{{nsmap["w"]}}}ins'):
-        change_id = ins.get(f'{{{nsmap["w"]}}}id', '')
-        author = ins.get(f'{{{nsmap["w"]}}}author', 'Unknown')
-        date = ins.get(f'{{{nsmap["w"]}}}date', '')
-
-        text_parts = []
-        for t in ins.iter(f'{{{nsmap["w"]}}}t'):
-            if t.text:
-                text_parts.append(t.text)
-
-        if text_parts:
-            changes.append({
-                "type": "insertion",
-                "id": change_id,
-                "author": author,
-                "date": date,
-                "text": "".join(text_parts),
+    """Extract tracked changes in a single pass over the document body."""
+    insertions, deletions, format_changes = [], [], []
+
+    for elem in doc.element.body.iter(W_INS, W_DEL, W_RPR_CHANGE):
+        tag = elem.tag
+        if tag == W_INS:
+            kind, found, text_source = "insertion", insertions, elem.iter(W_T)
+        elif tag == W_DEL:
+            kind, found, text_source = "deletion", deletions, elem.iter(W_DEL_TEXT)
+        else:
+            # Text lives on the run that owns the changed run properties
+            parent_run = elem.getparent()
+            parent_r = parent_run.getparent() if parent_run is not None else None
+            if parent_r is None:
+                continue
+            kind, found, text_source = "format_change", format_changes, parent_r.iter(W_T)
+
+        text = "".join(t.text for t in text_source if t.text)
+        if text:
+            found.append({
+                "type": kind,
+                "id": elem.get(W_ID, ''),
+                "author": elem.get(W_AUTHOR, 'Unknown'),
+                "date": elem.get(W_DATE, ''),
+                "text": text,
             })
 
-    # Find deletions
-    for dele in body.iter(f'{{{nsmap["w"]}}}del'):
-        change_id = dele.get(f'{{{nsmap["w"]}}}id', '')
-        author = dele.get(f'{{{nsmap["w"]}}}author', 'Unknown')
-        date = dele.get(f'{{{nsmap["w"]}}}date', '')
-
-        text_parts = []
-        for dt in dele.iter(f'{{{nsmap["w"]}}}delText'):
-            if dt.text:
-                text_parts.append(dt.text)
-
-        if text_parts:
-            changes.append({
-                "type": "deletion",
-                "id": change_id,
-                "author": author,
-                "date": date,
-                "text": "".join(text_parts),
-            })
+    return insertions + deletions + format_changes
+
 
-    # Find format changes
-    for rpc in body.iter(f'{{{nsmap["w"]}}}rPrChange'):
-        change_id = rpc.get(f'{{{nsmap["w"]}}}id', '')
-        author = rpc.get(f'{{{nsmap["w"]}}}author', 'Unknown')
-        date = rpc.get(f'{{{nsmap["w"]}}}date', '')
-
-        # Get the parent run's text
-        parent_run = rpc.getparent()
-        if parent_run is not None:
-            parent_r = parent_run.getparent()
-            if parent_r is not None:
-                text_parts = []
-                for t in parent_r.iter(f'{{{nsmap["w"]}}}t'):
-                    if t.text:
-                        text_parts.append(t.text)
-
-                if text_parts:
-                    changes.append({
-                        "type": "format_change",
-                        "id": change_id,
-                        "author": author,
-                        "date": date,
-                        "text": "".join(text_parts),
-                    })
-
-    return changes
-
-
-def count_statistics(doc):
+def count_statistics(doc, scan=None):
     """Count paragraphs, words, tables, images."""
-    total_text = extract_text(doc)
-    words = len(total_text.split())
-    characters = len(total_text)
+    scan = scan or _scan_paragraphs(doc)
 
     image_count = 0
     for rel in doc.part.rels.values():
@@ -242,9 +263,9 @@ def count_statistics(doc):
             image_count += 1
 
     return {
-        "paragraphs": len(doc.paragraphs),
-        "words": words,
-        "characters": characters,
+        "paragraphs": scan["paragraph_count"],
+        "words": scan["word_count"],
+        "characters": scan["char_count"],
         "tables": len(doc.tables),
         "sections": len(doc.sections),
         "images": image_count,
@@ -253,16 +274,244 @@ def count_statistics(doc):
 
 def full_analysis(doc):
     """Run all analysis modes and return combined result."""
+    scan = _scan_paragraphs(doc)
     return {
         "metadata": extract_metadata(doc),
-        "statistics": count_statistics(doc),
-        "structure": extract_structure(doc),
-        "styles": extract_styles(doc),
+        "statistics": count_statistics(doc, scan),
+        "structure": extract_structure(doc, scan),
+        "styles": extract_styles(doc, scan),
         "comments": extract_comments(doc),
         "tracked_changes": extract_tracked_changes(doc),
     }
 
 
+def _rel_target(zf, rels_name, source_dir, reltype):
+    """Resolve the part name of the first relationship of reltype, if any."""
+    from lxml import etree
+
+    try:
+        root = etree.fromstring(zf.read(rels_name))
+    except KeyError:
+        return None
+    for rel in root.iter(REL_RELATIONSHIP):
+        if rel.get('Type') == reltype and rel.get('TargetMode') != 'External':
+            target = rel.get('Target', '')
+            if target.startswith('/'):
+                return target.lstrip('/')
+            return posixpath.normpath(posixpath.join(source_dir, target))
+    return None
+
+
+def _paragraph_style_names(zf, styles_name):
+    """Map paragraph styleId to UI name, plus the default paragraph style name."""
+    from lxml import etree
+
+    names, default = {}, None
+    if styles_name is None or styles_name not in zf.namelist():
+        return names, default
+    for style in etree.fromstring(zf.read(styles_name)).iter(W_STYLE):
+        if style.get(W_TYPE) != 'paragraph':
+            continue
+        name_elem = style.find(W_NAME)
+        name = name_elem.get(W_VAL) if name_elem is not None else None
+        # python-docx reports built-in headings by UI name ("heading 1" -> "Heading 1")
+        if name and name.startswith('heading '):
+            name = 'H' + name[1:]
+        names[style.get(W_STYLE_ID)] = name
+        if style.get(W_DEFAULT) in ('1', 'true', 'on'):
+            default = name
+    return names, default
+
+
+def _run_text(run):
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_BR:
+            if child.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append("\n")
+        elif tag in RUN_TEXT:
+            parts.append(RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def _paragraph_text(p):
+    """Text of a w:p element, matching python-docx's Paragraph.text."""
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+def iter_body_paragraphs(file_path):
+    """Yield (style name, text) for each top-level body paragraph.
+
+    Streams word/document.xml with iterparse and discards each paragraph once
+    read, so memory stays flat regardless of document size.
+    """
+    from lxml import etree
+
+    with zipfile.ZipFile(file_path) as zf:
+        document_name = _rel_target(zf, '_rels/.rels', '', OFFICE_DOCUMENT_REL) or 'word/document.xml'
+        source_dir = posixpath.dirname(document_name)
+        rels_name = posixpath.join(source_dir, '_rels', posixpath.basename(document_name) + '.rels')
+        styles_name = _rel_target(zf, rels_name, source_dir, STYLES_REL)
+        style_names, default_style = _paragraph_style_names(zf, styles_name)
+
+        with zf.open(document_name) as source:
+            for _, elem in etree.iterparse(source, events=('end',), tag=W_P, huge_tree=True):
+                parent = elem.getparent()
+                if parent is None or parent.tag != W_BODY:
+                    # Table cells and text boxes are not in doc.paragraphs
+                    continue
+
+                style_id = None
+                ppr = elem.find(W_PPR)
+                if ppr is not None:
+                    pstyle = ppr.find(W_PSTYLE)
+                    if pstyle is not None:
+                        style_id = pstyle.get(W_VAL)
+                style = style_names.get(style_id, default_style) if style_id else default_style
+
+                yield style, _paragraph_text(elem)
+
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+def stream_text(file_path):
+    return "\n".join(text for _, text in iter_body_paragraphs(file_path))
+
+
+def stream_structure(file_path):
+    headings = []
+    for style, text in iter_body_paragraphs(file_path):
+        if style and style.startswith('Heading'):
+            headings.append({
+                "level": _heading_level(style),
+                "text": text.strip(),
+            })
+    return headings
+
+
+CP_NS = 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties'
+DC_NS = 'http://purl.org/dc/elements/1.1/'
+DCTERMS_NS = 'http://purl.org/dc/terms/'
+CORE_PROPERTIES_REL = ('http://schemas.openxmlformats.org/package/2006/relationships/'
+                       'metadata/core-properties')
+
+# extract_metadata field -> docProps/core.xml element, in extract_metadata's order
+CORE_TEXT_FIELDS = (
+    ('author', f'{{{DC_NS}}}creator'),
+    ('title', f'{{{DC_NS}}}title'),
+    ('subject', f'{{{DC_NS}}}subject'),
+    ('keywords', f'{{{CP_NS}}}keywords'),
+    ('category', f'{{{CP_NS}}}category'),
+    ('comments', f'{{{DC_NS}}}description'),
+    ('last_modified_by', f'{{{CP_NS}}}lastModifiedBy'),
+    ('revision', f'{{{CP_NS}}}revision'),
+    ('version', f'{{{CP_NS}}}version'),
+    ('content_status', f'{{{CP_NS}}}contentStatus'),
+    ('identifier', f'{{{DC_NS}}}identifier'),
+    ('language', f'{{{DC_NS}}}language'),
+)
+CORE_DATE_FIELDS = (
+    ('created', f'{{{DCTERMS_NS}}}created'),
+    ('modified', f'{{{DCTERMS_NS}}}modified'),
+    ('last_printed', f'{{{CP_NS}}}lastPrinted'),
+)
+
+
+def _parse_w3cdtf(value):
+    """Parse a W3CDTF date the way python-docx does; None if unparseable."""
+    parsed = None
+    for template in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%Y-%m", "%Y"):
+        try:
+            parsed = datetime.strptime(value[:19], template)
+        except ValueError:
+            continue
+    if parsed is None:
+        return None
+    offset = value[19:]
+    if len(offset) == 6:
+        match = re.match(r"([+-])(\d\d):(\d\d)", offset)
+        if match is None:
+            return None
+        sign = -1 if match.group(1) == "+" else 1
+        parsed += timedelta(hours=sign * int(match.group(2)), minutes=sign * int(match.group(3)))
+    return parsed.replace(tzinfo=timezone.utc)
+
+
+def read_core_properties(file_path):
+    """extract_metadata's result read straight from docProps/core.xml.
+
+    Returns None when the package has no core properties part; python-docx
+    substitutes defaults in that case, so the caller falls back to it.
+    """
+    from lxml import etree
+
+    with zipfile.ZipFile(file_path) as zf:
+        core_name = _rel_target(zf, '_rels/.rels', '', CORE_PROPERTIES_REL)
+        if core_name is None or core_name not in zf.namelist():
+            return None
+        root = etree.fromstring(zf.read(core_name))
+
+    meta = {}
+    for attr, tag in CORE_TEXT_FIELDS:
+        elem = root.find(tag)
+        val = (elem.text or '') if elem is not None else ''
+        if attr == 'revision':
+            # python-docx reports non-numeric and negative revisions as 0
+            val = int(val) if re.fullmatch(r'[+-]?\d+', val.strip()) else 0
+            val = val if val > 0 else 0
+        meta[attr] = str(val) if val else None
+    for attr, tag in CORE_DATE_FIELDS:
+        elem = root.find(tag)
+        val = _parse_w3cdtf(elem.text) if elem is not None and elem.text else None
+        if val is not None:
+            meta[attr] = val.isoformat()
+    return meta
+
+
+def run_streaming_mode(mode, file_path):
+    """Result for a STREAMING_MODES mode, or None to fall back to python-docx."""
+    if mode == "text":
+        return {"text": stream_text(file_path)}
+    if mode == "structure":
+        return {"structure": stream_structure(file_path)}
+    metadata = read_core_properties(file_path)
+    return {"metadata": metadata} if metadata is not None else None
+
+
+def dump_json(result):
+    """Serialize result as indented UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(result, indent=2, default=str, ensure_ascii=False).encode("utf-8")
+
+
+def write_result(result, output):
+    output_json = dump_json(result)
+
+    if output:
+        output_path = os.path.expanduser(output)
+        output_path = os.path.abspath(output_path)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(output_json)
+        print(f"Analysis written to: {output_path}", file=sys.stderr)
+    else:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output_json + b"\n")
+        sys.stdout.buffer.flush()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Analyze a Word document (.docx)"
@@ -292,6 +541,16 @@ def main():
     if not ensure_dependencies():
         sys.exit(1)
 
+    if args.mode in STREAMING_MODES:
+        try:
+            result = run_streaming_mode(args.mode, file_path)
+        except Exception as e:
+            print(f"Error: Could not open document: {e}", file=sys.stderr)
+            sys.exit(1)
+        if result is not None:
+            write_result(result, args.output)
+            return
+
     from docx import Document
 
     try:
@@ -302,27 +561,15 @@ def main():
 
     mode_map = {
         "full": lambda: full_analysis(doc),
-        "text": lambda: {"text": extract_text(doc)},
         "metadata": lambda: {"metadata": extract_metadata(doc)},
         "comments": lambda: {"comments": extract_comments(doc)},
         "changes": lambda: {"tracked_changes": extract_tracked_changes(doc)},
-        "structure": lambda: {"structure": extract_structure(doc)},
         "styles": lambda: {"styles": extract_styles(doc)},
     }
 
     result = mode_map[args.mode]()
 
-    output_json = json.dumps(result, indent=2, default=str, ensure_ascii=False)
-
-    if args.output:
-        output_path = os.path.expanduser(args.output)
-        output_path = os.path.abspath(output_path)
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(output_json)
-        print(f"Analysis written to: {output_path}", file=sys.stderr)
-    else:
-        print(output_json)
+    write_result(result, args.output)
 
 
 if __name__ == "__main__":
@@ -7,28 +7,42 @@ Operations: list, add, remove, export.
 Usage:
     python3 comments.py list document.docx
     python3 comments.py add document.docx -t "search text" -c "Comment body" [-a "Author"] [-o output.docx]
+    python3 comments.py add document.docx --batch comments.tsv [-a "Author"] [-o output.docx]
     python3 comments.py remove document.docx [-o output.docx] [--index N]
     python3 comments.py export document.docx [-o comments.json] [--format json|csv]
 """
 
 import sys
 import os
-import subprocess
 import argparse
 import json
 import csv
 import copy
+import functools
 import io
-from datetime import datetime, timezone
+import time
+
+try:
+    import ahocorasick  # optional: pyahocorasick, for add --batch
+except ImportError:
+    ahocorasick = None
 
 
 def ensure_dependencies():
-    """Install python-docx and lxml if not available."""
+    """Install python-docx and lxml if not available.
+
+    Set PHPBOT_SKIP_DEP_CHECK=1 to skip the check when calling this script
+    repeatedly from a batch job with the dependencies already installed.
+    """
+    if os.environ.get("PHPBOT_SKIP_DEP_CHECK"):
+        return True
     try:
         import docx  # noqa: F401
         from lxml import etree  # noqa: F401
         return True
     except ImportError:
+        import subprocess
+
         print("Installing python-docx and lxml...", file=sys.stderr)
         result = subprocess.run(
             [sys.executable, "-m", "pip", "install", "python-docx", "lxml", "-q"],
@@ -44,82 +58,195 @@ W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
 W15_NS = 'http://schemas.microsoft.com/office/word/2012/wordml'
 NSMAP = {'w': W_NS, 'w15': W15_NS}
 
+W_ID = f'{{{W_NS}}}id'
+W_AUTHOR = f'{{{W_NS}}}author'
+W_DATE = f'{{{W_NS}}}date'
+W_INITIALS = f'{{{W_NS}}}initials'
+W_VAL = f'{{{W_NS}}}val'
+W_COMMENT = f'{{{W_NS}}}comment'
+W_P = f'{{{W_NS}}}p'
+W_R = f'{{{W_NS}}}r'
+W_T = f'{{{W_NS}}}t'
+W_BR = f'{{{W_NS}}}br'
+W_TYPE = f'{{{W_NS}}}type'
+W_RPR = f'{{{W_NS}}}rPr'
+W_RSTYLE = f'{{{W_NS}}}rStyle'
+W_ANNOTATION_REF = f'{{{W_NS}}}annotationRef'
+W_COMMENT_RANGE_START = f'{{{W_NS}}}commentRangeStart'
+W_COMMENT_RANGE_END = f'{{{W_NS}}}commentRangeEnd'
+W_COMMENT_REFERENCE = f'{{{W_NS}}}commentReference'
+# Placeholder tag for runs queued for removal by _remove_all
+STRIP_RUN = '{urn:x-comments-strip}r'
+# Text nodes in any namespace count towards a comment's range
+ANY_T = '{*}t'
+
+# Text equivalents of run children, matching python-docx's Run.text
+RUN_TEXT = {
+    f'{{{W_NS}}}tab': "\t",
+    f'{{{W_NS}}}ptab': "\t",
+    f'{{{W_NS}}}cr': "\n",
+    f'{{{W_NS}}}noBreakHyphen': "-",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def xpath(expression):
+    """Compile an XPath expression once (lxml is imported lazily, after install)."""
+    from lxml import etree
+
+    return etree.XPath(expression, namespaces=NSMAP)
+
+
+def paragraph_text(p):
+    """Text of a w:p element, as python-docx's Paragraph.text reports it."""
+    parts = []
+    for node in xpath('w:r/* | w:hyperlink/w:r/*')(p):
+        tag = node.tag
+        if tag == W_T:
+            parts.append(node.text or "")
+        elif tag == W_BR:
+            if node.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append("\n")
+        elif tag in RUN_TEXT:
+            parts.append(RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def find_paragraph(body, search_text):
+    """First top-level body paragraph whose text contains search_text."""
+    for p in body.iterchildren(W_P):
+        if search_text in paragraph_text(p):
+            return p
+    return None
+
+
+def find_paragraphs(body, search_texts):
+    """Map each search text to the first top-level paragraph containing it.
+
+    Paragraph text is computed once for all searches. With pyahocorasick
+    installed, all search texts are matched in a single scan per paragraph.
+    """
+    pending = set(search_texts)
+    found = {}
+    if not pending:
+        return found
+
+    automaton = None
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for needle in pending:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+
+    for p in body.iterchildren(W_P):
+        text = paragraph_text(p)
+        if automaton is not None:
+            hits = {needle for _, needle in automaton.iter(text)} & pending
+        else:
+            hits = {needle for needle in pending if needle in text}
+        for needle in hits:
+            found[needle] = p
+        pending -= hits
+        if not pending:
+            break
+    return found
+
 
 def get_comments_part(doc):
     """Get the comments XML part from the document."""
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
     for rel in doc.part.rels.values():
-        if 'comments' in rel.reltype and 'Extended' not in rel.reltype and 'Ids' not in rel.reltype:
+        # Exact match: commentsExtended, commentsIds and commentsExtensible
+        # share the prefix.
+        if rel.reltype == RT.COMMENTS and not rel.is_external:
             return rel.target_part
     return None
 
 
 def parse_comments(doc):
     """Parse all comments from the document."""
-    from lxml import etree
-
     comments_part = get_comments_part(doc)
     if comments_part is None:
         return []
 
-    root = etree.fromstring(comments_part.blob)
-    comments = []
+    comments = read_comments_part(comments_part)
+    commented_texts = collect_commented_texts(doc)
+
+    for comment in comments:
+        comment["commented_text"] = commented_texts.get(comment["id"], "")
+    return comments
 
-    for comment_elem in root.findall('.//w:comment', NSMAP):
-        comment_id = comment_elem.get(f'{{{W_NS}}}id')
-        author = comment_elem.get(f'{{{W_NS}}}author', 'Unknown')
-        date = comment_elem.get(f'{{{W_NS}}}date', '')
-        initials = comment_elem.get(f'{{{W_NS}}}initials', '')
-
-        text_parts = []
-        for p in comment_elem.findall('.//w:p', NSMAP):
-            p_texts = []
-            for r in p.findall('.//w:r', NSMAP):
-                for t in r.findall('.//w:t', NSMAP):
-                    if t.text:
-                        p_texts.append(t.text)
-            text_parts.append("".join(p_texts))
-
-        # Find the commented text range in the document body
-        commented_text = find_commented_text(doc, comment_id)
-
-        comments.append({
-            "id": comment_id,
-            "author": author,
-            "date": date,
-            "initials": initials,
-            "text": "\n".join(text_parts),
-            "commented_text": commented_text,
-        })
+
+def _comment_record(comment_elem):
+    """id, author, date, initials and text of one w:comment element."""
+    find_paragraphs = xpath('.//w:p')
+    find_text = xpath('.//w:r//w:t/text()')
+    text_parts = ["".join(find_text(p)) for p in find_paragraphs(comment_elem)]
+    return {
+        "id": comment_elem.get(W_ID),
+        "author": comment_elem.get(W_AUTHOR, 'Unknown'),
+        "date": comment_elem.get(W_DATE, ''),
+        "initials": comment_elem.get(W_INITIALS, ''),
+        "text": "\n".join(text_parts),
+    }
+
+
+def read_comments_part(comments_part):
+    """Read every w:comment in the comments part."""
+    from lxml import etree
+
+    # python-docx has already parsed XmlParts; serialising .blob only to
+    # parse it again would double the work
+    if hasattr(comments_part, 'element'):
+        return [_comment_record(elem) for elem in comments_part.element.iter(W_COMMENT)]
+
+    comments = []
+    # Stream the part: each comment is read, then freed along with its predecessors
+    for _, comment_elem in etree.iterparse(io.BytesIO(comments_part.blob), events=('end',), tag=W_COMMENT):
+        comments.append(_comment_record(comment_elem))
+        comment_elem.clear()
+        parent = comment_elem.getparent()
+        if parent is not None:
+            while comment_elem.getprevious() is not None:
+                del parent[0]
 
     return comments
 
 
-def find_commented_text(doc, comment_id):
-    """Find the text that a comment references in the document body."""
+def collect_commented_texts(doc):
+    """Map each comment id to the body text its range covers, in one pass."""
     body = doc.element.body
-    collecting = False
-    text_parts = []
+    ranges = {}
+    active = {}
 
-    for elem in body.iter():
-        tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
+    for elem in body.iter(W_COMMENT_RANGE_START, W_COMMENT_RANGE_END, ANY_T):
+        tag = elem.tag
 
-        if tag == 'commentRangeStart':
-            elem_id = elem.get(f'{{{W_NS}}}id')
-            if elem_id == comment_id:
-                collecting = True
-                continue
+        if tag == W_COMMENT_RANGE_START:
+            elem_id = elem.get(W_ID)
+            if elem_id not in ranges:
+                ranges[elem_id] = active[elem_id] = []
+
+        elif tag == W_COMMENT_RANGE_END:
+            elem_id = elem.get(W_ID)
+            if elem_id in active:
+                del active[elem_id]
+            elif elem_id not in ranges:
+                # An end before its start closes an empty range
+                ranges[elem_id] = []
+
+        elif elem.text and active:
+            for parts in active.values():
+                parts.append(elem.text)
 
-        if tag == 'commentRangeEnd':
-            elem_id = elem.get(f'{{{W_NS}}}id')
-            if elem_id == comment_id:
-                collecting = False
-                break
+    # Ranges that are never closed run to the end of the body
+    return {elem_id: "".join(parts) for elem_id, parts in ranges.items()}
 
-        if collecting and tag == 't':
-            if elem.text:
-                text_parts.append(elem.text)
 
-    return "".join(text_parts) if text_parts else ""
+def find_commented_text(doc, comment_id):
+    """Find the text that a comment references in the document body."""
+    return collect_commented_texts(doc).get(comment_id, "")
 
 
 def list_comments(doc):
@@ -144,42 +271,8 @@ def list_comments(doc):
     print(f"\nTotal: {len(comments)} comment(s)")
 
 
-def add_comment(doc, search_text, comment_text, author, output_path):
-    """Add a comment to the document at the location of search_text."""
-    from lxml import etree
-    from docx.opc.part import Part
-    from docx.opc.constants import RELATIONSHIP_TYPE as RT
-    import re
-
-    body = doc.element.body
-
-    # Find the paragraph containing the search text
-    target_para = None
-    target_run_idx = None
-    for para in doc.paragraphs:
-        if search_text in para.text:
-            target_para = para
-            break
-
-    if target_para is None:
-        print(f"Error: Could not find text \"{search_text}\" in the document.", file=sys.stderr)
-        sys.exit(1)
-
-    # Determine next comment ID
-    existing_comments = parse_comments(doc)
-    next_id = 0
-    for c in existing_comments:
-        try:
-            cid = int(c['id'])
-            if cid >= next_id:
-                next_id = cid + 1
-        except (ValueError, TypeError):
-            pass
-
-    comment_id = str(next_id)
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-    # Get or create comments part
+def get_or_create_comments_part(doc):
+    """The document's comments part, creating an empty one if it has none."""
     comments_part = get_comments_part(doc)
     if comments_part is None:
         # Create a new comments part
@@ -189,13 +282,14 @@ def add_comment(doc, search_text, comment_text, author, output_path):
             f'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
             f'</w:comments>'
         )
-        from docx.opc.part import Part
+        from docx.opc.part import XmlPart
         from docx.opc.packuri import PackURI
 
         comments_part_uri = PackURI('/word/comments.xml')
         content_type = 'application/vnd.openxmlformats-officedocument.wordprocessingml.comments+xml'
 
-        comments_part = Part(
+        # An XmlPart keeps the parsed tree and serialises it once, on save
+        comments_part = XmlPart.load(
             comments_part_uri,
             content_type,
             comments_xml.encode('utf-8'),
@@ -206,74 +300,76 @@ def add_comment(doc, search_text, comment_text, author, output_path):
             'http://schemas.openxmlformats.org/officeDocument/2006/relationships/comments'
         )
 
-    # Add comment to comments XML
-    root = etree.fromstring(comments_part.blob)
+    return comments_part
 
-    # Build initials from author name
-    initials = "".join(word[0].upper() for word in author.split() if word)
 
-    comment_elem = etree.SubElement(root, f'{{{W_NS}}}comment')
-    comment_elem.set(f'{{{W_NS}}}id', comment_id)
-    comment_elem.set(f'{{{W_NS}}}author', author)
-    comment_elem.set(f'{{{W_NS}}}date', now)
-    comment_elem.set(f'{{{W_NS}}}initials', initials)
+def _insert_comment(comments_part, para_elem, search_text, comment_text, author, initials, now, comment_id):
+    """Append a w:comment and wrap the matching runs of para_elem in its range."""
+    from lxml import etree
+
+    comment_elem = etree.Element(W_COMMENT, nsmap={'w': W_NS})
+    comment_elem.set(W_ID, comment_id)
+    comment_elem.set(W_AUTHOR, author)
+    comment_elem.set(W_DATE, now)
+    comment_elem.set(W_INITIALS, initials)
 
     # Add comment paragraph with text
-    p_elem = etree.SubElement(comment_elem, f'{{{W_NS}}}p')
-    r_elem = etree.SubElement(p_elem, f'{{{W_NS}}}r')
+    p_elem = etree.SubElement(comment_elem, W_P)
+    r_elem = etree.SubElement(p_elem, W_R)
     # Add comment reference run properties
-    rpr = etree.SubElement(r_elem, f'{{{W_NS}}}rPr')
-    rstyle = etree.SubElement(rpr, f'{{{W_NS}}}rStyle')
-    rstyle.set(f'{{{W_NS}}}val', 'CommentReference')
-    anno = etree.SubElement(r_elem, f'{{{W_NS}}}annotationRef')
+    rpr = etree.SubElement(r_elem, W_RPR)
+    rstyle = etree.SubElement(rpr, W_RSTYLE)
+    rstyle.set(W_VAL, 'CommentReference')
+    anno = etree.SubElement(r_elem, W_ANNOTATION_REF)
 
     # Add actual text run
-    r_text = etree.SubElement(p_elem, f'{{{W_NS}}}r')
-    t_elem = etree.SubElement(r_text, f'{{{W_NS}}}t')
+    r_text = etree.SubElement(p_elem, W_R)
+    t_elem = etree.SubElement(r_text, W_T)
     t_elem.text = comment_text
     t_elem.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
 
-    comments_part._blob = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+    _append_comment(comments_part, comment_elem)
 
     # Add comment range markers to the document body
-    para_elem = target_para._element
-
     # Find the run that contains the search text and insert markers
-    range_start = etree.Element(f'{{{W_NS}}}commentRangeStart')
-    range_start.set(f'{{{W_NS}}}id', comment_id)
+    range_start = etree.Element(W_COMMENT_RANGE_START)
+    range_start.set(W_ID, comment_id)
 
-    range_end = etree.Element(f'{{{W_NS}}}commentRangeEnd')
-    range_end.set(f'{{{W_NS}}}id', comment_id)
+    range_end = etree.Element(W_COMMENT_RANGE_END)
+    range_end.set(W_ID, comment_id)
 
     # Comment reference run
-    ref_run = etree.Element(f'{{{W_NS}}}r')
-    ref_rpr = etree.SubElement(ref_run, f'{{{W_NS}}}rPr')
-    ref_rstyle = etree.SubElement(ref_rpr, f'{{{W_NS}}}rStyle')
-    ref_rstyle.set(f'{{{W_NS}}}val', 'CommentReference')
-    ref_cr = etree.SubElement(ref_run, f'{{{W_NS}}}commentReference')
-    ref_cr.set(f'{{{W_NS}}}id', comment_id)
+    ref_run = etree.Element(W_R)
+    ref_rpr = etree.SubElement(ref_run, W_RPR)
+    ref_rstyle = etree.SubElement(ref_rpr, W_RSTYLE)
+    ref_rstyle.set(W_VAL, 'CommentReference')
+    ref_cr = etree.SubElement(ref_run, W_COMMENT_REFERENCE)
+    ref_cr.set(W_ID, comment_id)
 
     # Insert markers: start before first run, end after last run, then reference
-    runs = para_elem.findall(f'{{{W_NS}}}r')
+    runs = para_elem.findall(W_R)
     if runs:
-        # Find the run(s) containing the search text
-        found_start = False
-        for run in runs:
-            run_text = ""
-            for t in run.findall(f'{{{W_NS}}}t'):
-                if t.text:
-                    run_text += t.text
-            if search_text in run_text or (not found_start and run_text and run_text in search_text):
-                if not found_start:
-                    run.addprevious(range_start)
-                    found_start = True
-                # Keep going to find the end of the matching text
-                run.addnext(range_end)
-
-        if not found_start:
+        # Find the run(s) containing the search text: the range starts at the
+        # first run that contains it (or is part of it) and ends after the
+        # last run that contains it.
+        run_texts = [''.join(t.text or '' for t in run.iterchildren(W_T)) for run in runs]
+        first = next(
+            (i for i, text in enumerate(run_texts)
+             if search_text in text or (text and text in search_text)),
+            None,
+        )
+
+        if first is None:
             # Fallback: wrap entire paragraph
             runs[0].addprevious(range_start)
             runs[-1].addnext(range_end)
+        else:
+            last = next(
+                i for i in range(len(runs) - 1, first - 1, -1)
+                if i == first or search_text in run_texts[i]
+            )
+            runs[first].addprevious(range_start)
+            runs[last].addnext(range_end)
 
         range_end.addnext(ref_run)
     else:
@@ -282,6 +378,29 @@ def add_comment(doc, search_text, comment_text, author, output_path):
         para_elem.append(range_end)
         para_elem.append(ref_run)
 
+
+def add_comment(doc, search_text, comment_text, author, output_path):
+    """Add a comment to the document at the location of search_text."""
+    body = doc.element.body
+
+    # Find the paragraph containing the search text
+    para_elem = find_paragraph(body, search_text)
+
+    if para_elem is None:
+        print(f"Error: Could not find text \"{search_text}\" in the document.", file=sys.stderr)
+        sys.exit(1)
+
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    # Get or create comments part
+    comments_part = get_or_create_comments_part(doc)
+    comment_id = str(_next_comment_id(comments_part))
+
+    # Build initials from author name
+    initials = "".join(word[0] for word in author.split()).upper()
+
+    _insert_comment(comments_part, para_elem, search_text, comment_text, author, initials, now, comment_id)
+
     # Update content types if needed
     _ensure_content_type(doc, 'comments')
 
@@ -290,68 +409,212 @@ def add_comment(doc, search_text, comment_text, author, output_path):
     print(f"Saved to: {output_path}")
 
 
+def read_batch(path):
+    """Read (line_no, search_text, comment_text) from a search<TAB>comment file."""
+    items, errors = [], []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            search_text, sep, comment_text = line.partition("\t")
+            if not sep or not search_text or not comment_text:
+                errors.append(f"line {line_no}: expected search text<TAB>comment")
+                continue
+            items.append((line_no, search_text, comment_text))
+    return items, errors
+
+
+def add_comments_batch(doc, items, author, output_path):
+    """Add many comments in one pass over the body and a single save."""
+    body = doc.element.body
+    found = find_paragraphs(body, [search_text for _, search_text, _ in items])
+    errors = []
+
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    initials = "".join(word[0] for word in author.split()).upper()
+    comments_part = get_or_create_comments_part(doc)
+    next_id = _next_comment_id(comments_part)
+
+    for line_no, search_text, comment_text in items:
+        para_elem = found.get(search_text)
+        if para_elem is None:
+            errors.append(f"line {line_no}: could not find text \"{search_text}\"")
+            continue
+        _insert_comment(comments_part, para_elem, search_text, comment_text, author, initials, now, str(next_id))
+        next_id += 1
+
+    _ensure_content_type(doc, 'comments')
+    doc.save(output_path)
+    print(f"Added {len(items) - len(errors)} of {len(items)} comment(s). Saved to: {output_path}")
+    return errors
+
+
+def _comments_root(comments_part):
+    """The comments part's XML tree, parsing the blob only for non-XML parts."""
+    from lxml import etree
+
+    if hasattr(comments_part, 'element'):
+        return comments_part.element
+    return etree.fromstring(comments_part.blob)
+
+
+def _store_comments(comments_part, root):
+    """Write a tree from _comments_root back to the part.
+
+    XmlParts serialise their element on save (and ignore _blob), so only
+    plain parts need the bytes replaced.
+    """
+    from lxml import etree
+
+    if not hasattr(comments_part, 'element'):
+        comments_part._blob = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _next_comment_id(comments_part):
+    """One more than the highest numeric comment id in the part."""
+    if hasattr(comments_part, 'element'):
+        ids = xpath('w:comment/@w:id')(comments_part.element)
+    else:
+        from lxml import etree
+
+        ids = [
+            elem.get(W_ID)
+            for _, elem in etree.iterparse(io.BytesIO(comments_part.blob), events=('start',), tag=W_COMMENT)
+        ]
+    next_id = 0
+    for cid in ids:
+        try:
+            next_id = max(next_id, int(cid) + 1)
+        except (ValueError, TypeError):
+            pass
+    return next_id
+
+
+def _append_comment(comments_part, comment_elem):
+    """Append a w:comment to the part without reparsing the existing comments."""
+    from lxml import etree
+
+    if hasattr(comments_part, 'element'):
+        comments_part.element.append(comment_elem)
+        return
+    blob = comments_part.blob
+    idx = blob.rfind(b'</w:comments>')
+    if idx == -1:
+        root = _comments_root(comments_part)
+        root.append(comment_elem)
+        _store_comments(comments_part, root)
+        return
+    comments_part._blob = blob[:idx] + etree.tostring(comment_elem, encoding='UTF-8') + blob[idx:]
+
+
 def _ensure_content_type(doc, part_name):
     """Ensure content type exists for a given part."""
     # python-docx handles this automatically when saving in most cases
     pass
 
 
-def remove_comments(doc, output_path, index=None):
-    """Remove comments from the document."""
+def _reference_run(elem):
+    """The run holding a commentReference, if the reference is all it contains."""
+    parent = elem.getparent()
+    if parent is not None and parent.tag == W_R:
+        # Check if the run only has rPr and commentReference
+        children = [c for c in parent if c.tag != W_RPR]
+        if len(children) == 1:
+            return parent
+    return None
+
+
+def _detach(elements):
+    for elem in elements:
+        parent = elem.getparent()
+        if parent is not None:
+            parent.remove(elem)
+
+
+def _remove_all(body):
+    """Remove every comment marker and reference run from the body."""
     from lxml import etree
 
+    # Retag reference-only runs so a single strip_elements sweep takes them
+    # out together with the markers.
+    for ref in body.iter(W_COMMENT_REFERENCE):
+        run = _reference_run(ref)
+        if run is not None:
+            run.tag = STRIP_RUN
+    etree.strip_elements(
+        body, W_COMMENT_RANGE_START, W_COMMENT_RANGE_END, W_COMMENT_REFERENCE, STRIP_RUN,
+        with_tail=False,
+    )
+
+
+def _remove_by_ids(body, ids):
+    """Remove the markers and reference runs belonging to the given comment ids."""
+    ids = frozenset(ids)
+    elements_to_remove = []
+    for elem in body.iter(W_COMMENT_RANGE_START, W_COMMENT_RANGE_END, W_COMMENT_REFERENCE):
+        if elem.get(W_ID) in ids:
+            elements_to_remove.append(elem)
+            if elem.tag == W_COMMENT_REFERENCE:
+                run = _reference_run(elem)
+                if run is not None:
+                    elements_to_remove.append(run)
+    _detach(elements_to_remove)
+
+
+def remove_comments(doc, output_path, index=None):
+    """Remove comments from the document."""
     comments_part = get_comments_part(doc)
     if comments_part is None:
         print("No comments found in the document.")
         doc.save(output_path)
         return
 
-    root = etree.fromstring(comments_part.blob)
+    root = _comments_root(comments_part)
     comment_elems = root.findall('.//w:comment', NSMAP)
 
     if index is not None:
         if index < 0 or index >= len(comment_elems):
             print(f"Error: Comment index {index} out of range (0-{len(comment_elems)-1})", file=sys.stderr)
             sys.exit(1)
-        ids_to_remove = {comment_elems[index].get(f'{{{W_NS}}}id')}
+        ids_to_remove = {comment_elems[index].get(W_ID)}
         root.remove(comment_elems[index])
     else:
         ids_to_remove = set()
         for ce in comment_elems:
-            ids_to_remove.add(ce.get(f'{{{W_NS}}}id'))
+            ids_to_remove.add(ce.get(W_ID))
             root.remove(ce)
 
-    comments_part._blob = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+    _store_comments(comments_part, root)
 
     # Remove comment range markers and references from document body
     body = doc.element.body
-    elements_to_remove = []
-
-    for elem in body.iter():
-        tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-        if tag in ('commentRangeStart', 'commentRangeEnd', 'commentReference'):
-            elem_id = elem.get(f'{{{W_NS}}}id')
-            if elem_id in ids_to_remove:
-                elements_to_remove.append(elem)
-                # Also remove the parent run if it only contains the reference
-                if tag == 'commentReference':
-                    parent = elem.getparent()
-                    if parent is not None and parent.tag == f'{{{W_NS}}}r':
-                        # Check if the run only has rPr and commentReference
-                        children = [c for c in parent if c.tag != f'{{{W_NS}}}rPr']
-                        if len(children) == 1:
-                            elements_to_remove.append(parent)
-
-    for elem in elements_to_remove:
-        parent = elem.getparent()
-        if parent is not None:
-            parent.remove(elem)
+    if index is None:
+        _remove_all(body)
+    else:
+        _remove_by_ids(body, ids_to_remove)
 
     doc.save(output_path)
     count = len(ids_to_remove)
     print(f"Removed {count} comment(s). Saved to: {output_path}")
 
 
+CSV_FIELDS = ("id", "author", "date", "text", "commented_text")
+
+
+def write_export(comments, f, fmt="json"):
+    """Stream comments to an open text file as JSON or CSV."""
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(
+            (c["id"], c["author"], c["date"], c["text"], c.get("commented_text", ""))
+            for c in comments
+        )
+    else:
+        json.dump(comments, f, indent=2, ensure_ascii=False)
+
+
 def export_comments(doc, output_path, fmt="json"):
     """Export comments to JSON or CSV."""
     comments = parse_comments(doc)
@@ -360,28 +623,14 @@ def export_comments(doc, output_path, fmt="json"):
         print("No comments found in the document.")
         return
 
-    if fmt == "csv":
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=["id", "author", "date", "text", "commented_text"])
-        writer.writeheader()
-        for c in comments:
-            writer.writerow({
-                "id": c["id"],
-                "author": c["author"],
-                "date": c["date"],
-                "text": c["text"],
-                "commented_text": c.get("commented_text", ""),
-            })
-        result = output.getvalue()
-    else:
-        result = json.dumps(comments, indent=2, ensure_ascii=False)
-
     if output_path:
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(result)
+        # newline="" leaves csv's \r\n row endings untranslated
+        with open(output_path, "w", encoding="utf-8", newline="") as f:
+            write_export(comments, f, fmt)
         print(f"Exported {len(comments)} comment(s) to: {output_path}")
     else:
-        print(result)
+        write_export(comments, sys.stdout, fmt)
+        sys.stdout.write("\n")
 
 
 def main():
@@ -395,8 +644,10 @@ def main():
     # add
     add_parser = subparsers.add_parser("add", help="Add a comment")
     add_parser.add_argument("file_path", help="Path to .docx file")
-    add_parser.add_argument("-t", "--text", required=True, help="Text to attach comment to (search string)")
-    add_parser.add_argument("-c", "--comment", required=True, help="Comment body")
+    add_parser.add_argument("-t", "--text", help="Text to attach comment to (search string)")
+    add_parser.add_argument("-c", "--comment", help="Comment body")
+    add_parser.add_argument("-b", "--batch", metavar="FILE",
+                            help="Add one comment per line of a search text<TAB>comment file")
     add_parser.add_argument("-a", "--author", default="Review Bot", help="Comment author (default: Review Bot)")
     add_parser.add_argument("-o", "--output", required=True, help="Output file path")
 
@@ -418,6 +669,9 @@ def main():
         parser.print_help()
         sys.exit(1)
 
+    if args.command == "add" and not args.batch and (args.text is None or args.comment is None):
+        add_parser.error("-t/--text and -c/--comment are required unless --batch is given")
+
     file_path = os.path.expanduser(args.file_path)
     file_path = os.path.abspath(file_path)
 
@@ -440,7 +694,19 @@ def main():
         list_comments(doc)
     elif args.command == "add":
         output_path = os.path.expanduser(args.output)
-        add_comment(doc, args.text, args.comment, args.author, output_path)
+        if args.batch:
+            batch_path = os.path.abspath(os.path.expanduser(args.batch))
+            if not os.path.exists(batch_path):
+                print(f"Error: File not found: {batch_path}", file=sys.stderr)
+                sys.exit(1)
+            items, errors = read_batch(batch_path)
+            errors += add_comments_batch(doc, items, args.author, output_path)
+            for error in errors:
+                print(f"Error: {error}", file=sys.stderr)
+            if errors:
+                sys.exit(1)
+        else:
+            add_comment(doc, args.text, args.comment, args.author, output_path)
     elif args.command == "remove":
         output_path = os.path.expanduser(args.output)
         remove_comments(doc, output_path, index=args.index)
@@ -13,30 +13,93 @@ Usage:
 
 import sys
 import os
-import subprocess
 import argparse
+import functools
+import io
 import json
-import difflib
+import posixpath
+import zipfile
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def ensure_dependencies():
-    """Install python-docx if not available."""
+    """Install lxml if not available.
+
+    The comparison reads and writes the .docx XML directly, so python-docx
+    (slow to import) is no longer needed on the command-line path.
+    """
     try:
-        import docx  # noqa: F401
+        from lxml import etree  # noqa: F401
         return True
     except ImportError:
-        print("Installing python-docx...", file=sys.stderr)
+        import subprocess
+
+        print("Installing lxml...", file=sys.stderr)
         result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "python-docx", "lxml", "-q"],
+            [sys.executable, "-m", "pip", "install", "lxml", "-q"],
             capture_output=True, text=True,
         )
         if result.returncode != 0:
-            print(f"Failed to install python-docx: {result.stderr}", file=sys.stderr)
+            print(f"Failed to install lxml: {result.stderr}", file=sys.stderr)
             return False
         return True
 
 
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W_BODY = f'{{{W_NS}}}body'
+W_P = f'{{{W_NS}}}p'
+W_R = f'{{{W_NS}}}r'
+W_T = f'{{{W_NS}}}t'
+W_BR = f'{{{W_NS}}}br'
+W_HYPERLINK = f'{{{W_NS}}}hyperlink'
+W_PPR = f'{{{W_NS}}}pPr'
+W_PSTYLE = f'{{{W_NS}}}pStyle'
+W_VAL = f'{{{W_NS}}}val'
+W_TYPE = f'{{{W_NS}}}type'
+W_STYLE = f'{{{W_NS}}}style'
+W_STYLE_ID = f'{{{W_NS}}}styleId'
+W_NAME = f'{{{W_NS}}}name'
+W_DEFAULT = f'{{{W_NS}}}default'
+W_SECT_PR = f'{{{W_NS}}}sectPr'
+W_INS = f'{{{W_NS}}}ins'
+W_DEL = f'{{{W_NS}}}del'
+W_DEL_TEXT = f'{{{W_NS}}}delText'
+W_ID = f'{{{W_NS}}}id'
+W_AUTHOR = f'{{{W_NS}}}author'
+W_DATE = f'{{{W_NS}}}date'
+XML_SPACE_PRESERVE = {'{http://www.w3.org/XML/1998/namespace}space': 'preserve'}
+# Declaration lxml repeats on every element it writes; redundant under a w-prefixed root
+W_NS_DECL = f' xmlns:w="{W_NS}"'.encode('ascii')
+REDLINE_AUTHOR = 'Document Compare'
+
+# Text equivalents of run children, matching python-docx's Run.text
+RUN_TEXT = {
+    f'{{{W_NS}}}tab': "\t",
+    f'{{{W_NS}}}ptab': "\t",
+    f'{{{W_NS}}}cr': "\n",
+    f'{{{W_NS}}}noBreakHyphen': "-",
+}
+
+# Built-in style names python-docx reports by their UI name
+UI_STYLE_NAMES = {
+    'caption': 'Caption',
+    'footer': 'Footer',
+    'header': 'Header',
+    **{f'heading {level}': f'Heading {level}' for level in range(1, 10)},
+}
+
+REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+REL_RELATIONSHIP = f'{{{REL_NS}}}Relationship'
+OFFICE_DOCUMENT_REL = ('http://schemas.openxmlformats.org/officeDocument/2006/'
+                       'relationships/officeDocument')
+STYLES_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles'
+
+
 def extract_paragraphs(doc):
     """Extract paragraphs with their style information."""
     paragraphs = []
@@ -48,15 +111,261 @@ def extract_paragraphs(doc):
     return paragraphs
 
 
+def _middle_snake(a, alo, ahi, b, blo, bhi):
+    """Find the middle snake of a[alo:ahi] vs b[blo:bhi] (Myers, linear space).
+
+    Returns (d, x, y, u, v): the edit distance and the snake from (x, y) to
+    (u, v), in absolute indices.
+    """
+    n, m = ahi - alo, bhi - blo
+    delta = n - m
+    odd = delta & 1
+    max_d = (n + m + 1) // 2
+    offset = max_d + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+
+    for d in range(max_d + 1):
+        # Forward search: furthest x on each diagonal k = x - y
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            kb = delta - k
+            if odd and -(d - 1) <= kb <= d - 1 and x + backward[offset + kb] >= n:
+                return 2 * d - 1, alo + x0, blo + y0, alo + x, blo + y
+
+        # Backward search over the reversed sequences
+        for kb in range(-d, d + 1, 2):
+            if kb == -d or (kb != d and backward[offset + kb - 1] < backward[offset + kb + 1]):
+                x = backward[offset + kb + 1]
+            else:
+                x = backward[offset + kb - 1] + 1
+            y = x - kb
+            x0, y0 = x, y
+            while x < n and y < m and a[ahi - x - 1] == b[bhi - y - 1]:
+                x += 1
+                y += 1
+            backward[offset + kb] = x
+            k = delta - kb
+            if not odd and -d <= k <= d and x + forward[offset + k] >= n:
+                return 2 * d, ahi - x, bhi - y, ahi - x0, bhi - y0
+
+    raise AssertionError("middle snake not found")
+
+
+def _matching_blocks(a, alo, ahi, b, blo, bhi, blocks):
+    """Append (i, j, size) runs of a minimal diff of the two slices to blocks."""
+    if alo >= ahi or blo >= bhi:
+        return
+    d, x, y, u, v = _middle_snake(a, alo, ahi, b, blo, bhi)
+    if d > 1:
+        _matching_blocks(a, alo, x, b, blo, y, blocks)
+        if u > x:
+            blocks.append((x, y, u - x))
+        _matching_blocks(a, u, ahi, b, v, bhi, blocks)
+        return
+    # d <= 1: the slices are equal, or differ by one inserted/deleted item
+    n, m = ahi - alo, bhi - blo
+    prefix = 0
+    while prefix < min(n, m) and a[alo + prefix] == b[blo + prefix]:
+        prefix += 1
+    if prefix:
+        blocks.append((alo, blo, prefix))
+    rest = min(n, m) - prefix
+    if rest:
+        blocks.append((ahi - rest, bhi - rest, rest))
+
+
+def myers_diff(a, b):
+    """Diff two sequences with Myers' algorithm.
+
+    Returns opcodes in difflib.SequenceMatcher.get_opcodes() form. Unlike
+    SequenceMatcher there is no autojunk heuristic, so frequently repeated
+    items (blank or boilerplate paragraphs) still match, and the result is a
+    minimal edit script.
+    """
+    if a == b:
+        return [('equal', 0, len(a), 0, len(b))] if a else []
+
+    # Intern items to small ints so every comparison below is an int compare
+    table = {}
+    a = [table.setdefault(item, len(table)) for item in a]
+    b = [table.setdefault(item, len(table)) for item in b]
+
+    # Unchanged leading and trailing items are matched directly; revised
+    # documents usually differ only somewhere in the middle.
+    la, lb = len(a), len(b)
+    prefix = 0
+    while prefix < la and prefix < lb and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < la - prefix and suffix < lb - prefix and a[la - 1 - suffix] == b[lb - 1 - suffix]:
+        suffix += 1
+
+    # Items that never occur in the other sequence cannot match, so drop
+    # them before the O((N+M)D) search, as git's xdiff does. This keeps
+    # largely rewritten documents from hitting the worst case.
+    a_mid, b_mid = range(prefix, la - suffix), range(prefix, lb - suffix)
+    in_b = {b[j] for j in b_mid}
+    in_a = {a[i] for i in a_mid}
+    a_index = [i for i in a_mid if a[i] in in_b]
+    b_index = [j for j in b_mid if b[j] in in_a]
+    a_kept = [a[i] for i in a_index]
+    b_kept = [b[j] for j in b_index]
+
+    kept_blocks = []
+    _matching_blocks(a_kept, 0, len(a_kept), b_kept, 0, len(b_kept), kept_blocks)
+
+    # Map back to the full sequences, splitting runs broken by dropped items
+    blocks = [[0, 0, prefix]] if prefix else []
+    for ki, kj, size in kept_blocks:
+        for offset in range(size):
+            i, j = a_index[ki + offset], b_index[kj + offset]
+            if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+                blocks[-1][2] += 1
+            else:
+                blocks.append([i, j, 1])
+    if suffix:
+        blocks.append([la - suffix, lb - suffix, suffix])
+
+    opcodes = []
+    i = j = 0
+    for ai, bj, size in blocks + [(la, lb, 0)]:
+        if i < ai and j < bj:
+            opcodes.append(('replace', i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(('delete', i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(('insert', i, ai, j, bj))
+        if size:
+            if opcodes and opcodes[-1][0] == 'equal':
+                # Merge with the adjacent equal run
+                opcodes[-1] = ('equal', opcodes[-1][1], ai + size, opcodes[-1][3], bj + size)
+            else:
+                opcodes.append(('equal', ai, ai + size, bj, bj + size))
+        i, j = ai + size, bj + size
+    return opcodes
+
+
+def _rel_target(zf, rels_name, source_dir, reltype):
+    """Resolve the part name of the first relationship of reltype, if any."""
+    from lxml import etree
+
+    try:
+        root = etree.fromstring(zf.read(rels_name))
+    except KeyError:
+        return None
+    for rel in root.iter(REL_RELATIONSHIP):
+        if rel.get('Type') == reltype and rel.get('TargetMode') != 'External':
+            target = rel.get('Target', '')
+            if target.startswith('/'):
+                return target.lstrip('/')
+            return posixpath.normpath(posixpath.join(source_dir, target))
+    return None
+
+
+def _paragraph_style_names(zf, styles_name):
+    """Map paragraph styleId to UI name, plus the default paragraph style name."""
+    from lxml import etree
+
+    names, default = {}, None
+    if styles_name is None or styles_name not in zf.namelist():
+        return names, default
+    for style in etree.fromstring(zf.read(styles_name)).iter(W_STYLE):
+        if style.get(W_TYPE) != 'paragraph':
+            continue
+        name_elem = style.find(W_NAME)
+        name = name_elem.get(W_VAL) if name_elem is not None else None
+        name = UI_STYLE_NAMES.get(name, name)
+        names[style.get(W_STYLE_ID)] = name
+        if style.get(W_DEFAULT) in ('1', 'true', 'on'):
+            default = name
+    return names, default
+
+
+def _run_text(run):
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_BR:
+            if child.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append("\n")
+        elif tag in RUN_TEXT:
+            parts.append(RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def _paragraph_text(p):
+    """Text of a w:p element, matching python-docx's Paragraph.text."""
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+def extract_paragraphs_fast(file_path):
+    """Like extract_paragraphs, but streamed straight from the .docx file.
+
+    word/document.xml is read with iterparse and each paragraph is discarded
+    once read, so no python-docx objects are built and memory stays flat.
+    """
+    from lxml import etree
+
+    paragraphs = []
+    with zipfile.ZipFile(file_path) as zf:
+        document_name = _rel_target(zf, '_rels/.rels', '', OFFICE_DOCUMENT_REL) or 'word/document.xml'
+        source_dir = posixpath.dirname(document_name)
+        rels_name = posixpath.join(source_dir, '_rels', posixpath.basename(document_name) + '.rels')
+        style_names, default_style = _paragraph_style_names(
+            zf, _rel_target(zf, rels_name, source_dir, STYLES_REL))
+        if default_style is None:
+            default_style = "Normal"
+
+        with zf.open(document_name) as source:
+            for _, elem in etree.iterparse(source, events=('end',), tag=W_P, huge_tree=True):
+                parent = elem.getparent()
+                if parent is None or parent.tag != W_BODY:
+                    # Table cells and text boxes are not in doc.paragraphs
+                    continue
+
+                style_id = None
+                ppr = elem.find(W_PPR)
+                if ppr is not None:
+                    pstyle = ppr.find(W_PSTYLE)
+                    if pstyle is not None:
+                        style_id = pstyle.get(W_VAL)
+
+                paragraphs.append({
+                    "text": _paragraph_text(elem),
+                    "style": style_names.get(style_id, default_style) if style_id else default_style,
+                })
+
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+    return paragraphs
+
+
 def compare_paragraphs(original_paras, revised_paras, granularity="paragraph"):
     """Compare paragraphs and return a list of differences."""
     orig_texts = [p["text"] for p in original_paras]
     rev_texts = [p["text"] for p in revised_paras]
 
     diffs = []
-    matcher = difflib.SequenceMatcher(None, orig_texts, rev_texts)
-
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in myers_diff(orig_texts, rev_texts):
         if tag == 'equal':
             for k in range(i1, i2):
                 diffs.append({
@@ -67,16 +376,20 @@ def compare_paragraphs(original_paras, revised_paras, granularity="paragraph"):
         elif tag == 'replace':
             # For word-level granularity, diff the individual changed paragraphs
             if granularity == "word":
-                for oi in range(i1, i2):
-                    for ri in range(j1, j2):
-                        word_diffs = compare_words(orig_texts[oi], rev_texts[ri])
-                        diffs.append({
-                            "type": "modified",
-                            "original_text": orig_texts[oi],
-                            "revised_text": rev_texts[ri],
-                            "style": original_paras[oi]["style"],
-                            "word_diffs": word_diffs,
-                        })
+                if i2 - i1 == j2 - j1:
+                    # Equal-sized blocks pair up one to one
+                    pairs = zip(range(i1, i2), range(j1, j2))
+                else:
+                    pairs = ((oi, ri) for oi in range(i1, i2) for ri in range(j1, j2))
+                for oi, ri in pairs:
+                    word_diffs = compare_words(orig_texts[oi], rev_texts[ri])
+                    diffs.append({
+                        "type": "modified",
+                        "original_text": orig_texts[oi],
+                        "revised_text": rev_texts[ri],
+                        "style": original_paras[oi]["style"],
+                        "word_diffs": word_diffs,
+                    })
             else:
                 for k in range(i1, i2):
                     diffs.append({
@@ -108,15 +421,18 @@ def compare_paragraphs(original_paras, revised_paras, granularity="paragraph"):
     return diffs
 
 
+@functools.lru_cache(maxsize=4096)
 def compare_words(original, revised):
-    """Perform word-level comparison between two strings."""
+    """Perform word-level comparison between two strings.
+
+    Cached, since boilerplate-heavy documents repeat the same pairs. Every
+    cache hit shares the same dicts, so callers must not mutate them.
+    """
     orig_words = original.split()
     rev_words = revised.split()
 
     word_diffs = []
-    matcher = difflib.SequenceMatcher(None, orig_words, rev_words)
-
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in myers_diff(orig_words, rev_words):
         if tag == 'equal':
             word_diffs.append({
                 "type": "equal",
@@ -142,50 +458,51 @@ def compare_words(original, revised):
                 "text": " ".join(rev_words[j1:j2]),
             })
 
-    return word_diffs
+    return tuple(word_diffs)
+
+
+def summarize(diffs):
+    """Count diffs of each type in a single pass."""
+    counts = {'equal': 0, 'inserted': 0, 'deleted': 0, 'modified': 0}
+    for diff in diffs:
+        counts[diff['type']] += 1
+    return counts
 
 
 def format_markdown(diffs, original_path, revised_path):
     """Format diff results as Markdown."""
-    lines = []
-    lines.append(f"# Document Comparison")
-    lines.append(f"")
-    lines.append(f"**Original:** {os.path.basename(original_path)}")
-    lines.append(f"**Revised:** {os.path.basename(revised_path)}")
-    lines.append(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    lines.append(f"")
+    buf = io.StringIO()
+    # Every line after the first is written with its leading newline
+    w = buf.write
+    w("# Document Comparison\n")
+    w(f"\n**Original:** {os.path.basename(original_path)}")
+    w(f"\n**Revised:** {os.path.basename(revised_path)}")
+    w(f"\n**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
 
     # Statistics
-    insertions = sum(1 for d in diffs if d['type'] == 'inserted')
-    deletions = sum(1 for d in diffs if d['type'] == 'deleted')
-    modifications = sum(1 for d in diffs if d['type'] == 'modified')
-    unchanged = sum(1 for d in diffs if d['type'] == 'equal')
-
-    lines.append(f"## Summary")
-    lines.append(f"")
-    lines.append(f"- Unchanged paragraphs: {unchanged}")
-    lines.append(f"- Inserted paragraphs: {insertions}")
-    lines.append(f"- Deleted paragraphs: {deletions}")
-    if modifications:
-        lines.append(f"- Modified paragraphs: {modifications}")
-    lines.append(f"")
-
-    lines.append(f"## Changes")
-    lines.append(f"")
+    counts = summarize(diffs)
+    w("\n## Summary\n")
+    w(f"\n- Unchanged paragraphs: {counts['equal']}")
+    w(f"\n- Inserted paragraphs: {counts['inserted']}")
+    w(f"\n- Deleted paragraphs: {counts['deleted']}")
+    if counts['modified']:
+        w(f"\n- Modified paragraphs: {counts['modified']}")
+    w("\n")
+
+    w("\n## Changes\n")
 
     for diff in diffs:
-        if diff['type'] == 'equal':
+        d_type = diff['type']
+        if d_type == 'equal':
             text = diff['text']
-            if len(text) > 80:
-                text = text[:77] + "..."
-            lines.append(f"  {text}")
-        elif diff['type'] == 'inserted':
-            lines.append(f"+ {diff['text']}")
-        elif diff['type'] == 'deleted':
-            lines.append(f"- {diff['text']}")
-        elif diff['type'] == 'modified':
-            lines.append(f"~ Original: {diff['original_text']}")
-            lines.append(f"~ Revised:  {diff['revised_text']}")
+            w(f"\n  {text[:77] + '...' if len(text) > 80 else text}")
+        elif d_type == 'inserted':
+            w(f"\n+ {diff['text']}")
+        elif d_type == 'deleted':
+            w(f"\n- {diff['text']}")
+        elif d_type == 'modified':
+            w(f"\n~ Original: {diff['original_text']}")
+            w(f"\n~ Revised:  {diff['revised_text']}")
             if 'word_diffs' in diff:
                 parts = []
                 for wd in diff['word_diffs']:
@@ -195,130 +512,137 @@ def format_markdown(diffs, original_path, revised_path):
                         parts.append(f"[-{wd['text']}-]")
                     elif wd['type'] == 'inserted':
                         parts.append(f"[+{wd['text']}+]")
-                lines.append(f"  Detail: {' '.join(parts)}")
+                w(f"\n  Detail: {' '.join(parts)}")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def format_json(diffs, original_path, revised_path):
-    """Format diff results as JSON."""
-    insertions = sum(1 for d in diffs if d['type'] == 'inserted')
-    deletions = sum(1 for d in diffs if d['type'] == 'deleted')
-    modifications = sum(1 for d in diffs if d['type'] == 'modified')
-    unchanged = sum(1 for d in diffs if d['type'] == 'equal')
+    """Format diff results as JSON, using orjson when available."""
+    counts = summarize(diffs)
 
     result = {
         "original": os.path.basename(original_path),
         "revised": os.path.basename(revised_path),
         "date": datetime.now().isoformat(),
         "summary": {
-            "unchanged": unchanged,
-            "inserted": insertions,
-            "deleted": deletions,
-            "modified": modifications,
+            "unchanged": counts['equal'],
+            "inserted": counts['inserted'],
+            "deleted": counts['deleted'],
+            "modified": counts['modified'],
         },
         "diffs": diffs,
     }
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode("utf-8")
     return json.dumps(result, indent=2, ensure_ascii=False)
 
 
-def create_redline_docx(original_doc, diffs, output_path):
-    """Create a DOCX with tracked changes showing the differences."""
-    from docx import Document
-    from docx.shared import Pt, RGBColor
+def _text_run(parent, text_tag, text):
     from lxml import etree
 
-    W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    change_id = 0
+    r = etree.SubElement(parent, W_R)
+    t = etree.SubElement(r, text_tag, XML_SPACE_PRESERVE)
+    t.text = text
+
 
-    # Start from a copy of the original
-    redline = Document(original_doc)
+def _revision(parent, tag, change_id, now):
+    """A w:ins or w:del wrapper attributed to the comparison."""
+    from lxml import etree
 
-    # Clear existing content
-    body = redline.element.body
-    for child in list(body):
-        tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-        if tag == 'sectPr':
-            continue  # Keep section properties
-        body.remove(child)
+    return etree.SubElement(parent, tag, {W_ID: str(change_id), W_AUTHOR: REDLINE_AUTHOR, W_DATE: now})
 
-    for diff in diffs:
-        if diff['type'] == 'equal':
-            # Add as normal paragraph
-            p = etree.SubElement(body, f'{{{W_NS}}}p')
-            if diff.get('style') and diff['style'] != 'Normal':
-                ppr = etree.SubElement(p, f'{{{W_NS}}}pPr')
-                pstyle = etree.SubElement(ppr, f'{{{W_NS}}}pStyle')
-                pstyle.set(f'{{{W_NS}}}val', diff['style'].replace(' ', ''))
-            r = etree.SubElement(p, f'{{{W_NS}}}r')
-            t = etree.SubElement(r, f'{{{W_NS}}}t')
-            t.text = diff['text']
-            t.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
-
-        elif diff['type'] == 'inserted':
-            # Add as insertion
-            p = etree.SubElement(body, f'{{{W_NS}}}p')
-            if diff.get('style') and diff['style'] != 'Normal':
-                ppr = etree.SubElement(p, f'{{{W_NS}}}pPr')
-                pstyle = etree.SubElement(ppr, f'{{{W_NS}}}pStyle')
-                pstyle.set(f'{{{W_NS}}}val', diff['style'].replace(' ', ''))
-            ins = etree.SubElement(p, f'{{{W_NS}}}ins')
-            ins.set(f'{{{W_NS}}}id', str(change_id))
-            ins.set(f'{{{W_NS}}}author', 'Document Compare')
-            ins.set(f'{{{W_NS}}}date', now)
-            change_id += 1
-            r = etree.SubElement(ins, f'{{{W_NS}}}r')
-            t = etree.SubElement(r, f'{{{W_NS}}}t')
-            t.text = diff['text']
-            t.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
-
-        elif diff['type'] == 'deleted':
-            # Add as deletion
-            p = etree.SubElement(body, f'{{{W_NS}}}p')
-            if diff.get('style') and diff['style'] != 'Normal':
-                ppr = etree.SubElement(p, f'{{{W_NS}}}pPr')
-                pstyle = etree.SubElement(ppr, f'{{{W_NS}}}pStyle')
-                pstyle.set(f'{{{W_NS}}}val', diff['style'].replace(' ', ''))
-            dele = etree.SubElement(p, f'{{{W_NS}}}del')
-            dele.set(f'{{{W_NS}}}id', str(change_id))
-            dele.set(f'{{{W_NS}}}author', 'Document Compare')
-            dele.set(f'{{{W_NS}}}date', now)
-            change_id += 1
-            r = etree.SubElement(dele, f'{{{W_NS}}}r')
-            dt = etree.SubElement(r, f'{{{W_NS}}}delText')
-            dt.text = diff['text']
-            dt.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
-
-        elif diff['type'] == 'modified':
-            # Add as deletion + insertion
-            p = etree.SubElement(body, f'{{{W_NS}}}p')
-            if diff.get('style') and diff['style'] != 'Normal':
-                ppr = etree.SubElement(p, f'{{{W_NS}}}pPr')
-                pstyle = etree.SubElement(ppr, f'{{{W_NS}}}pStyle')
-                pstyle.set(f'{{{W_NS}}}val', diff['style'].replace(' ', ''))
-
-            dele = etree.SubElement(p, f'{{{W_NS}}}del')
-            dele.set(f'{{{W_NS}}}id', str(change_id))
-            dele.set(f'{{{W_NS}}}author', 'Document Compare')
-            dele.set(f'{{{W_NS}}}date', now)
-            change_id += 1
-            r = etree.SubElement(dele, f'{{{W_NS}}}r')
-            dt = etree.SubElement(r, f'{{{W_NS}}}delText')
-            dt.text = diff['original_text']
-            dt.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
-
-            ins = etree.SubElement(p, f'{{{W_NS}}}ins')
-            ins.set(f'{{{W_NS}}}id', str(change_id))
-            ins.set(f'{{{W_NS}}}author', 'Document Compare')
-            ins.set(f'{{{W_NS}}}date', now)
-            change_id += 1
-            r = etree.SubElement(ins, f'{{{W_NS}}}r')
-            t = etree.SubElement(r, f'{{{W_NS}}}t')
-            t.text = diff['revised_text']
-            t.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
-
-    redline.save(output_path)
+
+def build_redline_paragraph(diff, change_id, now):
+    """Build the detached w:p for one diff; returns it and the next change id."""
+    from lxml import etree
+
+    p = etree.Element(W_P, nsmap={'w': W_NS})
+    style = diff.get('style')
+    if style and style != 'Normal':
+        ppr = etree.SubElement(p, W_PPR)
+        etree.SubElement(ppr, W_PSTYLE, {W_VAL: style.replace(' ', '')})
+
+    if diff['type'] == 'equal':
+        # Add as normal paragraph
+        _text_run(p, W_T, diff['text'])
+
+    elif diff['type'] == 'inserted':
+        # Add as insertion
+        _text_run(_revision(p, W_INS, change_id, now), W_T, diff['text'])
+        change_id += 1
+
+    elif diff['type'] == 'deleted':
+        # Add as deletion
+        _text_run(_revision(p, W_DEL, change_id, now), W_DEL_TEXT, diff['text'])
+        change_id += 1
+
+    elif diff['type'] == 'modified':
+        # Add as deletion + insertion
+        _text_run(_revision(p, W_DEL, change_id, now), W_DEL_TEXT, diff['original_text'])
+        _text_run(_revision(p, W_INS, change_id + 1, now), W_T, diff['revised_text'])
+        change_id += 2
+
+    return p, change_id
+
+
+def create_redline_docx(original_doc, diffs, output_path):
+    """Create a DOCX with tracked changes showing the differences.
+
+    Every part of the original is copied unchanged except the main document,
+    whose body is streamed out with lxml's incremental writer, so memory
+    does not grow with the number of diffs.
+    """
+    import shutil
+    from lxml import etree
+
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    # Write beside the target first, so the original can be the output too
+    tmp_path = output_path + ".part"
+    try:
+        with zipfile.ZipFile(original_doc) as zin, \
+                zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zout:
+            document_name = _rel_target(zin, '_rels/.rels', '', OFFICE_DOCUMENT_REL) or 'word/document.xml'
+            for info in zin.infolist():
+                if info.filename == document_name:
+                    continue
+                with zin.open(info) as src, zout.open(info, "w") as dst:
+                    shutil.copyfileobj(src, dst)
+
+            # Keep the document element, anything around the body, and the
+            # section properties; replace the body content
+            root = etree.fromstring(zin.read(document_name), etree.XMLParser(huge_tree=True))
+            body = root.find(W_BODY)
+            with zout.open(document_name, "w") as dst, etree.xmlfile(dst, encoding="UTF-8") as xf:
+                xf.write_declaration(standalone=True)
+                with xf.element(root.tag, dict(root.attrib), nsmap=root.nsmap):
+                    for child in root:
+                        if child is not body:
+                            xf.write(child)
+                            continue
+                        with xf.element(W_BODY, dict(body.attrib)):
+                            # Each paragraph is written and released as soon as it is built.
+                            # xf.write would redeclare the w namespace on every w:p, so
+                            # when the root already binds it, paragraphs are serialised
+                            # here without it and written straight to the stream.
+                            inherit_w = root.nsmap.get('w') == W_NS
+                            xf.flush()
+                            change_id = 0
+                            for diff in diffs:
+                                p, change_id = build_redline_paragraph(diff, change_id, now)
+                                if inherit_w:
+                                    xml = etree.tostring(p, encoding='UTF-8', xml_declaration=False)
+                                    dst.write(xml.replace(W_NS_DECL, b'', 1))
+                                else:
+                                    xf.write(p)
+                            for sect_pr in body.iterchildren(W_SECT_PR):
+                                xf.write(sect_pr)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
 
 
 def main():
@@ -347,18 +671,13 @@ def main():
     if not ensure_dependencies():
         sys.exit(1)
 
-    from docx import Document
-
     try:
-        original_doc = Document(original_path)
-        revised_doc = Document(revised_path)
+        original_paras = extract_paragraphs_fast(original_path)
+        revised_paras = extract_paragraphs_fast(revised_path)
     except Exception as e:
         print(f"Error: Could not open document: {e}", file=sys.stderr)
         sys.exit(1)
 
-    original_paras = extract_paragraphs(original_doc)
-    revised_paras = extract_paragraphs(revised_doc)
-
     diffs = compare_paragraphs(original_paras, revised_paras, granularity=args.granularity)
 
     if args.format == "docx":